@@ -0,0 +1,79 @@
+"""
+Compares two result files of run.py, case by case.
+
+Prints the ratio new / old of every metric and exits with status 1 if any 
+time got slower, or any throughput lower, by more than the threshold.
+
+    python benchmarks/compare.py results/base.json results/head.json --threshold 1.1
+"""
+import argparse
+import json
+import os
+import sys
+
+# The sibling modules are imported from the directory of this file, wherever it is run from
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+from run import LOWER_IS_BETTER
+
+# Metrics compared, from the result files of run.py
+METRICS = ('fit_time', 'search_time', 'ingestion_time', 'predict_rows_per_second',
+           'predict_native_rows_per_second', 'peak_memory')
+
+def load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+def compare(old: dict, new: dict, threshold: float) -> tuple:
+    """
+    Returns the rows (case, metric, old value, new value, ratio, regressed) of the cases
+    present in both result files, and the names of the cases present in only one of them.
+    """
+    old_cases = {result['name']: result for result in old['results']}
+    new_cases = {result['name']: result for result in new['results']}
+    rows = []
+    for name, old_case in old_cases.items():
+        new_case = new_cases.get(name)
+        if new_case is None:
+            continue
+        for metric in METRICS:
+            before, after = old_case.get(metric), new_case.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            slower = ratio if metric in LOWER_IS_BETTER else 1 / max(ratio, 1e-12)
+            rows.append((name, metric, before, after, ratio, slower > threshold))
+        if old_case.get('misclassifications') != new_case.get('misclassifications') \
+                and old_case.get('is_optimal') and new_case.get('is_optimal'):
+            rows.append((name, 'misclassifications', old_case['misclassifications'],
+                         new_case['misclassifications'], None, True))
+    unmatched = sorted(set(old_cases) ^ set(new_cases))
+    return rows, unmatched
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='ratio beyond which a change counts as a regression')
+    parser.add_argument('--all', action='store_true', help='print every metric, not only the regressions')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    old, new = load(args.old), load(args.new)
+    print('old: {} ({})'.format(old['metadata'].get('commit'), old['metadata'].get('date')))
+    print('new: {} ({})'.format(new['metadata'].get('commit'), new['metadata'].get('date')))
+    rows, unmatched = compare(old, new, args.threshold)
+    for name, metric, before, after, ratio, regressed in rows:
+        if args.all or regressed:
+            ratio = 'differs' if ratio is None else f'{ratio:.3f}'
+            print('{} {:<32} {:>14.6g} {:>14.6g} {:>8} {}'.format(
+                '!' if regressed else ' ', metric, before, after, ratio, name))
+    for name in unmatched:
+        print('  only in one file:', name)
+    regressions = sum(row[5] for row in rows)
+    print(f'{regressions} regressions over {len(rows)} comparisons')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import numpy as np
+
+
+def synthetic_dataset(n_rows: int, n_features: int, n_classes: int = 2, noise: float = 0.1,
+                      depth: int = 3, seed: int = 0) -> tuple:
+    """
+    Generates a binary dataset whose labels follow a random decision tree.
+
+    The features are independent fair coins. A random tree of the given depth 
+    assigns a label to every row, and a fraction `noise` of the labels is then
+    replaced by random classes, so that the optimal tree is known up to the noise.
+
+    Parameters
+    ----------
+        n_rows (int): Number of rows.
+        n_features (int): Number of binary features.
+        n_classes (int, optional): Number of classes. Defaults to 2.
+        noise (float, optional): Fraction of the labels replaced by random classes. Defaults to 0.1.
+        depth (int, optional): Depth of the tree that generates the labels. Defaults to 3.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+
+    Returns
+    -------
+        tuple: The features x as a uint8 array of shape (n_rows, n_features) and the int32 labels y.
+    """
+    random = np.random.RandomState(seed)
+    x = random.randint(0, 2, size=(n_rows, n_features)).astype(np.uint8)
+
+    # Leaf index of every row, following a complete tree with a random feature per node
+    node = np.zeros(n_rows, dtype=np.int64)
+    for _ in range(depth):
+        features = random.randint(0, n_features, size=2**depth)
+        node = 2 * node + x[np.arange(n_rows), features[node]]
+    leaf_labels = random.randint(0, n_classes, size=2**depth)
+    y = leaf_labels[node].astype(np.int32)
+
+    noisy = random.random_sample(n_rows) < noise
+    y[noisy] = random.randint(0, n_classes, size=np.count_nonzero(noisy))
+    return x, y
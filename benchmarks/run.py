@@ -0,0 +1,161 @@
+"""
+Runs the benchmark suite of pymurtree and stores the results in a JSON file.
+
+Every case fits a model on a synthetic dataset in a fresh process, so that the
+peak resident memory belongs to that case alone, and records the fit, search
+and ingestion times, the prediction throughput and the peak memory. The best
+time over the repeats is kept. Compare two result files with compare.py.
+
+    python benchmarks/run.py --output results/$(git rev-parse --short HEAD).json
+    python benchmarks/run.py --quick --max-depth 2 3 --cache-type 0 1 2
+"""
+import argparse
+import datetime
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+# The sibling modules are imported from the directory of this file, wherever it is run from
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+from datasets import synthetic_dataset
+
+# Fields of a case, in the order used to name it
+CASE_FIELDS = ('n_rows', 'n_features', 'n_classes', 'noise',
+               'max_depth', 'cache_type', 'feature_ordering', 'node_selection')
+
+# Metrics where lower is better, the others are better when higher
+LOWER_IS_BETTER = ('fit_time', 'search_time', 'ingestion_time', 'peak_memory')
+
+def case_name(case: dict) -> str:
+    """Identifies a case across result files."""
+    return ' '.join(f'{field}={case[field]}' for field in CASE_FIELDS)
+
+def run_case(case: dict, time: int, predict_rows: int) -> dict:
+    """
+    Fits and evaluates one case in the current process and returns its metrics.
+    """
+    import pymurtree
+    from pymurtree.stats import peak_memory_usage
+
+    x, y = synthetic_dataset(case['n_rows'], case['n_features'], case['n_classes'], case['noise'], seed=case['seed'])
+    model = pymurtree.OptimalDecisionTreeClassifier(time=time,
+                                                    max_depth=case['max_depth'],
+                                                    cache_type=case['cache_type'],
+                                                    feature_ordering=case['feature_ordering'],
+                                                    node_selection=case['node_selection'])
+    start = timeit.default_timer()
+    model.fit(x, y)
+    fit_time = timeit.default_timer() - start
+    stats = model.stats()
+
+    x_predict = synthetic_dataset(predict_rows, case['n_features'], case['n_classes'], case['noise'], seed=case['seed'] + 1)[0]
+    start = timeit.default_timer()
+    model.predict(x_predict)
+    predict_time = timeit.default_timer() - start
+    start = timeit.default_timer()
+    model.predict(x_predict, n_jobs=1)
+    native_time = timeit.default_timer() - start
+
+    return {'fit_time': fit_time,
+            'search_time': stats.search_time,
+            'ingestion_time': stats.ingestion_time,
+            'predict_rows_per_second': predict_rows / max(predict_time, 1e-9),
+            'predict_native_rows_per_second': predict_rows / max(native_time, 1e-9),
+            'peak_memory': peak_memory_usage(),
+            'misclassifications': int(model.score()),
+            'is_optimal': model.is_optimal()}
+
+def run_isolated(case: dict, time: int, predict_rows: int) -> dict:
+    """Runs a case in a fresh process."""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(run_case, (case, time, predict_rows))
+
+def best_of(runs: list) -> dict:
+    """Combines the repeats of a case: best times and throughputs, largest peak memory."""
+    best = dict(runs[0])
+    for metric in runs[0]:
+        values = [run[metric] for run in runs if run[metric] is not None]
+        if not values or isinstance(values[0], bool):
+            continue
+        if metric == 'peak_memory':
+            best[metric] = max(values)
+        elif metric in LOWER_IS_BETTER:
+            best[metric] = min(values)
+        elif metric.endswith('per_second'):
+            best[metric] = max(values)
+    return best
+
+def metadata() -> dict:
+    """Describes the commit and the machine that produced the results."""
+    def git(*args):
+        try:
+            return subprocess.check_output(('git', *args), stderr=subprocess.DEVNULL, text=True).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {'commit': git('rev-parse', 'HEAD'),
+            'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count()}
+
+def parse_args(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--features', type=int, nargs='+', default=[20, 50])
+    parser.add_argument('--classes', type=int, nargs='+', default=[2, 5])
+    parser.add_argument('--noise', type=float, nargs='+', default=[0.1])
+    parser.add_argument('--max-depth', type=int, nargs='+', default=[2, 3, 4])
+    parser.add_argument('--cache-type', type=int, nargs='+', default=[0, 1])
+    parser.add_argument('--feature-ordering', type=int, nargs='+', default=[0])
+    parser.add_argument('--node-selection', type=int, nargs='+', default=[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--time', type=int, default=600, help='time budget of each fit in seconds')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each case, the best one is kept')
+    parser.add_argument('--predict-rows', type=int, default=100000)
+    parser.add_argument('--quick', action='store_true', help='small datasets and a single repeat')
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.rows, args.features, args.classes = [1000], [20], [2]
+        args.repeat, args.predict_rows = 1, 10000
+    return args
+
+def main(argv: list = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    grid = itertools.product(args.rows, args.features, args.classes, args.noise,
+                             args.max_depth, args.cache_type, args.feature_ordering, args.node_selection)
+    cases = [dict(zip(CASE_FIELDS, values), seed=args.seed) for values in grid]
+
+    results = []
+    for number, case in enumerate(cases, 1):
+        runs = [run_isolated(case, args.time, args.predict_rows) for _ in range(args.repeat)]
+        result = dict(case, name=case_name(case), **best_of(runs))
+        results.append(result)
+        print('[{}/{}] {}: fit {:.3f}s, ingestion {:.3f}s, predict {:.0f} rows/s'.format(
+            number, len(cases), result['name'], result['fit_time'], result['ingestion_time'],
+            result['predict_rows_per_second']), flush=True)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w') as file:
+        json.dump({'metadata': metadata(), 'settings': {'time': args.time, 'repeat': args.repeat,
+                                                        'predict_rows': args.predict_rows},
+                   'results': results}, file, indent=2)
+    print('Results saved in', args.output)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,33 @@
-import pandas as pd
+import asyncio
+import dataclasses
+import functools
+import os
+import pickle
+import timeit
+
 import numpy as np
-from . import lib
+
+from pymurtree import exporttree
+from pymurtree.arrow import arrow_to_bitmatrix, is_arrow
+from pymurtree.binarizer import Binarizer
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.bounds import misclassification_lower_bound
+from pymurtree.cache import dataset_fingerprint
+from pymurtree.cancellation import CancellationToken, FitCancelledError, SolveProgress
+from pymurtree.greedy import greedy_tree
+from pymurtree.parallel import RootSplitSearch
 from pymurtree.parameters import Parameters
+from pymurtree.path import all_trees_settings, pareto_front, path_settings
+from pymurtree.readdata import load_binary
+from pymurtree.resultcache import CachedResult, ResultCache
+from pymurtree.screening import FeatureScreener
+from pymurtree.serialization import read_model, write_model
+from pymurtree.solver import create_solver, result_tree, solve, solve_path
+from pymurtree.sparse import is_sparse, sparse_to_bitmatrix
+from pymurtree.stats import MemoryMeter, SolveStats, logger
+from pymurtree.tree import Tree
+from pymurtree.weights import cancel_conflicts, check_sample_weight
+
 
 def standardize_to_dtype_int32(np_array: np.ndarray) -> np.ndarray:
     """
@@ -24,11 +50,80 @@ def standardize_to_dtype_int32(np_array: np.ndarray) -> np.ndarray:
         return np_array
     else:
         return np_array
-    
+
+def as_solver_dtype(np_array: np.ndarray) -> np.ndarray:
+    """
+    Returns the input unchanged if the solver can read it in place, which is the case
+    for booleans and integers of any width and memory layout (C- or F-ordered).
+    Other types are converted with standardize_to_dtype_int32. Bit-packed BitMatrix 
+    features are also returned unchanged.
+
+    Parameters
+    ----------
+        np_array (numpy.ndarray): An array holding features or labels.
+
+    Returns
+    -------
+        numpy.ndarray: An array of booleans or integers.
+    """
+    if isinstance(np_array, BitMatrix):
+        return np_array
+    np_array = np.asarray(np_array)
+    if np_array.dtype.kind in 'biu':
+        return np_array
+    return standardize_to_dtype_int32(np_array)
+
+def packed_features(x):
+    """
+    Returns the features of an Arrow table or record batch, or of a scipy.sparse matrix, 
+    as a BitMatrix, built from the Arrow bitmaps (pymurtree.arrow.arrow_to_bitmatrix) or 
+    from the sparse indices (pymurtree.sparse.sparse_to_bitmatrix), and other inputs unchanged.
+    """
+    if is_arrow(x):
+        return arrow_to_bitmatrix(x)
+    if is_sparse(x):
+        return sparse_to_bitmatrix(x)
+    return x
+
+def binary_dataset(x, y) -> tuple:
+    """
+    Returns x and y unchanged, unless x is the path of a dataset written by save_binary,
+    which is then memory-mapped. Its labels are used if y is None.
+    """
+    if not isinstance(x, (str, os.PathLike)):
+        return x, y
+    x, labels = load_binary(x)
+    return x, labels if y is None else y
+
+def append_rows(x: np.ndarray, rows: np.ndarray):
+    """
+    Returns the rows of x followed by rows, as a BitMatrix if either is one.
+    """
+    if not isinstance(x, BitMatrix) and not isinstance(rows, BitMatrix):
+        return np.concatenate((x, rows))
+    # As the solver reads them, dense features are present only if they are 1
+    packed = [part.bits if isinstance(part, BitMatrix) else BitMatrix.from_dense(part == 1).bits for part in (x, rows)]
+    return BitMatrix(np.concatenate(packed), x.shape[1])
+
 class OptimalDecisionTreeClassifier:
     """
     OptimalDecisionTreeClassifier is a class that represents a PyMurTree model.
 
+    If a Binarizer is given as `binarizer`, fit, fit_path and predict accept raw
+    numeric and categorical features, which the binarizer transforms.
+
+    If a ResultCache, or the path of its directory, is given as `result_cache`, fit 
+    returns the stored result when the same data are fitted with the same parameters 
+    again, and stores the results of new fits.
+
+    Models can be pickled, e.g. to send them to worker processes, and saved in a
+    compact binary file with save and load. Neither keeps the solver or the 
+    training data.
+
+    If a FeatureScreener is given as `screener`, fit and fit_path search on the 
+    features it keeps, and the trees are mapped back to the original features, 
+    so that predict, export_text and export_dot take the same columns as fit.
+
     """
     def __init__(self,
                  time: int = 600,
@@ -43,11 +138,37 @@ class OptimalDecisionTreeClassifier:
                  feature_ordering: int = 0,
                  random_seed: int = 3,
                  cache_type: int = 0,
-                 duplicate_factor: int = 1
+                 duplicate_factor: int = 1,
+                 n_jobs: int = 1,
+                 cancel_conflicts: bool = False,
+                 binarizer: Binarizer = None,
+                 screener: FeatureScreener = None,
+                 result_cache: ResultCache = None
                 ) -> None:
 
+        # Solver holding the training data, kept with its cached subtrees for the next fits
         self.__solver = None
+        self.__source = None
+        self.__source_setup = None
+        self.__offset = 0
+        # Transforms the raw features in fit, fit_path and predict
+        self.__binarizer = binarizer
+        # Removes the redundant features before the search, and the columns it keeps
+        self.__screener = screener
+        self.__support = None
+        # Results of earlier fits, possibly by other processes
+        self.__result_cache = ResultCache(result_cache) if isinstance(result_cache, (str, os.PathLike)) else result_cache
+        self.__stats = None
         self.__tree = None
+        self.__misclassifications = None
+        self.__peak_memory = None
+        self.__memory = None
+        # Training data of the calls to partial_fit, which fit does not keep otherwise
+        self.__data = None
+        self.__keep_data = False
+        self.__is_optimal = False
+        self.__lower_bound = None
+        self.__all_trees = None
 
         if max_num_nodes is None:
             max_num_nodes = 2**max_depth - 1
@@ -58,7 +179,9 @@ class OptimalDecisionTreeClassifier:
                                    all_trees, incremental_frequency, 
                                    similarity_lower_bound, node_selection,
                                    feature_ordering, random_seed,
-                                   cache_type, duplicate_factor)
+                                   cache_type, duplicate_factor,
+                                   n_jobs=n_jobs,
+                                   cancel_conflicts=cancel_conflicts)
     
 
     def fit(self,
@@ -76,14 +199,42 @@ class OptimalDecisionTreeClassifier:
             feature_ordering: int = None,
             random_seed: int = None,
             cache_type: int = None,
-            duplicate_factor: int = None) -> None:
+            duplicate_factor: int = None,
+            n_jobs: int = None,
+            cancel_conflicts: bool = None,
+            sample_weight: np.ndarray = None,
+            cancel: CancellationToken = None,
+            progress_callback = None,
+            progress_interval: float = 1.0,
+            target_gap: int = None,
+            target_relative_gap: float = None,
+            upper_bound: int = None,
+            warm_start = None) -> None:
         """   
         Fits a PyMurTree model to the given training data.
 
+        The search runs with the GIL released, so other Python threads keep 
+        running during the fit and the fit itself can run in a background thread.
+        With cancel, progress_callback or a target gap, the search runs in slices of `progress_interval`
+        seconds on the same solver, which keeps the subtrees it cached from one slice to
+        the next, and each slice only looks for trees better than the best one so far.
+
+        The solver built by the first call to fit is kept, together with the subtrees
+        it has cached, and it is reused by the following calls to fit and fit_path 
+        on the same data. To compute trees for many settings at once, see fit_path,
+        and to fit again after the data changed, see refit and partial_fit.
+
         Parameters
         ----------
             x : (numpy.ndarray)
                 A 2D array that represents the input features of the training data.
+                Boolean and integer arrays, either C- or F-ordered, are read by the solver in place,
+                and a BitMatrix from its packed bits. Arrow tables and record batches of binary columns
+                are packed into a BitMatrix from their bitmaps, and scipy.sparse CSR or CSC matrices
+                from their indices. If the model was created with a binarizer, 
+                raw numeric and categorical features are binarized by it first, unless x is a BitMatrix. The path of a 
+                file written by pymurtree.save_binary or pymurtree.convert_to_binary is memory-mapped 
+                with pymurtree.load_binary, and its labels are used if y is None.
             y : 
                 (numpy.ndarray): A 1D array that represents the target variable of the training data.
             time : (int, optional) 
@@ -95,9 +246,14 @@ class OptimalDecisionTreeClassifier:
             sparse_coefficient : (float, optional)
                 The sparsity coefficient used for tree pruning. Defaults to None.
             verbose : (bool, optional)
-                If True, prints the progress of the training process. Defaults to None.
+                If True, logs the progress of the training process through the logger 'pymurtree'
+                at info level, e.g. after logging.basicConfig(level=logging.INFO). Defaults to None.
             all_trees : (bool, optional)
-                If True, returns all trees generated during the training process. Defaults to None.
+                If True, computes the trees of all the allowed combinations of depth and number of 
+                nodes, available through trees() and pareto_front(). The model keeps the tree with the 
+                largest depth and number of nodes. The combinations, from the smallest to the largest,
+                share the time budget, and those left once it is spent are not computed. Cannot be
+                used with cancel, progress_callback or target gaps. Defaults to None.
             incremental_frequency : (bool, optional) 
                 If True, uses incremental frequency counting. Defaults to None.
             similarity_lower_bound : (bool, optional)
@@ -110,14 +266,62 @@ class OptimalDecisionTreeClassifier:
                 The random seed for the training process. Defaults to None.
             cache_type (int, optional): The type of cache used for storing the intermediate results. Defaults to None.
             duplicate_factor (int, optional): The duplicate factor used for parallelization. Defaults to None.
+            n_jobs (int, optional): Number of threads that search the root-level splits in parallel, 
+                -1 uses all the cores. The tree has the optimal cost, and among the trees of that cost, 
+                the one chosen by the rule of pymurtree.parallel.RootSplitSearch, which does not depend 
+                on the number of threads but may differ from the one of the serial search.
+                Requires feature_ordering to be 0 (in-order). Only used without sparse objective, 
+                all_trees or target gaps, and with max_depth of at least 2; the serial search runs 
+                otherwise. Defaults to None, which keeps the value of the model (1 unless another was 
+                given to the constructor or to an earlier fit).
+            cancel_conflicts (bool, optional): If True, sets of identical rows that hold one row
+                of every class are removed, since they add the same misclassifications to every tree.
+                This gives the same optimal trees with fewer instances when the data has such 
+                conflicts. Identical rows with one label are not reduced, since the solver still 
+                holds one instance per row (see pymurtree.weights.cancel_conflicts). 
+                Requires sparse_coefficient to be zero. Defaults to None.
+            sample_weight (numpy.ndarray, optional): Non-negative integer weights of the rows. 
+                A row of weight w counts as w identical rows in the misclassifications, and the 
+                solver holds w copies of it, so its memory and search time grow with the total 
+                weight. Defaults to None.
+            cancel (CancellationToken, optional): Token checked between two slices of the search. 
+                Once cancelled, the native search stops at the end of its current slice, and fit 
+                raises FitCancelledError. The model keeps the best tree found until then. With 
+                n_jobs, it is checked before each root split is searched. Defaults to None.
+            progress_callback (callable, optional): Called with a SolveProgress after every slice
+                of the search, and once more when the fit finishes. The progress holds the elapsed 
+                time, the misclassifications of the best tree found so far, and the lower bound
+                given by the conflicting rows. If the callback raises, the search stops and the 
+                error is raised by fit, as for a cancellation. Cannot be used with the parallel 
+                search of n_jobs. Defaults to None.
+            progress_interval (float, optional): Seconds of each slice of the search, hence between
+                two progress reports, cancellation checks or gap checks. Shorter slices react faster, at the 
+                cost of restarting the search from the cached subtrees more often. Defaults to 1.0.
+            target_gap (int, optional): Stop as soon as the misclassifications of the best tree are 
+                at most this far from the lower bound. The gap is checked after every slice of 
+                `progress_interval` seconds, so the search stops within one slice of reaching it, 
+                and never runs longer than `time`. Defaults to None.
+            target_relative_gap (float, optional): As `target_gap`, but relative to the 
+                misclassifications of the best tree. Defaults to None.
+            upper_bound (int, optional): Misclassifications of a known tree. Only trees that are at 
+                least as good are searched, which prunes the search from the root on. Requires
+                sparse_coefficient to be zero. Defaults to None.
+            warm_start (optional): A tree whose misclassifications on the training data are used as 
+                upper bound, and which is kept if the search finds nothing within the time budget. 
+                Either a fitted OptimalDecisionTreeClassifier, a Tree, or 'greedy' to build a
+                greedy CART-like tree within the depth and node limits. Requires sparse_coefficient 
+                to be zero. Defaults to None.
 
         Returns
         -------
-            None
+            Tree: The fitted tree, also available as tree_.
 
         Raises
         ------
-            ValueError: If x or y is None or if they have a different number of rows.
+            ValueError: If x or y is None, if they have a different number of rows, if the 
+                warm start tree exceeds the depth or node limits, or if no tree meets 
+                upper_bound.
+            FitCancelledError: If the fit is cancelled through `cancel`.
 
         Examples
         --------
@@ -126,17 +330,24 @@ class OptimalDecisionTreeClassifier:
             >>> y_train = np.array([0, 1])
             >>> model.fit(x_train, y_train)
         """
+        stats = SolveStats()
+        self.__memory = MemoryMeter()
+        preprocessing_start = timeit.default_timer()
+        x, y = binary_dataset(x, y)
         # Check data entry
         if x is None:
             raise ValueError('x is None')
         if y is None:
             raise ValueError('y is None')
         if x is not None and y is not None:
-            x = standardize_to_dtype_int32(x) # These are required otherwise the model will not work and test will fail
-            y = standardize_to_dtype_int32(y)
-            if x.shape[0] == y.shape[0]:
-                    arr = np.concatenate((y.reshape(-1,1), x), axis=1)
-            else: 
+            if self.__binarizer is not None and not isinstance(x, BitMatrix):
+                x = self.__binarizer.fit_transform(x, y)
+            else:
+                x = packed_features(x)
+            # Booleans and integers are passed to the solver as they are, without copies
+            x = as_solver_dtype(x)
+            y = as_solver_dtype(y)
+            if x.shape[0] != y.shape[0]:
                 raise ValueError('x and y have different number of rows')
             
         if time is not None:
@@ -165,61 +376,559 @@ class OptimalDecisionTreeClassifier:
             self.__params.cache_type = cache_type
         if duplicate_factor is not None:
             self.__params.duplicate_factor = duplicate_factor
+        if n_jobs is not None:
+            self.__params.n_jobs = n_jobs
+        if self.__params.n_jobs == 0:
+            raise ValueError('n_jobs should not be 0')
+        if self.__params.n_jobs != 1 and self.__params.feature_ordering != 0:
+            raise ValueError('n_jobs requires the in-order feature ordering (feature_ordering=0), '
+                             'in which the parallel search tries the root splits')
+        if cancel_conflicts is not None:
+            self.__params.cancel_conflicts = cancel_conflicts
+        if self.__params.cancel_conflicts and self.__params.sparse_coefficient != 0:
+            raise ValueError('cancel_conflicts requires sparse_coefficient to be zero')
+        if sample_weight is not None:
+            sample_weight = check_sample_weight(sample_weight, x.shape[0])
+        if progress_interval <= 0:
+            raise ValueError('progress_interval should be positive')
+        self.__screen(x, y, sample_weight)
 
-        # Initialize solver (call cpp Solver class constructor)
-        if self.__solver is None:
-            self.__solver = lib.Solver(arr,
-                                       self.__params.time,
-                                       self.__params.max_depth,
-                                       self.__params.max_num_nodes,
-                                       self.__params.sparse_coefficient,
-                                       self.__params.verbose,
-                                       self.__params.all_trees,
-                                       self.__params.incremental_frequency,
-                                       self.__params.similarity_lower_bound,
-                                       self.__params.node_selection,
-                                       self.__params.feature_ordering,
-                                       self.__params.random_seed,
-                                       self.__params.cache_type,
-                                       self.__params.duplicate_factor)
+        # The search is split at the root to run in parallel
+        decomposed = (self.__params.n_jobs != 1 and self.__params.sparse_coefficient == 0
+                      and self.__params.max_depth >= 2 and not self.__params.all_trees and target_gap is None and target_relative_gap is None)
+        # The data are hashed once, to know whether the solver can be kept, and for the result cache
+        fingerprint = None
+        if not decomposed or self.__result_cache is not None:
+            fingerprint = dataset_fingerprint(x, y, sample_weight)
+        # The decomposed search creates its own solvers
+        if not decomposed:
+            self.__load(x, y, sample_weight, fingerprint)
         
         # Creates the tree that will be used for predictions
-        self.__tree = self.__solver.solve(arr,
-                                          self.__params.time,
-                                          self.__params.max_depth,
-                                          self.__params.max_num_nodes,
-                                          self.__params.sparse_coefficient,
-                                          self.__params.verbose,
-                                          self.__params.all_trees,
-                                          self.__params.incremental_frequency,
-                                          self.__params.similarity_lower_bound,
-                                          self.__params.node_selection,
-                                          self.__params.feature_ordering,
-                                          self.__params.random_seed,
-                                          self.__params.cache_type,
-                                          self.__params.duplicate_factor)
+        self.__stats = stats
+        self.__data = (x, y, sample_weight) if self.__keep_data else None
+        self.__tree = None
+        self.__misclassifications = None
+        self.__is_optimal = False
+        self.__lower_bound = None
+        self.__all_trees = None
+
+        # The upper bound only applies to this fit, it is not kept for the following ones
+        params = dataclasses.replace(self.__params, upper_bound=upper_bound)
+        if warm_start is not None:
+            self.__tree = self.__warm_start_tree(warm_start, x, y)
+            self.__misclassifications = self.__tree.count_misclassifications(x, y, sample_weight=sample_weight) * self.__params.duplicate_factor
+            if upper_bound is None or self.__misclassifications < upper_bound:
+                params.upper_bound = self.__misclassifications
+        if params.upper_bound is not None and params.sparse_coefficient != 0:
+            raise ValueError('Upper bounds and warm starts require sparse_coefficient to be zero')
+
+        key = None
+        cached = None
+        if self.__result_cache is not None and not params.all_trees:
+            key = self.__result_key(fingerprint, params, warm_start, target_gap, target_relative_gap)
+            cached = self.__result_cache.get(key)
+            if cached is None:
+                stats.result_cache_misses += 1
+            else:
+                stats.result_cache_hits += 1
+
+        if cached is None:
+            # Kept rather than the training data, which lower_bound would need otherwise,
+            # and reported as progress from the start
+            self.__lower_bound = self.__data_lower_bound(x, y, sample_weight)
+        start = timeit.default_timer()
+        stats.preprocessing_time += start - preprocessing_start
+        if cached is not None:
+            self.__tree = cached.tree
+            self.__misclassifications = cached.misclassifications
+            self.__is_optimal = cached.is_optimal
+            self.__lower_bound = cached.lower_bound
+        elif params.all_trees:
+            if params.upper_bound is not None:
+                raise ValueError('Upper bounds and warm starts cannot be used with all_trees')
+            if (cancel is not None or progress_callback is not None
+                    or target_gap is not None or target_relative_gap is not None):
+                raise ValueError('cancel, progress_callback and target gaps cannot be used with all_trees')
+            self.__search_all_trees()
+        elif decomposed:
+            if progress_callback is not None:
+                raise ValueError('progress_callback cannot be used with the parallel search of n_jobs')
+            self.__search_decomposed(params, cancel, x, y, sample_weight)
+        else:
+            self.__search(params, start, cancel, progress_callback, progress_interval, target_gap, target_relative_gap)
+        if self.__tree is None and params.upper_bound is not None:
+            raise ValueError('No tree with at most {} misclassifications {}'.format(
+                params.upper_bound, 'exists' if self.__is_optimal else 'was found within the time budget'))
+        if key is not None and cached is None and self.__tree is not None:
+            try:
+                self.__result_cache.put(key, CachedResult(self.__tree, self.__misclassifications,
+                                                          self.__is_optimal, self.__lower_bound))
+            except OSError as error:
+                # The tree is still returned, it is only not stored for the next fits
+                logger.warning('The result could not be stored in the result cache: %s', error)
+        stats.peak_memory = self.__memory.rise()
+        if progress_callback is not None:
+            progress_callback(self.__progress(start))
         
-        # This should return a tree object that will be used for predictions
-        return self.__tree        
+        # The tree object that will be used for predictions
+        return self.__tree
+
+    def refit(self, x: np.ndarray, y: np.ndarray, sample_weight: np.ndarray = None, **kwargs) -> Tree:
+        """
+        Fits the model to new training data, starting from the current tree.
+
+        The misclassifications of the current tree on the new data are the initial 
+        upper bound of the search, which prunes it from the root on, and the tree 
+        is kept if nothing better is found within the time budget. The current tree 
+        is not used if it exceeds the limits of the new fit, or with the sparse 
+        objective or all_trees.
+
+        Parameters
+        ----------
+            x, y, sample_weight: As in fit.
+            **kwargs: Any other keyword argument accepted by fit.
+
+        Returns
+        -------
+            Tree: The tree of the model.
+        """
+        if 'warm_start' not in kwargs and self.__fits_limits(self.__tree, kwargs):
+            kwargs['warm_start'] = self.__tree
+        return self.fit(x, y, sample_weight=sample_weight, **kwargs)
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray, sample_weight: np.ndarray = None, **kwargs) -> Tree:
+        """
+        Appends rows to the rows given to the previous calls to partial_fit and refits 
+        the model, see refit.
+
+        The new rows are transformed like the data of predict, by the binarizer fitted 
+        before if any, so the features keep their meaning. The model keeps the rows of
+        partial_fit, in the form given to the solver, until fit is called, since fit does
+        not keep its training data. If there are no such rows, this is the same as fit.
+
+        Parameters
+        ----------
+            x (numpy.ndarray): The features of the new rows, as accepted by fit.
+            y (numpy.ndarray): The labels of the new rows.
+            sample_weight (numpy.ndarray, optional): Weights of the new rows. Defaults to None.
+            **kwargs: Any other keyword argument accepted by fit.
+
+        Returns
+        -------
+            Tree: The tree of the model.
+
+        Examples
+        --------
+            >>> model.partial_fit(x_monday, y_monday)
+            >>> model.partial_fit(x_tuesday, y_tuesday) # fits the rows of both days
+        """
+        if self.__data is None:
+            return self.__fit_keeping_data(self.fit, x, y, sample_weight=sample_weight, **kwargs)
+        x, y = binary_dataset(x, y)
+        if x is None:
+            raise ValueError('x is None')
+        if y is None:
+            raise ValueError('y is None')
+        if self.__binarizer is not None and not isinstance(x, BitMatrix):
+            x = self.__binarizer.transform(x)
+        else:
+            x = packed_features(x)
+        x = as_solver_dtype(x)
+        y = as_solver_dtype(y)
+        if x.shape[0] != y.shape[0]:
+            raise ValueError('x and y have different number of rows')
+        x_old, y_old, weights_old = self.__data
+        if x.shape[1] != x_old.shape[1]:
+            raise ValueError(f'x has {x.shape[1]} features but the model was fitted on {x_old.shape[1]}')
+        weights = None
+        if sample_weight is not None or weights_old is not None:
+            old = np.ones(len(y_old), dtype=np.int64) if weights_old is None else weights_old
+            new = np.ones(len(y), dtype=np.int64) if sample_weight is None else check_sample_weight(sample_weight, len(y))
+            weights = np.concatenate((old, new))
+        return self.__fit_keeping_data(self.refit, append_rows(x_old, x), np.concatenate((y_old, y)),
+                                       sample_weight=weights, **kwargs)
+
+    def __fit_keeping_data(self, fit, *args, **kwargs) -> Tree:
+        # Calls fit or refit so that the model keeps the training data for the next partial_fit
+        self.__keep_data = True
+        try:
+            return fit(*args, **kwargs)
+        finally:
+            self.__keep_data = False
+
+    def __fits_limits(self, tree: Tree, kwargs: dict) -> bool:
+        # Whether a tree can warm start a fit with these arguments
+        if tree is None:
+            return False
+        setting = lambda name: kwargs[name] if kwargs.get(name) is not None else getattr(self.__params, name)
+        return (setting('sparse_coefficient') == 0 and not setting('all_trees')
+                and tree.max_depth <= setting('max_depth') and tree.num_feature_nodes <= setting('max_num_nodes'))
+
+    def __result_key(self, fingerprint: str, params: Parameters, warm_start,
+                     target_gap: int, target_relative_gap: float) -> str:
+        # Everything that determines the result of a fit, which verbose and n_jobs do not
+        screener = None
+        if self.__screener is not None:
+            screener = (self.__screener.top_k, self.__screener.criterion)
+        warm_tree = None
+        if warm_start is not None:
+            warm_tree = dataset_fingerprint(self.__tree.feature, self.__tree.left, self.__tree.right, self.__tree.label)
+        return ResultCache.key(fingerprint, dataclasses.replace(params, verbose=False, n_jobs=1),
+                               screener, warm_tree, target_gap, target_relative_gap)
 
-    def predict(self, x: np.ndarray) -> np.ndarray:
+    def __search_decomposed(self, params: Parameters, cancel: CancellationToken,
+                            x, y: np.ndarray, sample_weight: np.ndarray) -> None:
+        # Searches the root-level splits, in parallel if n_jobs != 1, see pymurtree.parallel.RootSplitSearch
+        x, y, weights, offset = self.__training_data(x, y, sample_weight)
+        search = RootSplitSearch(x, y, self.__solver_params(params, offset), params.n_jobs, cancel, weights)
+        try:
+            tree, misclassifications, is_optimal = search.run()
+            tree = self.__original_tree(tree)
+            misclassifications += offset
+        finally:
+            self.__stats.merge(search.stats)
+        # The warm start tree is kept if the search found nothing better
+        if self.__tree is None or misclassifications <= self.__misclassifications:
+            self.__tree = tree
+            self.__misclassifications = misclassifications
+        self.__is_optimal = is_optimal
+        if is_optimal:
+            self.__lower_bound = self.__misclassifications
+
+    def __search_all_trees(self) -> None:
+        # Solves the combinations of depth and number of nodes with one native call and one
+        # time budget, and keeps the largest one solved as the tree of the model, which is
+        # only optimal for the limits of the model if every combination was solved
+        settings = all_trees_settings(self.__params.max_depth, self.__params.max_num_nodes,
+                                      self.__params.sparse_coefficient)
+        results = self.__solve_settings(settings, shared_time=True)
+        self.__all_trees = {(result.max_depth, result.max_num_nodes): result for result in results}
+        largest = results[-1] if results else None
+        if largest is not None and largest.tree.node_count > 0:
+            self.__tree = largest.tree
+            self.__misclassifications = largest.misclassifications
+            self.__is_optimal = largest.is_optimal and len(results) == len(settings)
+            if self.__is_optimal and self.__params.sparse_coefficient == 0:
+                self.__lower_bound = self.__misclassifications
+
+    def fit_path(self,
+                 x: np.ndarray,
+                 y: np.ndarray,
+                 max_depth: list,
+                 max_num_nodes: list = None,
+                 sparse_coefficient: list = None,
+                 sample_weight: np.ndarray = None) -> list:
+        """
+        Computes the trees of a regularization path with a single solver.
+
+        All the combinations of the given values are solved, in the order that lets
+        the solver reuse the most subtrees from one setting to the next (see 
+        pymurtree.path.path_settings). The other parameters are those of the model, 
+        and `time` applies to each setting. The tree of the model is not changed.
+
+        Parameters
+        ----------
+            x (numpy.ndarray): A 2D array that represents the input features of the training data,
+                or the path of a binary dataset as in fit.
+            y (numpy.ndarray): A 1D array that represents the target variable of the training data.
+            max_depth (list): Values of max_depth.
+            max_num_nodes (list, optional): Values of max_num_nodes. Defaults to the largest
+                number of nodes allowed by each depth.
+            sparse_coefficient (list, optional): Values of sparse_coefficient. Defaults to [0.0].
+            sample_weight (numpy.ndarray, optional): Non-negative integer weights of the rows. Defaults to None.
+
+        Returns
+        -------
+            list: A PathResult for each setting, in solving order.
+
+        Examples
+        --------
+            >>> results = model.fit_path(x_train, y_train, max_depth=[2, 3, 4], sparse_coefficient=[0.0, 0.01])
+            >>> best = min(results, key=lambda result: result.misclassifications + result.tree.num_feature_nodes)
+        """
+        x, y = binary_dataset(x, y)
+        if x is None:
+            raise ValueError('x is None')
+        if y is None:
+            raise ValueError('y is None')
+        if self.__binarizer is not None and not isinstance(x, BitMatrix):
+            x = self.__binarizer.fit_transform(x, y)
+        else:
+            x = packed_features(x)
+        x = as_solver_dtype(x)
+        y = as_solver_dtype(y)
+        if x.shape[0] != y.shape[0]:
+            raise ValueError('x and y have different number of rows')
+        settings = path_settings(max_depth, max_num_nodes, sparse_coefficient)
+        if self.__params.cancel_conflicts and any(setting[2] != 0 for setting in settings):
+            raise ValueError('cancel_conflicts requires sparse_coefficient to be zero')
+        if sample_weight is not None:
+            sample_weight = check_sample_weight(sample_weight, x.shape[0])
+        self.__screen(x, y, sample_weight)
+        self.__stats = SolveStats()
+        self.__memory = MemoryMeter()
+        self.__load(x, y, sample_weight, dataset_fingerprint(x, y, sample_weight))
+        results = self.__solve_settings(settings)
+        self.__stats.peak_memory = self.__memory.rise()
+        return results
+
+    def __solve_settings(self, settings: list, shared_time: bool = False) -> list:
+        # Solves the (max_depth, max_num_nodes, sparse_coefficient) settings in order with one native call
+        results = self.__run_solver(lambda solver: solve_path(solver, settings, self.__params, self.__stats, shared_time))
+        return [dataclasses.replace(result, tree=self.__original_tree(result.tree),
+                                    misclassifications=result.misclassifications + self.__offset)
+                for result in results]
+
+    def __screen(self, x, y: np.ndarray, sample_weight: np.ndarray) -> None:
+        # Chooses the columns searched, all of them without screener
+        if self.__screener is not None:
+            self.__support = self.__screener.fit(x, y, sample_weight).support_
+        else:
+            self.__support = None
+
+    def __original_tree(self, tree: Tree) -> Tree:
+        # Maps the features of a tree found on the screened columns back to the columns of x
+        if self.__support is None or tree.node_count == 0:
+            return tree
+        return tree.with_features(self.__support)
+
+    def __load(self, x: np.ndarray, y: np.ndarray, sample_weight: np.ndarray, fingerprint: str) -> None:
+        # The solver is created from these data if none is kept.
+        # A solver built from other data, weights, cancelled conflicts or screened features cannot be kept
+        support = None if self.__support is None else self.__support.tobytes()
+        setup = (self.__params.cancel_conflicts, support, fingerprint)
+        if setup != self.__source_setup:
+            self.__solver = None
+        self.__source_setup = setup
+        if self.__solver is None:
+            x, y, weights, self.__offset = self.__training_data(x, y, sample_weight)
+            self.__source = (x, y, weights)
+
+    def __training_data(self, x: np.ndarray, y: np.ndarray, sample_weight: np.ndarray) -> tuple:
+        # Returns the rows, labels and weights given to the solvers, and the offset to add
+        # to their misclassifications, which is not zero if the conflicts are cancelled
+        if self.__support is not None:
+            x = self.__screener.transform(x)
+        if not self.__params.cancel_conflicts:
+            return x, y, sample_weight, 0
+        x, y, weights, offset = cancel_conflicts(x, y, sample_weight)
+        return x, y, weights, offset * self.__params.duplicate_factor
+
+    @staticmethod
+    def __solver_params(params: Parameters, offset: int) -> Parameters:
+        # Upper bound of the solvers, whose misclassifications are offset from those of the model
+        if params.upper_bound is None or offset == 0:
+            return params
+        return dataclasses.replace(params, upper_bound=max(0, params.upper_bound - offset))
+
+    def __create_solver(self):
+        # Initialize solver (call cpp Solver class constructor). The solver holds its own
+        # copy of the data, so the model does not keep them once it is created
+        x, y, weights = self.__source
+        self.__source = None
+        solver = create_solver(x, y, self.__params, self.__stats, weights)
+        # The rise of the memory right after ingestion tells how much it took to load the data
+        self.__peak_memory = (self.__memory or MemoryMeter()).rise()
+        return solver
+
+    def __run_solver(self, function):
+        # Calls function(solver) on the solver of the training data, created if it is not kept
+        return function(self.__kept_solver())
+
+    def __kept_solver(self):
+        if self.__solver is None:
+            self.__solver = self.__create_solver()
+        return self.__solver
+
+    def __warm_start_tree(self, warm_start, x: np.ndarray, y: np.ndarray) -> Tree:
+        # Returns the tree used as warm start, checking that it respects the limits of the search
+        if isinstance(warm_start, str):
+            if warm_start != 'greedy':
+                raise ValueError("warm_start should be a fitted model, a Tree or 'greedy'")
+            if isinstance(x, BitMatrix):
+                x = x.to_dense()
+            return greedy_tree(x, y, self.__params.max_depth, self.__params.max_num_nodes)
+        tree = warm_start.tree_ if isinstance(warm_start, OptimalDecisionTreeClassifier) else warm_start
+        if tree is None or tree.node_count == 0:
+            raise ValueError('The warm start tree is empty')
+        if tree.max_depth > self.__params.max_depth or tree.num_feature_nodes > self.__params.max_num_nodes:
+            raise ValueError('The warm start tree exceeds max_depth or max_num_nodes')
+        return tree
+
+    async def fit_async(self, x: np.ndarray, y: np.ndarray, cancel: CancellationToken = None, **kwargs) -> None:
+        """
+        Awaitable version of fit, which runs the fit in the default executor of the event loop.
+        If the awaiting task is cancelled, the fit is cancelled too.
+
+        Parameters
+        ----------
+            x, y, cancel: As in fit.
+            **kwargs: Any other keyword argument accepted by fit.
+
+        Examples
+        --------
+            >>> await model.fit_async(x_train, y_train, max_depth=4)
+        """
+        if cancel is None:
+            cancel = CancellationToken()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, functools.partial(self.fit, x, y, cancel=cancel, **kwargs))
+        except asyncio.CancelledError:
+            cancel.cancel()
+            raise
+
+    def __search(self, params: Parameters, start: float, cancel: CancellationToken, progress_callback, progress_interval: float,
+                 target_gap: int = None, target_relative_gap: float = None) -> None:
+        # Runs the search and keeps its tree, unless no tree was found within the time budget
+        if cancel is None and progress_callback is None and target_gap is None and target_relative_gap is None:
+            params = self.__solver_params(params, self.__offset)
+            self.__keep_result(self.__run_solver(lambda solver: solve(solver, params, self.__stats)))
+            return
+        # The native search cannot be interrupted while it runs, so it runs in slices, between
+        # which the token and the gap are checked and the progress reported. Each slice starts from the
+        # subtrees cached by the previous ones, and looks for trees better than the best so far.
+        # The sparse objective takes no upper bound, so the tree of the last slice is kept
+        solver = self.__kept_solver()
+        began = timeit.default_timer()
+        while not self.__is_optimal and not self.__within_gap(target_gap, target_relative_gap):
+            if cancel is not None and cancel.cancelled:
+                raise FitCancelledError('The fit was cancelled')
+            remaining = params.time - (timeit.default_timer() - began)
+            if remaining <= 0:
+                break
+            slice_params = dataclasses.replace(params, time=min(progress_interval, remaining))
+            if self.__tree is not None and params.sparse_coefficient == 0:
+                if self.__misclassifications <= self.__lower_bound:
+                    # The best tree reaches the lower bound, so nothing better exists
+                    self.__is_optimal = True
+                    break
+                best = self.__misclassifications - 1
+                slice_params.upper_bound = best if params.upper_bound is None else min(best, params.upper_bound)
+            result = solve(solver, self.__solver_params(slice_params, self.__offset), self.__stats)
+            self.__keep_result(result)
+            if progress_callback is not None and not self.__is_optimal:
+                progress_callback(self.__progress(start))
+
+    def __keep_result(self, result) -> None:
+        # Keeps the tree of a search, if it found one. The solver tells whether it proved the
+        # tree optimal, or with an upper bound, that no better tree than the current one exists
+        tree = self.__original_tree(result_tree(result, self.__stats))
+        self.__is_optimal = result.is_proven_optimal()
+        if tree.node_count > 0:
+            self.__tree = tree
+            self.__misclassifications = result.misclassification_score() + self.__offset
+        if self.__tree is not None and self.__is_optimal and self.__params.sparse_coefficient == 0:
+            self.__lower_bound = self.__misclassifications
+
+    def __progress(self, start: float) -> SolveProgress:
+        return SolveProgress(timeit.default_timer() - start, self.__misclassifications, self.__lower_bound)
+
+    def __data_lower_bound(self, x, y: np.ndarray, sample_weight: np.ndarray) -> int:
+        # Misclassifications of the conflicting rows, which no tree can avoid
+        return misclassification_lower_bound(x, y, sample_weight=sample_weight) * self.__params.duplicate_factor
+
+    def __within_gap(self, target_gap: int, target_relative_gap: float) -> bool:
+        if self.__tree is None:
+            return False
+        upper_bound = self.upper_bound()
+        gap = upper_bound - self.lower_bound()
+        return ((target_gap is not None and gap <= target_gap)
+                or (target_relative_gap is not None and gap <= target_relative_gap * upper_bound))
+
+    def predict(self, x: np.ndarray, n_jobs: int = None, out: np.ndarray = None) -> np.ndarray:
         """
         Predicts the target variable for the given input features.
 
         Parameters
         ----------
-            x (numpy.ndarray): A 2D array that represents the input features of the test data.
+            x (numpy.ndarray or BitMatrix): A 2D array that represents the input features of the test data.
                 Each row corresponds to an instance, and each column corresponds to a feature.
+                If the model has a binarizer, raw features are transformed by it first. Arrow tables 
+                and record batches of binary columns are packed into a BitMatrix. For scipy.sparse 
+                matrices, only the features tested along the path of each row are looked up.
+            n_jobs (int, optional): If given, the rows are classified natively by this many threads 
+                with the GIL released (-1 uses all the cores). Bit-packed BitMatrix inputs are always 
+                classified natively.
+            out (numpy.ndarray, optional): A preallocated 1D int32 array where the predictions are written.
 
         Returns
         -------
             numpy.ndarray: A 1D array that represents the predicted target variable of the test data.
                 The i-th element in this array corresponds to the predicted target variable for the i-th instance in `x`.
         """
-        # Check data entry
-        x = standardize_to_dtype_int32(x)
-        predictions = self.__tree._predict(x) # Obtain predictions from the decision tree model using the _predict binding
-        return predictions # Return the 1D array of predictions/labels
+        if self.__tree is None:
+            raise ValueError('self.__tree is None')
+        if self.__binarizer is not None and not isinstance(x, BitMatrix):
+            x = self.__binarizer.transform(x)
+        elif is_arrow(x):
+            x = arrow_to_bitmatrix(x)
+        # Vectorized traversal of the array representation over the whole batch,
+        # or native multithreaded traversal if requested
+        return self.__tree.predict(x, n_jobs=n_jobs, out=out)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the fitted model in a compact binary file: a versioned header, the flat node 
+        arrays of the tree, the parameters, and the binarizer and screener if any
+        (see pymurtree.serialization). The solver and the training data are not saved.
+
+        Parameters
+        ----------
+            path (str): The path of the file.
+        """
+        if self.__tree is None:
+            raise ValueError('self.__tree is None')
+        extras = {'binarizer': self.__binarizer, 'screener': self.__screener}
+        extras = pickle.dumps(extras) if any(value is not None for value in extras.values()) else b''
+        write_model(path, self.__tree, self.__misclassifications, self.__is_optimal, self.__lower_bound,
+                    dataclasses.asdict(self.__params), extras)
+
+    @classmethod
+    def load(cls, path: str) -> 'OptimalDecisionTreeClassifier':
+        """
+        Loads a model saved by save, ready to predict and export. Only load files from 
+        trusted sources, since the binarizer and screener are unpickled.
+
+        Parameters
+        ----------
+            path (str): The path of the file.
+
+        Returns
+        -------
+            OptimalDecisionTreeClassifier: The model.
+        """
+        saved = read_model(path)
+        extras = pickle.loads(saved['extras']) if saved['extras'] else {}
+        model = cls(binarizer=extras.get('binarizer'), screener=extras.get('screener'))
+        # Parameters that this version no longer has are ignored
+        names = {field.name for field in dataclasses.fields(Parameters)}
+        model.__params = Parameters(**{name: value for name, value in saved['params'].items() if name in names})
+        model.__tree = saved['tree']
+        model.__misclassifications = saved['misclassifications']
+        model.__is_optimal = saved['is_optimal']
+        model.__lower_bound = saved['lower_bound']
+        return model
+
+    def __getstate__(self) -> dict:
+        # The solver and the training data stay in this process, so pickling
+        # the model only copies the tree, its scores and the parameters
+        state = self.__dict__.copy()
+        for name in ('solver', 'source', 'source_setup', 'data', 'memory'):
+            state['_OptimalDecisionTreeClassifier__' + name] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+    @property
+    def tree_(self) -> Tree:
+        """
+        The fitted tree as parallel arrays (feature, left, right, label and depth). 
+        See pymurtree.tree.Tree for details. None if the model has not been fitted.
+        """
+        return self.__tree
 
     
 
@@ -235,7 +944,9 @@ class OptimalDecisionTreeClassifier:
         -------
             int: The misclassification score of the tree.
         """
-        return self.__tree.misclassification_score()
+        if self.__tree is None:
+            raise ValueError('self.__tree is None')
+        return self.__misclassifications
 
     def depth(self) -> int:
         """
@@ -250,7 +961,7 @@ class OptimalDecisionTreeClassifier:
             int: The depth of the tree.    
 
         """
-        return self.__tree.tree_depth()
+        return self.__tree.max_depth
 
     def num_nodes(self) -> int:
         '''
@@ -265,7 +976,123 @@ class OptimalDecisionTreeClassifier:
             int: The number of nodes in the tree.
         '''
 
-        return self.__tree.tree_nodes()
+        return self.__tree.num_feature_nodes
+
+    def upper_bound(self) -> int:
+        '''
+        Returns the misclassifications of the best tree found, which is an upper bound 
+        on the misclassifications of the optimal tree.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            int: The misclassification score of the best tree.
+        '''
+        if self.__tree is None:
+            raise ValueError('self.__tree is None')
+        return self.__misclassifications
+
+    def lower_bound(self) -> int:
+        '''
+        Returns a proven lower bound on the misclassifications of the optimal tree. 
+        It equals the upper bound if the tree is proven optimal (without sparse objective),
+        otherwise it counts the instances that no tree can classify correctly because 
+        they share their features with instances of other labels.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            int: The lower bound on the misclassification score.
+        '''
+        if self.__tree is None or self.__lower_bound is None:
+            raise ValueError('The model has not been fitted')
+        return self.__lower_bound
+
+    def is_optimal(self) -> bool:
+        '''
+        Returns True if the solver proved the tree optimal, which it does
+        when its search completes within the time budget.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            bool: True if the tree is proven optimal.
+        '''
+        return self.__is_optimal
+
+    def trees(self) -> dict:
+        '''
+        Returns the trees computed by a fit with all_trees, for every allowed 
+        combination of depth and number of feature nodes.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            dict: The PathResult of each (max_depth, max_num_nodes) pair solved within the time budget.
+        '''
+        if self.__all_trees is None:
+            raise ValueError('The model was not fitted with all_trees')
+        return self.__all_trees
+
+    def pareto_front(self) -> list:
+        '''
+        Returns the trees computed by a fit with all_trees that are Pareto-optimal with 
+        respect to size and misclassifications (see pymurtree.path.pareto_front).
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            list: The Pareto-optimal PathResult objects, from the smallest to the largest tree.
+        '''
+        return pareto_front(self.trees().values())
+
+    def peak_memory(self) -> int:
+        '''
+        Returns the highest rise of the resident memory of the process from the start
+        of the fit until the training data was loaded into the solver, in bytes. See
+        pymurtree.stats.MemoryMeter for how it is measured on each platform.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            int: The rise of the memory in bytes, or None if it is not available on this platform.
+        '''
+        return self.__peak_memory
+
+    def stats(self) -> SolveStats:
+        '''
+        Returns the statistics of the last fit or fit_path: the wall time of each phase 
+        (ingestion, preprocessing, search and tree reconstruction), the statistics kept
+        by the solver, such as cache hits and calls to the depth-two solver, and the 
+        peak memory.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            SolveStats: The statistics, or None if the model has not been fitted.
+        '''
+        return self.__stats
 
     def export_text(self, filepath: str = '') -> None:
         '''
@@ -284,7 +1111,7 @@ class OptimalDecisionTreeClassifier:
         if self.__tree is None:
             raise ValueError('self.__tree is None')
         else:
-            self.__tree.export_text(filepath)
+            exporttree.export_text(self.__tree, filepath)
 
 
     def export_dot(self, filepath: str = '') -> None:
@@ -300,4 +1127,50 @@ class OptimalDecisionTreeClassifier:
         if self.__tree is None:
             raise ValueError('self.__tree is None')
         else:
-            self.__tree.export_dot(filepath)
\ No newline at end of file
+            exporttree.export_dot(self.__tree, filepath)
+
+    def export_numpy(self, filepath: str = '') -> None:
+        '''
+        Export the decision tree as a Python module whose predict(x) classifies a batch 
+        of rows with nested NumPy expressions, without pymurtree.
+
+        The module classifies binary features. If the model has a binarizer, it expects 
+        the binarized columns, as given by its transform(x).to_dense(), not the 
+        raw ones; its feature_names_ tell the test behind each column.
+
+        Parameters
+            filepath (str, optional): Name of the output file, the standard output is used if not given.
+        
+        Returns
+            None
+
+        Raises
+            OSError: If the output file cannot be written.
+        '''
+        if self.__tree is None:
+            raise ValueError('self.__tree is None')
+        else:
+            exporttree.export_numpy(self.__tree, filepath)
+
+    def export_c(self, filepath: str = '') -> None:
+        '''
+        Export the decision tree as a self-contained C function, which can be compiled 
+        and loaded with ctypes (see pymurtree.codegen.compile_c).
+
+        The function classifies binary features. If the model has a binarizer, it expects 
+        the binarized columns, as given by its transform(x).to_dense(), not the 
+        raw ones; its feature_names_ tell the test behind each column.
+
+        Parameters
+            filepath (str, optional): Name of the output file, the standard output is used if not given.
+        
+        Returns
+            None
+
+        Raises
+            OSError: If the output file cannot be written.
+        '''
+        if self.__tree is None:
+            raise ValueError('self.__tree is None')
+        else:
+            exporttree.export_c(self.__tree, filepath)
\ No newline at end of file
@@ -1,2 +1,65 @@
-from pymurtree.readdata import *
-from pymurtree.OptimalDecisionTreeClassifier import *
\ No newline at end of file
+import importlib
+import sys
+import types
+
+# The names of the package and the modules that define them. The modules are imported on
+# first use (PEP 562), so that importing pymurtree, or pymurtree.inference, does not load
+# the compiled solver or pandas.
+_EXPORTS = {
+    'OptimalDecisionTreeClassifier': 'pymurtree.OptimalDecisionTreeClassifier',
+    'standardize_to_dtype_int32': 'pymurtree.OptimalDecisionTreeClassifier',
+    'read_from_file': 'pymurtree.readdata',
+    'load_data': 'pymurtree.readdata',
+    'iter_data': 'pymurtree.readdata',
+    'load_data_chunked': 'pymurtree.readdata',
+    'save_binary': 'pymurtree.readdata',
+    'convert_to_binary': 'pymurtree.readdata',
+    'load_binary': 'pymurtree.readdata',
+    'BitMatrix': 'pymurtree.bitmatrix',
+    'Tree': 'pymurtree.tree',
+    'Parameters': 'pymurtree.parameters',
+    'PathResult': 'pymurtree.path',
+    'arrow_to_bitmatrix': 'pymurtree.arrow',
+    'read_parquet': 'pymurtree.arrow',
+    'Binarizer': 'pymurtree.binarizer',
+    'FeatureScreener': 'pymurtree.screening',
+    'CancellationToken': 'pymurtree.cancellation',
+    'FitCancelledError': 'pymurtree.cancellation',
+    'SolveProgress': 'pymurtree.cancellation',
+    'CacheStats': 'pymurtree.cache',
+    'ResultCache': 'pymurtree.resultcache',
+    'SolveStats': 'pymurtree.stats',
+    'OptimalTreeSearchCV': 'pymurtree.search',
+    'OptimalDecisionForestClassifier': 'pymurtree.forest',
+    'InferenceModel': 'pymurtree.inference',
+    'load_model': 'pymurtree.inference',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    else:
+        # Submodules such as pymurtree.search, as when the package imported them all
+        try:
+            value = importlib.import_module(__name__ + '.' + name)
+        except ModuleNotFoundError as error:
+            if error.name != __name__ + '.' + name:
+                raise
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+class _Package(types.ModuleType):
+    # Importing pymurtree.OptimalDecisionTreeClassifier binds the module on the package,
+    # where the class of the same name is expected
+    def __setattr__(self, name: str, value) -> None:
+        if isinstance(value, types.ModuleType) and _EXPORTS.get(name) == value.__name__:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _Package
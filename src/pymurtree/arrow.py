@@ -0,0 +1,100 @@
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+def is_arrow(data) -> bool:
+    """
+    Returns True for the objects of pyarrow (tables, record batches, arrays),
+    which is found without importing pyarrow.
+    """
+    return type(data).__module__.split('.')[0] == 'pyarrow'
+
+def arrow_to_bitmatrix(data, chunk_size: int = 65536) -> BitMatrix:
+    """
+    Packs the columns of an Arrow table or record batch into a BitMatrix.
+
+    Boolean columns are read from their Arrow bitmaps: the data and validity bits
+    of each column are unpacked for a chunk of rows at a time and packed again
+    along the rows, so that no integer matrix is built. Null values are absent
+    features. Columns of other types are present where they are 1, as for the solver.
+
+    Requires pyarrow.
+
+    Parameters
+    ----------
+        data (pyarrow.Table or pyarrow.RecordBatch): One column per binary feature.
+        chunk_size (int, optional): Number of rows converted at a time, to bound the memory. Defaults to 65536.
+
+    Returns
+    -------
+        BitMatrix: The features, packed eight per byte.
+    """
+    batches = data.to_batches(max_chunksize=chunk_size) if hasattr(data, 'to_batches') else [data]
+    chunks = [_pack_columns(batch.columns, batch.num_rows, chunk_size) for batch in batches]
+    bits = np.concatenate(chunks) if chunks else np.zeros((0, (data.num_columns + 7) // 8), dtype=np.uint8)
+    return BitMatrix(bits, data.num_columns)
+
+def read_parquet(path: str, label_column: str = None, columns: list = None, batch_size: int = 65536) -> tuple:
+    """
+    Reads the binary features and labels of a Parquet file by batches of rows,
+    without going through pandas, see arrow_to_bitmatrix.
+
+    Requires pyarrow.
+
+    Parameters
+    ----------
+        path (str): The path of the Parquet file.
+        label_column (str, optional): Name of the column of labels. Defaults to None, no labels.
+        columns (list, optional): Names of the feature columns. Defaults to every other column.
+        batch_size (int, optional): Number of rows read at a time. Defaults to 65536.
+
+    Returns
+    -------
+        tuple: The features as a BitMatrix and the labels as a 1D array, or None without label_column.
+    """
+    import pyarrow.parquet
+    file = pyarrow.parquet.ParquetFile(path)
+    if columns is None:
+        columns = [name for name in file.schema_arrow.names if name != label_column]
+    read = list(columns) + ([label_column] if label_column is not None else [])
+    chunks, labels = [], []
+    for batch in file.iter_batches(batch_size=batch_size, columns=read):
+        features = [batch.column(batch.schema.get_field_index(name)) for name in columns]
+        chunks.append(_pack_columns(features, batch.num_rows, batch_size))
+        if label_column is not None:
+            labels.append(batch.column(batch.schema.get_field_index(label_column)).to_numpy(zero_copy_only=False))
+    bits = np.concatenate(chunks) if chunks else np.zeros((0, (len(columns) + 7) // 8), dtype=np.uint8)
+    y = np.concatenate(labels) if labels else None
+    return BitMatrix(bits, len(columns)), y
+
+def _pack_columns(columns: list, num_rows: int, chunk_size: int) -> np.ndarray:
+    # Packs Arrow arrays of the same length as the columns of a bit-packed matrix
+    bits = np.empty((num_rows, (len(columns) + 7) // 8), dtype=np.uint8)
+    for begin in range(0, num_rows, chunk_size):
+        end = min(begin + chunk_size, num_rows)
+        features = np.empty((end - begin, len(columns)), dtype=bool)
+        for j, column in enumerate(columns):
+            features[:, j] = _column_values(column, begin, end)
+        bits[begin:end] = np.packbits(features, axis=1, bitorder='little')
+    return bits
+
+def _column_values(array, begin: int, end: int) -> np.ndarray:
+    # Rows begin:end of an Arrow array as booleans, where nulls are absent
+    import pyarrow
+    if pyarrow.types.is_boolean(array.type):
+        validity, data = array.buffers()[:2]
+        present = _bitmap(data, array.offset + begin, end - begin)
+        if validity is not None:
+            present &= _bitmap(validity, array.offset + begin, end - begin)
+        return present
+    values = array.slice(begin, end - begin).fill_null(0).to_numpy(zero_copy_only=False)
+    return values == 1
+
+def _bitmap(buffer, offset: int, length: int) -> np.ndarray:
+    # Bits offset:offset+length of an Arrow bitmap, which counts from the least significant bit
+    first = offset // 8
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=(offset + length + 7) // 8 - first, offset=first)
+    shift = offset % 8
+    return np.unpackbits(raw, bitorder='little')[shift:shift + length].astype(bool)
@@ -0,0 +1,205 @@
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+class Binarizer:
+    """
+    Turns numeric and categorical columns into the binary features used by the solver.
+
+    Each numeric column becomes features `value > threshold` for a few thresholds,
+    chosen either at quantiles of the column or at the class boundaries, that is,
+    between consecutive distinct values whose rows do not all share one class. Only
+    class boundaries can separate the classes in an optimal tree, so that strategy
+    loses nothing when the number of thresholds is not capped. When it is, the kept
+    boundaries are those whose split alone separates the classes best, by Gini
+    impurity, which may still miss a threshold that only pays off deeper in the
+    tree. Each categorical column
+    becomes features `value == category` for its most frequent categories, or a single
+    feature if it has only two. Missing values (NaN) give absent features.
+
+    The output is a bit-packed BitMatrix, which the solver reads directly. Everything
+    is computed with vectorized NumPy over chunks of rows.
+
+    Parameters
+    ----------
+        strategy (str, optional): 'quantile' or 'class_boundary'. Defaults to 'quantile'.
+        max_features_per_column (int, optional): Largest number of binary features of a column. Defaults to 16.
+        categorical (list, optional): Indices (or names, for a pandas DataFrame) of the categorical columns.
+            Defaults to None, which treats the columns of non-numeric type as categorical.
+        chunk_size (int, optional): Number of rows transformed at a time, to bound the memory. Defaults to 65536.
+
+    Examples
+    --------
+        >>> binarizer = Binarizer(strategy='class_boundary', max_features_per_column=8)
+        >>> model = OptimalDecisionTreeClassifier(max_depth=3, binarizer=binarizer)
+        >>> model.fit(x_raw, y)
+        >>> model.predict(x_raw_test) # transformed with the same thresholds
+    """
+    def __init__(self,
+                 strategy: str = 'quantile',
+                 max_features_per_column: int = 16,
+                 categorical: list = None,
+                 chunk_size: int = 65536) -> None:
+        if strategy not in ('quantile', 'class_boundary'):
+            raise ValueError("strategy should be 'quantile' or 'class_boundary'")
+        if max_features_per_column < 1:
+            raise ValueError('max_features_per_column should be at least 1')
+        self.strategy = strategy
+        self.max_features_per_column = max_features_per_column
+        self.categorical = categorical
+        self.chunk_size = chunk_size
+        self.columns_ = None
+        self.thresholds_ = None
+        self.categories_ = None
+        self.feature_names_ = None
+        self.n_features_out_ = None
+
+    def fit(self, x, y=None) -> 'Binarizer':
+        """
+        Chooses the thresholds and categories of every column.
+
+        Parameters
+        ----------
+            x (numpy.ndarray or pandas.DataFrame): A 2D array or table of raw features.
+            y (numpy.ndarray, optional): A 1D array of labels, required by the 'class_boundary' strategy.
+
+        Returns
+        -------
+            Binarizer: self.
+        """
+        if self.strategy == 'class_boundary' and y is None:
+            raise ValueError("The 'class_boundary' strategy requires the labels y")
+        names, columns = _columns(x)
+        categorical = self.__categorical(names, columns)
+        labels = None if y is None else np.unique(np.asarray(y), return_inverse=True)[1].ravel()
+
+        self.columns_ = names
+        self.thresholds_ = []
+        self.categories_ = []
+        self.feature_names_ = []
+        for name, column, is_categorical in zip(names, columns, categorical):
+            if is_categorical:
+                categories = self.__fit_categories(column)
+                self.thresholds_.append(None)
+                self.categories_.append(categories)
+                self.feature_names_ += [f'{name} == {category!r}' for category in categories]
+            else:
+                values = column.astype(np.float64)
+                if self.strategy == 'quantile':
+                    thresholds = self.__quantile_thresholds(values)
+                else:
+                    thresholds = self.__boundary_thresholds(values, labels)
+                self.thresholds_.append(thresholds)
+                self.categories_.append(None)
+                self.feature_names_ += [f'{name} > {threshold:g}' for threshold in thresholds]
+        self.n_features_out_ = len(self.feature_names_)
+        return self
+
+    def transform(self, x) -> BitMatrix:
+        """
+        Applies the thresholds and categories chosen by fit.
+
+        Parameters
+        ----------
+            x (numpy.ndarray or pandas.DataFrame): Raw features with the columns seen by fit.
+
+        Returns
+        -------
+            BitMatrix: The binary features, packed eight per byte.
+        """
+        if self.thresholds_ is None:
+            raise ValueError('The binarizer has not been fitted')
+        _, columns = _columns(x)
+        if len(columns) != len(self.columns_):
+            raise ValueError(f'x has {len(columns)} columns but the binarizer was fitted on {len(self.columns_)}')
+        n_rows = len(columns[0]) if columns else 0
+        bits = np.zeros((n_rows, (self.n_features_out_ + 7) // 8), dtype=np.uint8)
+        for begin in range(0, n_rows, self.chunk_size):
+            end = min(begin + self.chunk_size, n_rows)
+            features = np.empty((end - begin, self.n_features_out_), dtype=bool)
+            offset = 0
+            for column, thresholds, categories in zip(columns, self.thresholds_, self.categories_):
+                chunk = column[begin:end]
+                if categories is not None:
+                    features[:, offset:offset + len(categories)] = chunk[:, None] == categories[None, :]
+                    offset += len(categories)
+                else:
+                    with np.errstate(invalid='ignore'):
+                        features[:, offset:offset + len(thresholds)] = chunk.astype(np.float64)[:, None] > thresholds[None, :]
+                    offset += len(thresholds)
+            bits[begin:end] = np.packbits(features, axis=1, bitorder='little')
+        return BitMatrix(bits, self.n_features_out_)
+
+    def fit_transform(self, x, y=None) -> BitMatrix:
+        """Fits the binarizer on x and transforms x."""
+        return self.fit(x, y).transform(x)
+
+    def __categorical(self, names: list, columns: list) -> list:
+        if self.categorical is None:
+            return [column.dtype.kind not in 'biuf' for column in columns]
+        return [name in self.categorical or index in self.categorical for index, name in enumerate(names)]
+
+    def __fit_categories(self, column: np.ndarray) -> np.ndarray:
+        # The most frequent categories, or one of the two if there are only two
+        present = column[_not_missing(column)]
+        categories, counts = np.unique(present, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        keep = 1 if len(categories) == 2 else self.max_features_per_column
+        return categories[order[:keep]]
+
+    def __quantile_thresholds(self, values: np.ndarray) -> np.ndarray:
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return np.empty(0)
+        levels = np.arange(1, self.max_features_per_column + 1) / (self.max_features_per_column + 1)
+        thresholds = np.unique(np.quantile(values, levels))
+        # A threshold at or above the largest value would give a feature that is never present
+        return thresholds[thresholds < values.max()]
+
+    def __boundary_thresholds(self, values: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        known = ~np.isnan(values)
+        distinct, inverse = np.unique(values[known], return_inverse=True)
+        if distinct.size < 2:
+            return np.empty(0)
+        inverse = inverse.ravel()
+        counts = np.zeros((distinct.size, int(labels.max()) + 1), dtype=np.int64)
+        np.add.at(counts, (inverse, labels[known]), 1)
+        # Label of the values whose rows all share one class, -1 for the mixed ones
+        pure = np.where(np.count_nonzero(counts, axis=1) == 1, counts.argmax(axis=1), -1)
+        boundary = (pure[:-1] == -1) | (pure[1:] == -1) | (pure[:-1] != pure[1:])
+        candidates = np.flatnonzero(boundary)
+        if candidates.size > self.max_features_per_column:
+            # Keeps the boundaries whose split alone leaves the least Gini impurity,
+            # the leftmost first among equals
+            left = np.cumsum(counts, axis=0)[candidates]
+            right = counts.sum(axis=0) - left
+            impurity = _weighted_gini(left) + _weighted_gini(right)
+            best = np.argsort(impurity, kind='stable')[:self.max_features_per_column]
+            candidates = candidates[np.sort(best)]
+        return (distinct[candidates] + distinct[candidates + 1]) / 2
+
+def _columns(x) -> tuple:
+    # The names and 1D arrays of the columns of a 2D array or a pandas DataFrame
+    if hasattr(x, 'columns') and hasattr(x, 'iloc'):
+        return [str(name) for name in x.columns], [x.iloc[:, j].to_numpy() for j in range(x.shape[1])]
+    x = np.asarray(x)
+    if x.ndim != 2:
+        raise ValueError('x is expected to be a 2D array')
+    return [f'x{j}' for j in range(x.shape[1])], [x[:, j] for j in range(x.shape[1])]
+
+def _weighted_gini(counts: np.ndarray) -> np.ndarray:
+    # Gini impurity of each row of class counts, times its number of instances
+    total = counts.sum(axis=1)
+    return total - (counts**2).sum(axis=1) / np.maximum(total, 1)
+
+def _is_nan(value) -> bool:
+    return isinstance(value, (float, np.floating)) and np.isnan(value)
+
+def _not_missing(column: np.ndarray) -> np.ndarray:
+    if column.dtype.kind == 'f':
+        return ~np.isnan(column)
+    if column.dtype.kind == 'O':
+        return np.array([value is not None and not _is_nan(value) for value in column], dtype=bool)
+    return np.ones(column.shape, dtype=bool)
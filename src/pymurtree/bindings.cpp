@@ -4,12 +4,22 @@
 #include "solver_result.h"
 #include "feature_vector_binary.h"
 #include "file_reader.h"
-#include "exporttree.h"
 
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <pybind11/stl.h>
-#include <pybind11/iostream.h>
+
+#include <algorithm>
+#include <chrono>
+#include <climits>
+#include <iostream>
+#include <map>
+#include <mutex>
+#include <sstream>
+#include <streambuf>
+#include <string>
+#include <thread>
+#include <tuple>
 
 namespace py = pybind11;
 using namespace MurTree;
@@ -48,12 +58,419 @@ std::vector<std::vector<FeatureVectorBinary>> ReadDataDL(const std::vector<std::
     return feature_vectors;
 }
 
+// Reads the labels from a 1D numpy buffer of any integer type
+template <typename T>
+std::vector<int> ReadLabels(const py::buffer_info& y)
+{
+    std::vector<int> labels(y.shape[0]);
+    const char* data = static_cast<const char*>(y.ptr);
+    for (py::ssize_t i = 0; i < y.shape[0]; i++)
+    {
+        T label = *reinterpret_cast<const T*>(data + i * y.strides[0]);
+        if (label < 0) { throw std::invalid_argument("Labels are expected to be non-negative integers"); }
+        labels[i] = static_cast<int>(label);
+    }
+    return labels;
+}
+
+// Builds the feature vectors directly from a 2D numpy buffer of features, following its strides
+// so that both C- and F-ordered arrays are read in place. A single bit vector is reused for every
+// row, hence the features are packed in one pass without any intermediate copy of the data.
+// Only the given rows are read, in their order, and row i becomes copies[i] instances,
+// since the solver counts instances rather than weights
+template <typename T>
+std::vector<std::vector<FeatureVectorBinary>> ReadFeatures(const py::buffer_info& x, const std::vector<int>& labels, const std::vector<int>& copies,
+                                                           const std::vector<py::ssize_t>& rows)
+{
+    std::vector<std::vector<FeatureVectorBinary>> feature_vectors;
+
+    py::ssize_t num_features = x.shape[1];
+    const char* data = static_cast<const char*>(x.ptr);
+
+    int id = 0;
+    std::vector<bool> v(num_features);
+    for (py::ssize_t i : rows)
+    {
+        int label = labels[i];
+        if (feature_vectors.size() <= label) { feature_vectors.resize(label+1); }
+        if (copies[i] == 0) { continue; }
+
+        const char* row = data + i * x.strides[0];
+        for (py::ssize_t j = 0; j < num_features; j++)
+        {
+            v[j] = (*reinterpret_cast<const T*>(row + j * x.strides[1]) == 1);
+        }
+        for (int k = 0; k < copies[i]; k++)
+        {
+            feature_vectors[label].push_back(FeatureVectorBinary(v, id));
+            id++;
+        }
+    }
+    return feature_vectors;
+}
+
+// Builds the feature vectors from a 2D uint8 buffer of bit-packed rows, where feature j of a row
+// is bit j % 8 (least significant first) of its byte j / 8, as in pymurtree.BitMatrix. Rows are read as in ReadFeatures
+std::vector<std::vector<FeatureVectorBinary>> ReadPackedFeatures(const py::buffer_info& x, py::ssize_t num_features, const std::vector<int>& labels, const std::vector<int>& copies,
+                                                                 const std::vector<py::ssize_t>& rows)
+{
+    std::vector<std::vector<FeatureVectorBinary>> feature_vectors;
+
+    const char* data = static_cast<const char*>(x.ptr);
+
+    int id = 0;
+    std::vector<bool> v(num_features);
+    for (py::ssize_t i : rows)
+    {
+        int label = labels[i];
+        if (feature_vectors.size() <= label) { feature_vectors.resize(label+1); }
+        if (copies[i] == 0) { continue; }
+
+        const char* row = data + i * x.strides[0];
+        for (py::ssize_t j = 0; j < num_features; j++)
+        {
+            uint8_t byte = *reinterpret_cast<const uint8_t*>(row + (j >> 3) * x.strides[1]);
+            v[j] = ((byte >> (j & 7)) & 1) != 0;
+        }
+        for (int k = 0; k < copies[i]; k++)
+        {
+            feature_vectors[label].push_back(FeatureVectorBinary(v, id));
+            id++;
+        }
+    }
+    return feature_vectors;
+}
+
+// Dispatches a buffer reader on the integer type (kind and itemsize) of a numpy array.
+// Booleans and signed and unsigned integers of any width are supported
+#define PYMURTREE_DISPATCH_INTEGER(kind, itemsize, FUNCTION, ...) \
+    switch (kind) { \
+    case 'b': return FUNCTION<bool>(__VA_ARGS__); \
+    case 'u': \
+        switch (itemsize) { \
+        case 1: return FUNCTION<uint8_t>(__VA_ARGS__); \
+        case 2: return FUNCTION<uint16_t>(__VA_ARGS__); \
+        case 4: return FUNCTION<uint32_t>(__VA_ARGS__); \
+        case 8: return FUNCTION<uint64_t>(__VA_ARGS__); \
+        } \
+        break; \
+    case 'i': \
+        switch (itemsize) { \
+        case 1: return FUNCTION<int8_t>(__VA_ARGS__); \
+        case 2: return FUNCTION<int16_t>(__VA_ARGS__); \
+        case 4: return FUNCTION<int32_t>(__VA_ARGS__); \
+        case 8: return FUNCTION<int64_t>(__VA_ARGS__); \
+        } \
+        break; \
+    } \
+    throw std::invalid_argument("Expected an array of booleans or integers");
+
+std::vector<int> ReadLabelsFromArray(const py::array& y)
+{
+    py::buffer_info info = y.request();
+    if (info.ndim != 1) { throw std::invalid_argument("y is expected to be a 1D array"); }
+    PYMURTREE_DISPATCH_INTEGER(y.dtype().kind(), y.dtype().itemsize(), ReadLabels, info)
+}
+
+// Number of instances of each row: its sample weight, if given, times the duplicate factor
+std::vector<int> ReadCopies(const py::object& sample_weight, py::ssize_t nrows, int duplicate_instances_factor)
+{
+    std::vector<int> copies(nrows, duplicate_instances_factor);
+    if (sample_weight.is_none()) { return copies; }
+
+    auto weights = py::array_t<long long, py::array::c_style | py::array::forcecast>::ensure(sample_weight);
+    if (!weights || weights.ndim() != 1 || weights.shape(0) != nrows) {
+        throw std::invalid_argument("sample_weight is expected to be a 1D array with one weight per row");
+    }
+    // The instances are counted with int by the solver, so their total must fit in one
+    long long total = 0;
+    for (py::ssize_t i = 0; i < nrows; i++)
+    {
+        long long count = weights.at(i) * duplicate_instances_factor;
+        if (weights.at(i) < 0 || count > INT_MAX) { throw std::invalid_argument("sample_weight is expected to hold non-negative integers"); }
+        total += count;
+        if (total > INT_MAX) { throw std::invalid_argument("sample_weight adds up to more instances than the solver can hold"); }
+        copies[i] = static_cast<int>(count);
+    }
+    return copies;
+}
+
+// Indices of the rows to read: every row if rows is None, otherwise the given 1D array of indices
+std::vector<py::ssize_t> ReadRows(const py::object& rows, py::ssize_t nrows)
+{
+    std::vector<py::ssize_t> indices;
+    if (rows.is_none())
+    {
+        indices.resize(nrows);
+        for (py::ssize_t i = 0; i < nrows; i++) { indices[i] = i; }
+        return indices;
+    }
+    auto array = py::array_t<long long, py::array::c_style | py::array::forcecast>::ensure(rows);
+    if (!array || array.ndim() != 1) { throw std::invalid_argument("rows is expected to be a 1D array of row indices"); }
+    indices.resize(array.shape(0));
+    for (py::ssize_t k = 0; k < array.shape(0); k++)
+    {
+        long long index = array.at(k);
+        if (index < 0 || index >= nrows) { throw std::invalid_argument("rows holds an index out of range"); }
+        indices[k] = static_cast<py::ssize_t>(index);
+    }
+    return indices;
+}
+
+// Converts the numpy arrays x (features) and y (labels) into the feature vectors used by the
+// murtree library, reading both arrays through the buffer protocol without copying them.
+// Each row becomes sample_weight[i] * duplicate_instances_factor instances. If packed_features
+// is not negative, x holds that many features per row as packed bits. If rows is given, only
+// those rows are read, so that a subset of the data is ingested without copying it first
+std::vector<std::vector<FeatureVectorBinary>> ReadDataNumpy(const py::array& x, const py::array& y, int duplicate_instances_factor,
+                                                            const py::object& sample_weight, int packed_features,
+                                                            const py::object& rows)
+{
+    runtime_assert(duplicate_instances_factor > 0);
+
+    py::buffer_info info = x.request();
+    if (info.ndim != 2) { throw std::invalid_argument("x is expected to be a 2D array"); }
+    if (info.shape[0] == 0) { throw std::invalid_argument("x is empty"); }
+    if (info.shape[0] != y.shape(0)) { throw std::invalid_argument("x and y have different number of rows"); }
+
+    std::vector<int> labels = ReadLabelsFromArray(y);
+    std::vector<int> copies = ReadCopies(sample_weight, info.shape[0], duplicate_instances_factor);
+    std::vector<py::ssize_t> indices = ReadRows(rows, info.shape[0]);
+    if (indices.empty()) { throw std::invalid_argument("rows is empty"); }
+    char kind = x.dtype().kind();
+    py::ssize_t itemsize = x.dtype().itemsize();
+    if (packed_features >= 0)
+    {
+        if (kind != 'u' || itemsize != 1) { throw std::invalid_argument("Packed features are expected in a uint8 array"); }
+        if (info.shape[1] != (packed_features + 7) / 8) { throw std::invalid_argument("The packed rows do not match the number of features"); }
+        py::gil_scoped_release release;
+        return ReadPackedFeatures(info, packed_features, labels, copies, indices);
+    }
+    // The buffer stays valid without the GIL since x is referenced by the caller
+    py::gil_scoped_release release;
+    PYMURTREE_DISPATCH_INTEGER(kind, itemsize, ReadFeatures, info, labels, copies, indices)
+}
+
+// Flattens the tree into parallel arrays in pre-order, so that the root is node 0.
+// Label nodes have feature -1 and no children, feature nodes have label -1.
+// In MurTree, the right child of a node indicates that the feature is present.
+void FlattenTree(const DecisionNode* node, int depth, std::vector<int>& feature, std::vector<int>& left,
+    std::vector<int>& right, std::vector<int>& label, std::vector<int>& node_depth)
+{
+    int id = feature.size();
+    feature.push_back(node->IsFeatureNode() ? node->feature_ : -1);
+    left.push_back(-1);
+    right.push_back(-1);
+    label.push_back(node->IsLabelNode() ? node->label_ : -1);
+    node_depth.push_back(depth);
+
+    if (node->IsFeatureNode()) {
+        left[id] = feature.size();
+        FlattenTree(node->left_child_, depth + 1, feature, left, right, label, node_depth);
+        right[id] = feature.size();
+        FlattenTree(node->right_child_, depth + 1, feature, left, right, label, node_depth);
+    }
+}
+
+// Classifies the rows [begin, end) of a uint8 buffer by following the flattened tree.
+// If packed is true, each row holds the features as bits (least significant bit first),
+// otherwise each byte is a feature, present if it is 1 as when the solver reads the data
+void PredictRows(const int* feature, const int* left, const int* right, const int* label,
+    const uint8_t* x, py::ssize_t row_size, bool packed, int32_t* out, py::ssize_t begin, py::ssize_t end)
+{
+    for (py::ssize_t i = begin; i < end; i++)
+    {
+        const uint8_t* row = x + i * row_size;
+        int node = 0;
+        while (feature[node] >= 0)
+        {
+            int f = feature[node];
+            bool present = packed ? ((row[f >> 3] >> (f & 7)) & 1) : (row[f] == 1);
+            node = present ? right[node] : left[node];
+        }
+        out[i] = label[node];
+    }
+}
+
+// Classifies every row of x into out, splitting the rows across num_threads threads.
+// The GIL is released while the rows are classified
+void PredictBatch(py::array_t<int, py::array::c_style> feature, py::array_t<int, py::array::c_style> left,
+    py::array_t<int, py::array::c_style> right, py::array_t<int, py::array::c_style> label,
+    py::array_t<uint8_t, py::array::c_style> x, bool packed,
+    py::array_t<int32_t, py::array::c_style> out, int num_threads)
+{
+    if (feature.size() == 0) { throw std::invalid_argument("The tree is empty"); }
+    if (x.ndim() != 2) { throw std::invalid_argument("x is expected to be a 2D array"); }
+    if (out.ndim() != 1 || out.shape(0) != x.shape(0)) { throw std::invalid_argument("out is expected to be a 1D array with one entry per row of x"); }
+
+    py::ssize_t nrows = x.shape(0);
+    py::ssize_t row_size = x.shape(1);
+    const int* feature_ptr = feature.data();
+    const int* left_ptr = left.data();
+    const int* right_ptr = right.data();
+    const int* label_ptr = label.data();
+    const uint8_t* x_ptr = x.data();
+    int32_t* out_ptr = out.mutable_data();
+
+    num_threads = std::max(1, std::min<int>(num_threads, nrows));
+
+    py::gil_scoped_release release;
+    if (num_threads == 1) {
+        PredictRows(feature_ptr, left_ptr, right_ptr, label_ptr, x_ptr, row_size, packed, out_ptr, 0, nrows);
+        return;
+    }
+    std::vector<std::thread> threads;
+    py::ssize_t chunk = (nrows + num_threads - 1) / num_threads;
+    for (py::ssize_t begin = 0; begin < nrows; begin += chunk)
+    {
+        py::ssize_t end = std::min(begin + chunk, nrows);
+        threads.emplace_back(PredictRows, feature_ptr, left_ptr, right_ptr, label_ptr, x_ptr, row_size, packed, out_ptr, begin, end);
+    }
+    for (auto& thread : threads) { thread.join(); }
+}
+
+// Stream buffer installed in std::cout by ScopedCapture, which sends the output of the threads that are
+// capturing it to their own string, and the output of the other threads to the original buffer.
+// It holds no put area, so concurrent writes from several threads do not share any state
+class ThreadCaptureBuffer : public std::streambuf
+{
+public:
+    explicit ThreadCaptureBuffer(std::streambuf* original) : original_(original) {}
+
+    // String where the output of the current thread goes, or nullptr if it is not captured
+    static thread_local std::string* capture;
+
+protected:
+    int_type overflow(int_type ch) override
+    {
+        if (traits_type::eq_int_type(ch, traits_type::eof())) { return traits_type::not_eof(ch); }
+        if (capture != nullptr) { capture->push_back(traits_type::to_char_type(ch)); return ch; }
+        return original_->sputc(traits_type::to_char_type(ch));
+    }
+
+    std::streamsize xsputn(const char* s, std::streamsize n) override
+    {
+        if (capture != nullptr) { capture->append(s, n); return n; }
+        return original_->sputn(s, n);
+    }
+
+    int sync() override
+    {
+        return capture != nullptr ? 0 : original_->pubsync();
+    }
+
+private:
+    std::streambuf* original_;
+};
+
+thread_local std::string* ThreadCaptureBuffer::capture = nullptr;
+
+// Captures what the current thread writes to std::cout into output while in scope.
+// Does not touch any Python object, so it can be used with the GIL released.
+// The capture buffer is installed in std::cout while at least one capture is in scope,
+// in any thread, and std::cout gets its own buffer back when the last one ends
+class ScopedCapture
+{
+public:
+    explicit ScopedCapture(std::string& output) : previous_(ThreadCaptureBuffer::capture)
+    {
+        {
+            std::lock_guard<std::mutex> lock(mutex_);
+            if (active_++ == 0)
+            {
+                original_ = std::cout.rdbuf();
+                buffer_ = new ThreadCaptureBuffer(original_);
+                std::cout.rdbuf(buffer_);
+            }
+        }
+        ThreadCaptureBuffer::capture = &output;
+    }
+
+    ~ScopedCapture()
+    {
+        ThreadCaptureBuffer::capture = previous_;
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (--active_ == 0)
+        {
+            std::cout.rdbuf(original_);
+            delete buffer_;
+            buffer_ = nullptr;
+        }
+    }
+
+    ScopedCapture(const ScopedCapture&) = delete;
+    ScopedCapture& operator=(const ScopedCapture&) = delete;
+
+private:
+    static std::mutex mutex_;
+    static int active_;
+    static std::streambuf* original_;
+    static ThreadCaptureBuffer* buffer_;
+
+    std::string* previous_;
+};
+
+std::mutex ScopedCapture::mutex_;
+int ScopedCapture::active_ = 0;
+std::streambuf* ScopedCapture::original_ = nullptr;
+ThreadCaptureBuffer* ScopedCapture::buffer_ = nullptr;
+
+// Sends every non-empty line of output to the Python logger "pymurtree", at info level
+// if verbose and at debug level otherwise, as pymurtree.stats.log_output does.
+// The GIL must be held
+void LogLines(const std::string& output, bool verbose)
+{
+    if (output.empty()) { return; }
+    py::object logger = py::module_::import("logging").attr("getLogger")("pymurtree");
+    std::istringstream lines(output);
+    std::string line;
+    while (std::getline(lines, line))
+    {
+        if (line.find_first_not_of(" \t\r") != std::string::npos) { logger.attr(verbose ? "info" : "debug")(line); }
+    }
+}
+
+// The counters and times of the statistics of the solver, under their names in MurTree.
+// These are all the statistics that MurTree keeps: it does not count the nodes explored,
+// the subproblems pruned by the similarity lower bound, or the cache misses
+std::map<std::string, double> ReadStatistics(const Statistics& stats)
+{
+    return {
+        {"num_terminal_nodes_with_node_budget_one", static_cast<double>(stats.num_terminal_nodes_with_node_budget_one)},
+        {"num_terminal_nodes_with_node_budget_two", static_cast<double>(stats.num_terminal_nodes_with_node_budget_two)},
+        {"num_terminal_nodes_with_node_budget_three", static_cast<double>(stats.num_terminal_nodes_with_node_budget_three)},
+        {"num_cache_hit_optimality", static_cast<double>(stats.num_cache_hit_optimality)},
+        {"num_cache_hit_nonzero_bound", static_cast<double>(stats.num_cache_hit_nonzero_bound)},
+        {"time_in_terminal_node", stats.time_in_terminal_node},
+        {"time_lb_computing", stats.time_lb_computing},
+        {"time_ub_subtracting", stats.time_ub_subtracting},
+        {"time_reconstructing", stats.time_reconstructing},
+    };
+}
+
+// Runs one search with the given parameters, capturing what the solver prints.
+// The statistics of the solver keep adding up over its searches, as in MurTree, and the
+// part added by this search is returned, so a solver kept between fits loses none of them.
+// Returns the result, the wall time of the search in seconds, the captured output and the statistics
+std::tuple<SolverResult, double, std::string, std::map<std::string, double>> TimedSolve(Solver& solver, ParameterHandler& ph)
+{
+    std::string output;
+    ScopedCapture capture(output);
+    std::map<std::string, double> before = ReadStatistics(solver.stats_);
+    auto start = std::chrono::steady_clock::now();
+    SolverResult result = solver.Solve(ph);
+    std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - start;
+    std::map<std::string, double> statistics = ReadStatistics(solver.stats_);
+    for (auto& statistic : statistics) { statistic.second -= before[statistic.first]; }
+    return std::make_tuple(result, elapsed.count(), output, statistics);
+}
+
 // Utility function to construct a ParameterHandler object
-ParameterHandler createParameters( unsigned int time, unsigned int max_depth,
+ParameterHandler createParameters( double time, unsigned int max_depth,
 unsigned int max_num_nodes, float sparse_coefficient, bool verbose,
 bool all_trees, bool incremental_frequency, bool similarity_lower_bound,
 unsigned int node_selection, unsigned int feature_ordering,
-int random_seed, unsigned int cache_type, int duplicate_factor)
+int random_seed, unsigned int cache_type, int duplicate_factor, int upper_bound)
 {
     ParameterHandler ph = DefineParameters();
     // ph.SetStringParameter("file", "./pymurtree_data/data.txt");
@@ -67,6 +484,7 @@ int random_seed, unsigned int cache_type, int duplicate_factor)
     ph.SetBooleanParameter("similarity-lower-bound", similarity_lower_bound);
     ph.SetIntegerParameter("random-seed", random_seed);
     ph.SetIntegerParameter("duplicate-factor", duplicate_factor);
+    ph.SetIntegerParameter("upper-bound", upper_bound);
     // Node selection
     if (node_selection == 1) {
         ph.SetStringParameter("node-selection", "post-order");
@@ -121,6 +539,16 @@ PYBIND11_MODULE(lib, m) {
         return ReadDataDL(vec, duplicate_instances_factor);
     }, py::arg("np_array"), py::arg("duplicate_instances_factor"), "Turns numpy array data into a vector of vectors of feature vectors");
 
+    // Read the features and labels straight from the numpy buffers, without concatenating them first
+    m.def("_numpy_to_feature_vectors", &ReadDataNumpy, py::arg("x"), py::arg("y"), py::arg("duplicate_instances_factor"),
+          py::arg("sample_weight") = py::none(), py::arg("packed_features") = -1, py::arg("rows") = py::none(),
+          "Turns numpy arrays of features and labels into a vector of vectors of feature vectors");
+
+    // Multithreaded prediction over the flattened tree, writing the labels into a caller-provided array
+    m.def("_predict_batch", &PredictBatch, py::arg("feature"), py::arg("left"), py::arg("right"), py::arg("label"),
+          py::arg("x"), py::arg("packed"), py::arg("out"), py::arg("num_threads"),
+          "Classifies a uint8 or bit-packed batch of feature vectors with the flattened tree");
+
     py::class_<ParameterHandler> parameter_handler(m, "ParameterHandler");
 
     // Expose the create parameters function to python so that we can create a parameter handler object from python
@@ -129,7 +557,8 @@ PYBIND11_MODULE(lib, m) {
             py::arg("max_num_nodes"), py::arg("sparse_coefficient"), py::arg("verbose"),
             py::arg("all_trees"), py::arg("incremental_frequency"), py::arg("similarity_lower_bound"),
             py::arg("node_selection"), py::arg("feature_ordering"), py::arg("random_seed"),
-            py::arg("cache_type"), py::arg("duplicate_factor"), "Creates a parameter handler object");
+            py::arg("cache_type"), py::arg("duplicate_factor"), py::arg("upper_bound") = INT_MAX,
+            "Creates a parameter handler object");
 
 
 
@@ -146,18 +575,31 @@ PYBIND11_MODULE(lib, m) {
         return py::array_t<int>(predictions.size(), predictions.data()); 
     });
 
+    solver_result.def("_tree_arrays", [](const SolverResult &solverresult) {
+        std::vector<int> feature, left, right, label, depth;
+        if (solverresult.decision_tree_ != nullptr) {
+            FlattenTree(solverresult.decision_tree_, 0, feature, left, right, label, depth);
+        }
+        return py::make_tuple(py::array_t<int>(feature.size(), feature.data()),
+                              py::array_t<int>(left.size(), left.data()),
+                              py::array_t<int>(right.size(), right.data()),
+                              py::array_t<int>(label.size(), label.data()),
+                              py::array_t<int>(depth.size(), depth.data()));
+    }, "Returns the tree as the arrays (feature, left, right, label, depth) indexed by node id");
+
     solver_result.def("misclassification_score", [](const SolverResult &solverresult) {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
         return solverresult.misclassifications;
     });
 
+    solver_result.def("is_proven_optimal", [](const SolverResult &solverresult) {
+        return solverresult.is_proven_optimal;
+    }, "Whether the search completed, which proves the tree optimal");
+
     solver_result.def("tree_depth", [](const SolverResult &solverresult) {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
         return solverresult.decision_tree_->Depth();
     });
 
     solver_result.def("tree_nodes", [](const SolverResult &solverresult) {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
         return solverresult.decision_tree_->NumNodes();
     });
     
@@ -166,62 +608,100 @@ PYBIND11_MODULE(lib, m) {
 
     py::class_<Solver> solver(m, "Solver");
     
-    solver.def(py::init([](std::vector<std::vector<int>> arr,
+    solver.def(py::init([](const py::array& x, const py::array& y,
     unsigned int time, unsigned int max_depth,
     unsigned int max_num_nodes, float sparse_coefficient, bool verbose,
     bool all_trees, bool incremental_frequency, bool similarity_lower_bound,
     unsigned int node_selection, unsigned int feature_ordering,
-    int random_seed, unsigned int cache_type, int duplicate_factor) 
+    int random_seed, unsigned int cache_type, int duplicate_factor, const py::object& sample_weight, int packed_features,
+    const py::object& rows)
     {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
-
-        ParameterHandler ph = createParameters(time, max_depth, max_num_nodes,
-        sparse_coefficient, verbose, all_trees, incremental_frequency,
-        similarity_lower_bound, node_selection, feature_ordering, random_seed,
-        cache_type, duplicate_factor);
-
-        // Carry-out actions from murtree function main in main.cpp
-        CheckParameters(ph); // TODO: This should be uncommented later
-        if (verbose) { 
-            ph.PrintParameterValues();
+        // What the solver prints is sent to the Python logger "pymurtree"
+        std::string output;
+        Solver* solver;
+        {
+            ScopedCapture capture(output);
+
+            ParameterHandler ph = createParameters(time, max_depth, max_num_nodes,
+            sparse_coefficient, verbose, all_trees, incremental_frequency,
+            similarity_lower_bound, node_selection, feature_ordering, random_seed,
+            cache_type, duplicate_factor, INT_MAX);
+
+            // Carry-out actions from murtree function main in main.cpp
+            CheckParameters(ph); // TODO: This should be uncommented later
+            if (verbose) { 
+                ph.PrintParameterValues();
+            }
+            // Construct the Solver object
+            // The numpy arrays are read in place and turned into feature vectors
+            solver = new Solver(ph, ReadDataNumpy(x, y, duplicate_factor, sample_weight, packed_features, rows));
         }
-        // Construct the Solver object
-        // We turn the numpy array into a vector of feature vectors before
-        return new Solver(ph, ReadDataDL(arr, duplicate_factor));
+        LogLines(output, verbose);
+        return solver;
 
-    }), py::keep_alive<0, 1>());
+    }), py::arg("x"), py::arg("y"), py::arg("time"), py::arg("max_depth"), py::arg("max_num_nodes"),
+       py::arg("sparse_coefficient"), py::arg("verbose"), py::arg("all_trees"), py::arg("incremental_frequency"),
+       py::arg("similarity_lower_bound"), py::arg("node_selection"), py::arg("feature_ordering"), py::arg("random_seed"),
+       py::arg("cache_type"), py::arg("duplicate_factor"), py::arg("sample_weight") = py::none(),
+       py::arg("packed_features") = -1, py::arg("rows") = py::none());
 
-    solver.def("solve", [](Solver &solver, 
-    py::array_t<int, py::array::c_style>& arr, unsigned int time, 
+    solver.def("solve", [](Solver &solver, double time, 
     unsigned int max_depth, unsigned int max_num_nodes, 
     float sparse_coefficient, bool verbose, bool all_trees, 
     bool incremental_frequency, bool similarity_lower_bound,
     unsigned int node_selection, unsigned int feature_ordering,
-    int random_seed, unsigned int cache_type, int duplicate_factor)
+    int random_seed, unsigned int cache_type, int duplicate_factor, int upper_bound)
     {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
-
         ParameterHandler ph = createParameters(time, max_depth, max_num_nodes,
         sparse_coefficient, verbose, all_trees, incremental_frequency,
         similarity_lower_bound, node_selection, feature_ordering, random_seed,
-        cache_type, duplicate_factor);
+        cache_type, duplicate_factor, upper_bound);
         CheckParameters(ph);
 
-        return solver.Solve(ph);
-    });
-    
-
-    // Bindings for the ExportTree class
-
-    solver_result.def("export_text", [](const SolverResult &solverresult, std::string filepath) {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
-        ExportTree::exportText(solverresult.decision_tree_, filepath);
-    });
-
-    solver_result.def("export_dot", [](const SolverResult &solverresult, std::string filepath) {
-        py::scoped_ostream_redirect stream(std::cout, py::module_::import("sys").attr("stdout"));
-        ExportTree::exportDot(solverresult.decision_tree_, filepath);
-    }); 
+        // The search does not touch any Python object, so other Python threads can run meanwhile.
+        // Returns (result, seconds, output, statistics), where output is what the solver printed
+        py::gil_scoped_release release;
+        return TimedSolve(solver, ph);
+    }, py::arg("time"), py::arg("max_depth"), py::arg("max_num_nodes"), py::arg("sparse_coefficient"),
+       py::arg("verbose"), py::arg("all_trees"), py::arg("incremental_frequency"), py::arg("similarity_lower_bound"),
+       py::arg("node_selection"), py::arg("feature_ordering"), py::arg("random_seed"), py::arg("cache_type"),
+       py::arg("duplicate_factor"), py::arg("upper_bound") = INT_MAX);
+
+    // Solves a sequence of (max_depth, max_num_nodes, sparse_coefficient) settings with the same solver,
+    // in the given order, so that the subtrees kept by the solver can be reused from one setting to the next.
+    // The parameters are parsed once and the GIL is released for the whole sequence. With shared_time,
+    // time is the budget of the whole sequence: each setting gets what the previous ones left, and the
+    // settings that remain once it is spent are not solved, so fewer results than settings are returned
+    solver.def("solve_path", [](Solver &solver, std::vector<std::tuple<unsigned int, unsigned int, float>> settings,
+    unsigned int time, bool verbose, bool incremental_frequency, bool similarity_lower_bound,
+    unsigned int node_selection, unsigned int feature_ordering,
+    int random_seed, unsigned int cache_type, int duplicate_factor, int upper_bound, bool shared_time)
+    {
+        ParameterHandler ph = createParameters(time, 1, 1, 0.0, verbose, false, incremental_frequency,
+        similarity_lower_bound, node_selection, feature_ordering, random_seed,
+        cache_type, duplicate_factor, upper_bound);
 
+        // One (result, seconds, output, statistics) tuple per setting
+        std::vector<std::tuple<SolverResult, double, std::string, std::map<std::string, double>>> results;
+        py::gil_scoped_release release;
+        double remaining = time;
+        for (const auto& setting : settings)
+        {
+            if (shared_time)
+            {
+                if (remaining <= 0) { break; }
+                ph.SetFloatParameter("time", remaining);
+            }
+            ph.SetIntegerParameter("max-depth", std::get<0>(setting));
+            ph.SetIntegerParameter("max-num-nodes", std::get<1>(setting));
+            ph.SetFloatParameter("sparse-coefficient", std::get<2>(setting));
+            CheckParameters(ph);
+            results.push_back(TimedSolve(solver, ph));
+            remaining -= std::get<1>(results.back());
+        }
+        return results;
+    }, py::arg("settings"), py::arg("time"), py::arg("verbose"), py::arg("incremental_frequency"),
+       py::arg("similarity_lower_bound"), py::arg("node_selection"), py::arg("feature_ordering"),
+       py::arg("random_seed"), py::arg("cache_type"), py::arg("duplicate_factor"), py::arg("upper_bound") = INT_MAX,
+       py::arg("shared_time") = false);
 }
-
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class BitMatrix:
+    """
+    Binary features packed eight per byte along each row.
+
+    Bit j of a row is stored in byte j // 8 at position j % 8, counting from 
+    the least significant bit (numpy.packbits with bitorder='little'). 
+    Each row is padded to a whole number of bytes.
+
+    Parameters
+    ----------
+        bits (numpy.ndarray): A 2D uint8 array of shape (n_rows, ceil(n_features / 8)).
+        n_features (int): Number of binary features in each row.
+    """
+    def __init__(self, bits: np.ndarray, n_features: int) -> None:
+        bits = np.asarray(bits)
+        if bits.dtype != np.uint8 or bits.ndim != 2:
+            raise ValueError('bits is expected to be a 2D array of uint8')
+        if bits.shape[1] != (n_features + 7) // 8:
+            raise ValueError(f'{bits.shape[1]} bytes per row cannot hold {n_features} features')
+        self.bits = bits
+        self.n_features = n_features
+
+    @classmethod
+    def from_dense(cls, x: np.ndarray) -> 'BitMatrix':
+        """
+        Packs a 2D array of binary features, where 1 means that the feature is present.
+        """
+        x = np.asarray(x)
+        if x.ndim != 2:
+            raise ValueError('x is expected to be a 2D array')
+        return cls(np.packbits(x == 1, axis=1, bitorder='little'), x.shape[1])
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Returns the features as a 2D uint8 array of zeros and ones.
+        """
+        return np.unpackbits(self.bits, axis=1, count=self.n_features, bitorder='little')
+
+    @property
+    def shape(self) -> tuple:
+        return (self.bits.shape[0], self.n_features)
+
+    def __len__(self) -> int:
+        return self.bits.shape[0]
+
+    def __getitem__(self, rows) -> 'BitMatrix':
+        """
+        Selects rows, with anything that indexes the rows of a numpy array 
+        (an integer, a slice, an array of indices or a boolean mask).
+        """
+        if isinstance(rows, tuple):
+            raise IndexError('A BitMatrix can only be indexed by rows')
+        return BitMatrix(np.atleast_2d(self.bits[rows]), self.n_features)
+
+    def select_features(self, features, chunk_size: int = 65536) -> 'BitMatrix':
+        """
+        Returns a BitMatrix with the given features (columns), in the given order,
+        taken from the packed bits. Only the selected features are unpacked, by
+        chunks of rows, so the temporary memory does not grow with the number of rows.
+        """
+        features = np.asarray(features, dtype=np.intp)
+        if features.ndim != 1:
+            raise ValueError('features is expected to be a 1D array of indices')
+        if features.size > 0 and (features.min() < 0 or features.max() >= self.n_features):
+            raise IndexError(f'The features should be between 0 and {self.n_features - 1}')
+        byte, shift = features >> 3, (features & 7).astype(np.uint8)
+        bits = np.empty((len(self), (len(features) + 7) // 8), dtype=np.uint8)
+        for begin in range(0, len(self), chunk_size):
+            chunk = (self.bits[begin:begin + chunk_size, byte] >> shift) & 1
+            bits[begin:begin + chunk_size] = np.packbits(chunk, axis=1, bitorder='little')
+        return BitMatrix(bits, len(features))
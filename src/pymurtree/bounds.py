@@ -0,0 +1,50 @@
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+def misclassification_lower_bound(x: np.ndarray, y: np.ndarray, chunk_size: int = 65536, sample_weight: np.ndarray = None) -> int:
+    """
+    Computes a lower bound on the misclassifications of any decision tree on the given data.
+
+    Instances with the same feature vector always reach the same leaf, so in each 
+    group of identical rows every instance whose label differs from the most frequent 
+    label of the group is misclassified, whatever the tree.
+
+    Parameters
+    ----------
+        x (numpy.ndarray or BitMatrix): A 2D array of binary features, where 1 means that the feature is present.
+        y (numpy.ndarray): A 1D array of labels.
+        chunk_size (int, optional): Number of rows packed at a time, to bound the temporary memory.
+        sample_weight (numpy.ndarray, optional): Integer weights of the rows, counted as that many instances.
+
+    Returns
+    -------
+        int: The number of instances that are misclassified by every tree.
+    """
+    if not isinstance(x, BitMatrix):
+        x = np.asarray(x)
+    y = np.asarray(y)
+    if x.shape[0] == 0:
+        return 0
+    num_bytes = (x.shape[1] + 7) // 8
+    if num_bytes == 0:
+        groups = np.zeros(x.shape[0], dtype=np.intp)
+    else:
+        # Pack each row into a fixed-size byte string so that identical rows can be grouped
+        if isinstance(x, BitMatrix):
+            rows = np.ascontiguousarray(x.bits)
+        else:
+            rows = np.empty((x.shape[0], num_bytes), dtype=np.uint8)
+            for begin in range(0, x.shape[0], chunk_size):
+                rows[begin:begin + chunk_size] = np.packbits(x[begin:begin + chunk_size] == 1, axis=1)
+        rows = rows.view(np.dtype((np.void, num_bytes))).ravel()
+        _, groups = np.unique(rows, return_inverse=True)
+        groups = groups.ravel()
+    _, labels = np.unique(y, return_inverse=True)
+    labels = labels.ravel()
+    num_labels = int(labels.max()) + 1
+    counts = np.bincount(groups * num_labels + labels, weights=sample_weight,
+                         minlength=(int(groups.max()) + 1) * num_labels)
+    counts = counts.reshape(-1, num_labels)
+    return int(counts.sum() - counts.max(axis=1).sum())
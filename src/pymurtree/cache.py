@@ -0,0 +1,51 @@
+import dataclasses
+import hashlib
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+def dataset_fingerprint(*arrays, chunk_size: int = 65536) -> str:
+    """
+    Returns a hash of the contents, shapes and types of the arrays (numpy arrays, 
+    BitMatrix objects or None), which changes whenever the data change.
+    Large arrays are hashed by chunks of rows, so F-ordered ones are not copied whole.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        if array is None:
+            digest.update(b'None;')
+            continue
+        if isinstance(array, BitMatrix):
+            digest.update(f'BitMatrix{array.n_features};'.encode())
+            array = array.bits
+        array = np.asarray(array)
+        digest.update(f'{array.dtype.str}{array.shape};'.encode())
+        if array.size == 0:
+            continue
+        rows = array.reshape(array.shape[0], -1) if array.ndim > 0 else array.reshape(1, 1)
+        for begin in range(0, rows.shape[0], chunk_size):
+            digest.update(np.ascontiguousarray(rows[begin:begin + chunk_size]).view(np.uint8).data)
+    return digest.hexdigest()
+
+@dataclasses.dataclass
+class CacheStats:
+    """
+    Counters of a ResultCache (see pymurtree.resultcache).
+    """
+
+    # Lookups that found their entry
+    hits: int = 0
+
+    # Lookups that did not
+    misses: int = 0
+
+    # Entries dropped to stay within the limits of the cache
+    evictions: int = 0
+
+    # Bytes held by the entries
+    memory: int = 0
+
+    # Largest value of memory reached
+    peak_memory: int = 0
@@ -0,0 +1,47 @@
+import threading
+from dataclasses import dataclass
+
+
+class FitCancelledError(RuntimeError):
+    """
+    Raised by OptimalDecisionTreeClassifier.fit when the fit is cancelled through its CancellationToken.
+    """
+
+class CancellationToken:
+    """
+    Thread-safe flag used to cancel a running fit from another thread.
+
+    Examples
+    --------
+        >>> token = CancellationToken()
+        >>> threading.Thread(target=model.fit, args=(x, y), kwargs={'cancel': token}).start()
+        >>> token.cancel() # fit raises FitCancelledError in its thread
+    """
+    def __init__(self) -> None:
+        self.__event = threading.Event()
+
+    def cancel(self) -> None:
+        """Requests the cancellation of the fits that use this token."""
+        self.__event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True if cancel has been called."""
+        return self.__event.is_set()
+
+@dataclass
+class SolveProgress:
+    """
+    Progress of a fit, as reported to the progress callback.
+    """
+
+    # Seconds elapsed since the search started
+    elapsed: float
+
+    # Misclassifications of the best tree found so far,
+    # or None if no tree is known yet
+    best_misclassifications: int = None
+
+    # Proven lower bound on the misclassifications of the optimal tree, known from
+    # the start of the search, or None if no bound is known yet
+    lower_bound: int = None
@@ -0,0 +1,192 @@
+import ctypes
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from pymurtree.tree import Tree
+
+
+def numpy_source(tree: Tree, function_name: str = 'predict') -> str:
+    """
+    Returns the source of a Python module that defines function_name(x), which predicts
+    the labels of the rows of x, a 2D array of binary features, with the tree.
+
+    The tree becomes nested numpy.where expressions evaluated over the whole batch,
+    without branches or traversal, and the module only imports NumPy.
+    """
+    _check_tree(tree)
+    lines = ['# Generated by pymurtree: predicts with a fixed decision tree, present features are 1',
+             'import numpy as np',
+             '',
+             '',
+             f'def {function_name}(x):',
+             '    x = np.asarray(x)']
+    if tree.feature[0] < 0:
+        lines.append(f'    return np.full(x.shape[0], {tree.label[0]}, dtype=np.int32)')
+    else:
+        lines.append('    return np.asarray(')
+        _numpy_expression(tree, 0, 2, lines)
+        lines[-1] = lines[-1][:-1] + ', dtype=np.int32)'
+    return '\n'.join(lines) + '\n'
+
+def c_source(tree: Tree, function_name: str = 'pymurtree_predict') -> str:
+    """
+    Returns the source of a self-contained C file with two functions:
+
+        int function_name(const unsigned char* row): the label of a row of one byte per feature.
+        void function_name_batch(const unsigned char* x, long n_rows, long n_features, int* out):
+            the labels of the rows of a C-ordered matrix of one byte per feature.
+
+    A byte equal to 1 means that the feature is present, as for the solver. The tree becomes a
+    nested conditional expression, which compilers turn into conditional moves.
+    """
+    _check_tree(tree)
+    lines = ['/* Generated by pymurtree: predicts with a fixed decision tree, present features are 1 */',
+             '',
+             f'int {function_name}(const unsigned char* row)',
+             '{',
+             '    return']
+    _c_expression(tree, 0, 2, lines)
+    lines[-1] += ';'
+    lines += ['}',
+              '',
+              f'void {function_name}_batch(const unsigned char* x, long n_rows, long n_features, int* out)',
+              '{',
+              '    for (long i = 0; i < n_rows; i++)',
+              '    {',
+              f'        out[i] = {function_name}(x + i * n_features);',
+              '    }',
+              '}']
+    return '\n'.join(lines) + '\n'
+
+def compile_numpy(tree: Tree):
+    """
+    Returns the function defined by numpy_source, ready to be called on a batch.
+    """
+    namespace = {}
+    exec(compile(numpy_source(tree), '<pymurtree tree>', 'exec'), namespace)
+    return namespace['predict']
+
+class CompiledTree:
+    """
+    A tree compiled to native code by compile_c, and loaded with ctypes.
+    It does not depend on the solver or on the compiled library of pymurtree.
+
+    Parameters
+    ----------
+        library_path (str): Path of the shared library built from c_source.
+        n_features (int): Smallest number of features that the rows must have.
+        function_name (str, optional): Name given to c_source. Defaults to 'pymurtree_predict'.
+    """
+    def __init__(self, library_path: str, n_features: int, function_name: str = 'pymurtree_predict') -> None:
+        self.library_path = library_path
+        self.n_features = n_features
+        self.__library = ctypes.CDLL(library_path)
+        self.__predict_row = getattr(self.__library, function_name)
+        self.__predict_row.argtypes = [ctypes.c_void_p]
+        self.__predict_row.restype = ctypes.c_int
+        self.__predict_batch = getattr(self.__library, function_name + '_batch')
+        self.__predict_batch.argtypes = [ctypes.c_void_p, ctypes.c_long, ctypes.c_long, ctypes.c_void_p]
+        self.__predict_batch.restype = None
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predicts the labels of the rows of x, a 2D array of binary features. Boolean and
+        uint8 C-ordered arrays are read without copies.
+        """
+        x = _as_bytes(x, 2, self.n_features)
+        out = np.empty(x.shape[0], dtype=np.int32)
+        self.__predict_batch(x.ctypes.data, x.shape[0], x.shape[1], out.ctypes.data)
+        return out
+
+    def predict_row(self, row: np.ndarray) -> int:
+        """Predicts the label of a single row, a 1D array of binary features."""
+        row = _as_bytes(row, 1, self.n_features)
+        return self.__predict_row(row.ctypes.data)
+
+def compile_c(tree: Tree, directory: str = None, compiler: str = None) -> CompiledTree:
+    """
+    Compiles c_source into a shared library with the local C compiler and loads it.
+
+    Parameters
+    ----------
+        tree (Tree): The tree to compile.
+        directory (str, optional): Where the source and library are written. Defaults to a temporary directory,
+            which is removed once the library is loaded.
+        compiler (str, optional): The compiler command. Defaults to the CC environment variable, or cc.
+
+    Returns
+    -------
+        CompiledTree: The loaded library.
+
+    Raises
+    ------
+        RuntimeError: If the compilation fails.
+    """
+    if compiler is None:
+        compiler = os.environ.get('CC', 'cc')
+    if directory is not None:
+        return _compile_in(tree, directory, compiler)
+    # The loaded library stays mapped after its file is removed, except on Windows,
+    # where the directory is left for the system to clean
+    directory = tempfile.mkdtemp(prefix='pymurtree-')
+    try:
+        return _compile_in(tree, directory, compiler)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def _compile_in(tree: Tree, directory: str, compiler: str) -> CompiledTree:
+    source_path = os.path.join(directory, 'tree.c')
+    library_path = os.path.join(directory, 'tree.dll' if sys.platform == 'win32' else 'tree.so')
+    with open(source_path, 'w') as f:
+        f.write(c_source(tree))
+    command = [compiler, '-O2', '-shared', '-fPIC', source_path, '-o', library_path]
+    try:
+        subprocess.run(command, check=True, capture_output=True, text=True)
+    except (OSError, subprocess.CalledProcessError) as error:
+        message = getattr(error, 'stderr', None) or str(error)
+        raise RuntimeError(f'Failed to compile the tree with {compiler}: {message}') from error
+    return CompiledTree(library_path, int(tree.feature.max()) + 1)
+
+def _check_tree(tree: Tree) -> None:
+    if tree is None or tree.node_count == 0:
+        raise ValueError('The tree is empty')
+
+def _numpy_expression(tree: Tree, node: int, indentation: int, lines: list) -> None:
+    # In MurTree, the right child of a node indicates that the feature is present
+    prefix = '    ' * indentation
+    if tree.feature[node] < 0:
+        lines.append(f'{prefix}{tree.label[node]},')
+        return
+    lines.append(f'{prefix}np.where(x[:, {tree.feature[node]}] == 1,')
+    _numpy_expression(tree, tree.right[node], indentation + 1, lines)
+    _numpy_expression(tree, tree.left[node], indentation + 1, lines)
+    lines.append(f'{prefix}),')
+
+def _c_expression(tree: Tree, node: int, indentation: int, lines: list) -> None:
+    prefix = '    ' * indentation
+    if tree.feature[node] < 0:
+        lines.append(f'{prefix}{tree.label[node]}')
+        return
+    lines.append(f'{prefix}(row[{tree.feature[node]}] == 1 ?')
+    _c_expression(tree, tree.right[node], indentation + 1, lines)
+    lines.append(f'{prefix}:')
+    _c_expression(tree, tree.left[node], indentation + 1, lines)
+    lines.append(f'{prefix})')
+
+def _as_bytes(x: np.ndarray, ndim: int, n_features: int) -> np.ndarray:
+    # One byte per feature in C order, viewing booleans and uint8 in place
+    x = np.asarray(x)
+    if x.ndim != ndim:
+        raise ValueError(f'x is expected to be a {ndim}D array')
+    if x.shape[-1] < n_features:
+        raise ValueError(f'x has {x.shape[-1]} features, but the tree tests feature #{n_features - 1}')
+    if x.dtype == np.bool_:
+        x = x.view(np.uint8)
+    elif x.dtype != np.uint8:
+        x = (x == 1).view(np.uint8)
+    return np.ascontiguousarray(x)
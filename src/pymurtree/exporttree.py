@@ -0,0 +1,153 @@
+import sys
+
+from pymurtree.codegen import c_source, numpy_source
+from pymurtree.tree import Tree
+
+
+def export_text(tree: Tree, filepath: str = '') -> None:
+    '''
+    Export the tree structure in text format, like the ExportTree class of the compiled library.
+
+    Parameters
+    ----------
+        tree (Tree): The tree to export.
+        filepath (str, optional): Path to the output file, the standard output is used if not given.
+
+    Returns
+    -------
+        None
+    '''
+    if tree is None or tree.node_count == 0:
+        return
+    lines = []
+    # print right-side first
+    _write_edge_in_text_format(tree, 0, True, 0, lines)
+    _write_edge_in_text_format(tree, 0, False, 0, lines)
+    output = ''.join(lines)
+
+    if not filepath:
+        sys.stdout.write(output)
+        return
+    try:
+        with open(filepath, 'w') as f:
+            f.write(output)
+        print('Tree saved in ' + filepath)
+    except OSError as err:
+        print('Failed to write text output file. Message: ' + str(err))
+
+def export_dot(tree: Tree, filepath: str = '') -> None:
+    '''
+    Export the tree structure in DOT format, like the ExportTree class of the compiled library.
+
+    Parameters
+    ----------
+        tree (Tree): The tree to export.
+        filepath (str, optional): Path to the output file, "tree.dot" is used if not given.
+
+    Returns
+    -------
+        None
+    '''
+    if tree is None or tree.node_count == 0:
+        return
+    if not filepath:
+        filepath = 'tree.dot'
+
+    lines = ['digraph Tree {\n',
+             'node [shape=box, style="filled, rounded", fontname="helvetica", fontsize="8"] ;\n',
+             'edge [fontname="helvetica", fontsize="6"] ;\n']
+    _write_node_in_dot_format(tree, 0, False, -1, [0], lines)
+    lines.append('}')
+    try:
+        with open(filepath, 'w') as f:
+            f.write(''.join(lines))
+        print('Tree saved in ' + filepath)
+    except OSError as err:
+        print('Failed to write dot output file. Message: ' + str(err))
+
+def export_numpy(tree: Tree, filepath: str = '') -> None:
+    '''
+    Export the tree as a Python module whose predict(x) scores a batch with NumPy only,
+    see pymurtree.codegen.numpy_source.
+
+    Parameters
+    ----------
+        tree (Tree): The tree to export.
+        filepath (str, optional): Path to the output file, the standard output is used if not given.
+
+    Returns
+    -------
+        None
+
+    Raises
+    ------
+        OSError: If the output file cannot be written.
+    '''
+    if tree is None or tree.node_count == 0:
+        return
+    _write_source(numpy_source(tree), filepath)
+
+def export_c(tree: Tree, filepath: str = '') -> None:
+    '''
+    Export the tree as a self-contained C file, see pymurtree.codegen.c_source.
+    pymurtree.codegen.compile_c builds it and loads it with ctypes.
+
+    Parameters
+    ----------
+        tree (Tree): The tree to export.
+        filepath (str, optional): Path to the output file, the standard output is used if not given.
+
+    Returns
+    -------
+        None
+
+    Raises
+    ------
+        OSError: If the output file cannot be written.
+    '''
+    if tree is None or tree.node_count == 0:
+        return
+    _write_source(c_source(tree), filepath)
+
+def _write_source(output: str, filepath: str) -> None:
+    if not filepath:
+        sys.stdout.write(output)
+        return
+    # Unlike the text and DOT exports, which print their errors as the compiled library does,
+    # a failed write raises, since the file is meant to be imported or compiled afterwards
+    with open(filepath, 'w') as f:
+        f.write(output)
+    print('Tree saved in ' + filepath)
+
+def _write_edge_in_text_format(tree: Tree, node: int, rightedge: bool, indentationlevel: int, lines: list) -> None:
+    # In MurTree, the right child of a node indicates that the feature is present, the left node indicates the feature is missing
+    output = '|---'
+    if tree.feature[node] < 0:
+        output += f'class: {tree.label[node]}'
+    else:
+        output += 'feature #{} is {}'.format(tree.feature[node], 'present' if rightedge else 'missing')
+    lines.append('|   ' * indentationlevel + output + '\n')
+
+    if tree.feature[node] >= 0:
+        child = tree.right[node] if rightedge else tree.left[node]
+        if child >= 0:
+            _write_edge_in_text_format(tree, child, True, indentationlevel + 1, lines)
+            if tree.feature[child] >= 0:
+                _write_edge_in_text_format(tree, child, False, indentationlevel + 1, lines)
+
+def _write_node_in_dot_format(tree: Tree, node: int, rightedge: bool, parentid: int, nodecount: list, lines: list) -> None:
+    if node < 0:
+        return
+    nodeid = nodecount[0]
+    nodecount[0] += 1
+    if tree.feature[node] < 0:
+        output = f'{nodeid} [label=<class {tree.label[node]}>, color="#B77F8C" fillcolor="#B77F8C"] ;\n'
+    else:
+        output = f'{nodeid} [label=<feature #{tree.feature[node]}>, color="#8CB77F", fillcolor="#8CB77F"] ;\n'
+    if parentid >= 0:
+        output += f'{parentid} -> {nodeid} [label=" {1 if rightedge else 0} "] ;\n'
+    lines.append(output)
+
+    if tree.feature[node] >= 0:
+        _write_node_in_dot_format(tree, tree.left[node], False, nodeid, nodecount, lines)
+        _write_node_in_dot_format(tree, tree.right[node], True, nodeid, nodecount, lines)
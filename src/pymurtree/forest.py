@@ -0,0 +1,292 @@
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pymurtree.arrow import arrow_to_bitmatrix, is_arrow
+from pymurtree.binarizer import Binarizer
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.OptimalDecisionTreeClassifier import (
+    OptimalDecisionTreeClassifier,
+    binary_dataset,
+    packed_features,
+)
+from pymurtree.search import SharedDataset
+from pymurtree.tree import Tree, feature_lookup
+
+# Dataset of the current worker process, set by _attach_worker
+_worker = {}
+
+def _attach_worker(spec: dict) -> None:
+    x, y, handles = SharedDataset.attach(spec)
+    _worker.update(x=x, y=y, handles=handles)
+
+def _fit_tree(index: int, params: dict, random_seed: int, bootstrap: bool, n_samples: int, n_features: int) -> dict:
+    # Fits the tree of an index on its sample of rows and features, drawn from a generator
+    # seeded by the index, so that the forest does not depend on the number of workers
+    x, y = _worker['x'], _worker['y']
+    random = np.random.default_rng([random_seed, index])
+    # The sample is given as weights over all the rows, which the solver reads in place and
+    # skips if their weight is 0, so the rows are never copied
+    if bootstrap:
+        # Rows drawn several times are fitted once, with their count as weight
+        sample_weight = np.bincount(random.integers(0, len(y), n_samples), minlength=len(y))
+    else:
+        sample_weight = np.zeros(len(y), dtype=np.int64)
+        sample_weight[random.choice(len(y), n_samples, replace=False)] = 1
+    features = np.sort(random.choice(x.shape[1], n_features, replace=False))
+    # Only the columns of the subset are taken from the packed bits
+    sample = x.select_features(features) if n_features < x.shape[1] else x
+
+    model = OptimalDecisionTreeClassifier(**params)
+    start = timeit.default_timer()
+    model.fit(sample, y, sample_weight=sample_weight)
+    fit_time = timeit.default_timer() - start
+    if model.tree_ is not None:
+        tree = model.tree_.with_features(features)
+        misclassifications = model.score()
+        is_optimal = model.is_optimal()
+    else:
+        # No tree was found within the time budget, so the tree predicts the majority class of its sample
+        counts = np.bincount(y, weights=sample_weight)
+        tree = Tree.leaf(int(np.argmax(counts)))
+        misclassifications = int(counts.sum() - counts.max())
+        is_optimal = False
+
+    # Scored on the rows left out of the sample, or on the sample if there are none.
+    # The tree is applied to the packed rows in place
+    out_of_bag = sample_weight == 0
+    if out_of_bag.any():
+        accuracy = float(np.mean(tree.label[tree.apply(x)[out_of_bag]] == y[out_of_bag]))
+    else:
+        accuracy = 1 - misclassifications / int(sample_weight.sum())
+    return {'index': index, 'tree': tree, 'features': features, 'misclassifications': misclassifications,
+            'is_optimal': is_optimal, 'accuracy': accuracy, 'out_of_bag': bool(out_of_bag.any()),
+            'fit_time': fit_time}
+
+class OptimalDecisionForestClassifier:
+    """
+    Bagging ensemble of optimal decision trees, fitted by OptimalDecisionTreeClassifier
+    in a pool of worker processes.
+
+    Each tree is fitted on a bootstrap sample of the rows and/or a random subset of the
+    features, within its own time budget. If no tree is found within the budget, a leaf
+    of the majority class of the sample takes its place. The rows drawn several times
+    are fitted once with their count as sample weight. The features are packed into a BitMatrix that
+    is put in shared memory once (see pymurtree.search.SharedDataset), and every worker
+    attaches to it without copying it. The rows left out of a sample get a weight of 0,
+    which the solver skips, so the rows are never copied, and the feature subsets are 
+    taken from the packed bits. The samples only depend on random_seed and on
+    the index of the tree, not on the number of workers.
+
+    Predictions are a vote of the trees, either one vote per tree (`voting='majority'`)
+    or votes weighted by the accuracy of each tree (`voting='weighted'`), measured on
+    the rows left out of its sample, or on its sample if none were. The accuracy on
+    the sample is optimistic, so when only some trees have out-of-bag rows, those
+    without them weigh more than their out-of-bag accuracy would give; the
+    `out_of_bag` entry of results_ tells which is which. All the trees traverse each
+    chunk of rows together, a level at a time.
+
+    Parameters
+    ----------
+        n_estimators (int, optional): Number of trees. Defaults to 10.
+        max_depth (int, optional): Maximum depth of each tree. Defaults to 3.
+        max_num_nodes (int, optional): Maximum number of feature nodes of each tree. Defaults to 2**max_depth - 1.
+        time (int, optional): Time budget in seconds of each tree. Defaults to 600.
+        bootstrap (bool, optional): Draw the rows of each tree with replacement. Defaults to True.
+        max_samples (int or float, optional): Number, or fraction, of rows drawn for each tree.
+            Defaults to None, as many as the rows of the dataset.
+        max_features (int, float or str, optional): Number, or fraction, of features of each tree,
+            'sqrt' or 'log2' of the number of features. Defaults to None, every feature.
+        voting (str, optional): 'majority' or 'weighted'. Defaults to 'majority'.
+        n_jobs (int, optional): Number of worker processes, -1 uses all the cores.
+            Defaults to None, which fits the trees in the calling process.
+        random_seed (int, optional): Seed of the samples. Defaults to 3.
+        binarizer (Binarizer, optional): Transforms raw features in fit and predict. Defaults to None.
+        **tree_params: Other parameters of OptimalDecisionTreeClassifier, given to every tree.
+
+    Examples
+    --------
+        >>> forest = OptimalDecisionForestClassifier(n_estimators=50, max_depth=3, max_features='sqrt', n_jobs=-1, time=60)
+        >>> forest.fit(x_train, y_train)
+        >>> forest.predict(x_test)
+    """
+    def __init__(self,
+                 n_estimators: int = 10,
+                 max_depth: int = 3,
+                 max_num_nodes: int = None,
+                 time: int = 600,
+                 bootstrap: bool = True,
+                 max_samples = None,
+                 max_features = None,
+                 voting: str = 'majority',
+                 n_jobs: int = None,
+                 random_seed: int = 3,
+                 binarizer: Binarizer = None,
+                 **tree_params) -> None:
+        if n_estimators < 1:
+            raise ValueError('n_estimators should be at least 1')
+        if voting not in ('majority', 'weighted'):
+            raise ValueError(f"voting should be 'majority' or 'weighted', not {voting!r}")
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.max_num_nodes = max_num_nodes
+        self.time = time
+        self.bootstrap = bootstrap
+        self.max_samples = max_samples
+        self.max_features = max_features
+        self.voting = voting
+        self.n_jobs = n_jobs
+        self.random_seed = random_seed
+        self.binarizer = binarizer
+        self.tree_params = tree_params
+        self.estimators_ = None
+        self.estimator_weights_ = None
+        self.classes_ = None
+        self.results_ = None
+
+    def fit(self, x, y: np.ndarray = None) -> 'OptimalDecisionForestClassifier':
+        """
+        Fits the trees of the forest.
+
+        Parameters
+        ----------
+            x (numpy.ndarray or BitMatrix): A 2D array of binary features, or raw features if the forest
+                has a binarizer. Arrow tables, scipy.sparse matrices and the paths of files written by
+                pymurtree.save_binary are read as by OptimalDecisionTreeClassifier.fit.
+            y (numpy.ndarray): A 1D array of labels, optional for the path of a binary dataset.
+
+        Returns
+        -------
+            OptimalDecisionForestClassifier: self, with estimators_, estimator_weights_, classes_ and results_ set.
+
+        Raises
+        ------
+            ValueError: If x or y is None, or if they have a different number of rows.
+        """
+        x, y = binary_dataset(x, y)
+        if x is None or y is None:
+            raise ValueError('x and y should not be None')
+        if self.binarizer is not None and not isinstance(x, BitMatrix):
+            x = self.binarizer.fit_transform(x, y)
+        else:
+            x = packed_features(x)
+
+        dataset = SharedDataset(x, y, packed=True)
+        n_rows, n_features = dataset.x.shape
+        params = dict(self.tree_params, time=self.time, max_depth=self.max_depth, max_num_nodes=self.max_num_nodes)
+        tasks = [(index, params, self.random_seed, self.bootstrap, self.__n_samples(n_rows), self.__n_features(n_features))
+                 for index in range(self.n_estimators)]
+        try:
+            if self.n_jobs is None:
+                _worker.update(x=dataset.x, y=dataset.y)
+                results = [_fit_tree(*task) for task in tasks]
+            else:
+                n_jobs = os.cpu_count() if self.n_jobs < 0 else self.n_jobs
+                with ProcessPoolExecutor(min(n_jobs, len(tasks)), initializer=_attach_worker, initargs=(dataset.spec,)) as pool:
+                    results = list(pool.map(_fit_tree, *zip(*tasks)))
+        finally:
+            _worker.clear()
+            dataset.close()
+
+        self.estimators_ = [result.pop('tree') for result in results]
+        self.estimator_weights_ = np.array([result['accuracy'] for result in results])
+        # Leaves without instances may hold a label that is not in y
+        leaves = [tree.label[tree.feature < 0] for tree in self.estimators_]
+        self.classes_ = np.union1d(np.unique(np.asarray(y)), np.concatenate(leaves))
+        self.results_ = results
+        return self
+
+    def __n_samples(self, n_rows: int) -> int:
+        if self.max_samples is None:
+            return n_rows
+        if isinstance(self.max_samples, float):
+            return max(1, round(self.max_samples * n_rows))
+        if not self.bootstrap and self.max_samples > n_rows:
+            raise ValueError('max_samples is larger than the number of rows')
+        return self.max_samples
+
+    def __n_features(self, n_features: int) -> int:
+        if self.max_features is None:
+            return n_features
+        if self.max_features == 'sqrt':
+            count = int(np.sqrt(n_features))
+        elif self.max_features == 'log2':
+            count = int(np.log2(n_features))
+        elif isinstance(self.max_features, float):
+            count = round(self.max_features * n_features)
+        else:
+            count = self.max_features
+        return min(n_features, max(1, count))
+
+    def tree_labels(self, x, chunk_size: int = 65536) -> np.ndarray:
+        """
+        Returns the label predicted by each tree for each row of x, as a 2D array with one
+        row per tree. The trees are traversed together as one array of nodes, a level
+        at a time, over chunks of chunk_size rows.
+        """
+        if self.estimators_ is None:
+            raise ValueError('The forest has not been fitted')
+        if self.binarizer is not None and not isinstance(x, BitMatrix):
+            x = self.binarizer.transform(x)
+        elif is_arrow(x):
+            x = arrow_to_bitmatrix(x)
+        x, is_present = feature_lookup(x)
+
+        # The nodes of tree t are shifted by roots[t] in the concatenated arrays
+        trees = self.estimators_
+        roots = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        feature = np.concatenate([tree.feature for tree in trees])
+        left = np.concatenate([tree.left + root for tree, root in zip(trees, roots)])
+        right = np.concatenate([tree.right + root for tree, root in zip(trees, roots)])
+        label = np.concatenate([tree.label for tree in trees])
+        if x.shape[1] <= feature.max():
+            raise ValueError(f'x has {x.shape[1]} features, but the forest tests feature #{feature.max()}')
+
+        labels = np.empty((len(trees), x.shape[0]), dtype=label.dtype)
+        for begin in range(0, x.shape[0], chunk_size):
+            end = min(begin + chunk_size, x.shape[0])
+            rows = np.tile(np.arange(begin, end), len(trees))
+            node = np.repeat(roots, end - begin)
+            active = np.arange(node.size)
+            while active.size > 0:
+                tested = feature[node[active]]
+                internal = tested >= 0
+                active = active[internal]
+                tested = tested[internal]
+                current = node[active]
+                present = is_present(rows[active], tested)
+                node[active] = np.where(present, right[current], left[current])
+            labels[:, begin:end] = label[node].reshape(len(trees), end - begin)
+        return labels
+
+    def predict_proba(self, x) -> np.ndarray:
+        """
+        Returns the share of the votes of each class, in the order of classes_, for each row of x.
+        """
+        labels = self.tree_labels(x)
+        n_trees, n_rows = labels.shape
+        n_classes = len(self.classes_)
+        weights = self.estimator_weights_ if self.voting == 'weighted' else np.ones(n_trees)
+        # Vote of tree t for row i goes to bin i * n_classes + class
+        bins = np.searchsorted(self.classes_, labels) + np.arange(n_rows) * n_classes
+        votes = np.bincount(bins.ravel(), weights=np.repeat(weights, n_rows), minlength=n_rows * n_classes)
+        votes = votes.reshape(n_rows, n_classes)
+        total = votes.sum(axis=1, keepdims=True)
+        return np.divide(votes, total, out=np.full_like(votes, 1 / n_classes), where=total > 0)
+
+    def predict(self, x) -> np.ndarray:
+        """
+        Predicts the class with the most votes for each row of x, the smallest one on ties.
+
+        Parameters
+        ----------
+            x (numpy.ndarray, BitMatrix or scipy.sparse matrix): A 2D array of binary features,
+                or raw features if the forest has a binarizer.
+
+        Returns
+        -------
+            numpy.ndarray: A 1D array with the predicted label of each row of x.
+        """
+        return self.classes_[np.argmax(self.predict_proba(x), axis=1)]
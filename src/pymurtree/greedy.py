@@ -0,0 +1,87 @@
+import heapq
+
+import numpy as np
+
+from pymurtree.tree import Tree
+
+
+def greedy_tree(x: np.ndarray, y: np.ndarray, max_depth: int, max_num_nodes: int) -> Tree:
+    """
+    Builds a decision tree greedily, in the spirit of CART, to be used as a warm start for the exact search.
+
+    Leaves are expanded best-first: at each step the leaf whose best split removes the
+    most misclassifications is split, until no split improves the tree or the limits on 
+    depth and number of feature nodes are reached. The resulting tree respects both 
+    limits, so its misclassifications are a valid upper bound for the optimal tree.
+
+    Parameters
+    ----------
+        x (numpy.ndarray): A 2D array of binary features, where 1 means that the feature is present.
+        y (numpy.ndarray): A 1D array of non-negative integer labels.
+        max_depth (int): Maximum number of feature nodes from the root to any leaf.
+        max_num_nodes (int): Maximum number of feature nodes.
+
+    Returns
+    -------
+        Tree: The greedy tree.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    num_labels = int(y.max()) + 1
+
+    # Each node is a dict, leaves are expanded in order of decreasing gain
+    root = _leaf(np.arange(x.shape[0]), y, num_labels, 0)
+    heap = []
+    counter = 0
+    _push_split(heap, root, x, y, num_labels, max_depth, counter)
+    num_feature_nodes = 0
+    while heap and num_feature_nodes < max_num_nodes:
+        _, _, node = heapq.heappop(heap)
+        present = x[node['rows'], node['split']] == 1
+        node['feature'] = node['split']
+        node['left'] = _leaf(node['rows'][~present], y, num_labels, node['depth'] + 1)
+        node['right'] = _leaf(node['rows'][present], y, num_labels, node['depth'] + 1)
+        num_feature_nodes += 1
+        for child in (node['left'], node['right']):
+            counter += 1
+            _push_split(heap, child, x, y, num_labels, max_depth, counter)
+
+    feature, left, right, label, depth = [], [], [], [], []
+    _flatten(root, feature, left, right, label, depth)
+    return Tree(feature, left, right, label, depth)
+
+def _leaf(rows: np.ndarray, y: np.ndarray, num_labels: int, depth: int) -> dict:
+    counts = np.bincount(y[rows], minlength=num_labels)
+    return {'rows': rows, 'depth': depth, 'feature': -1, 'label': int(counts.argmax()),
+            'errors': int(rows.shape[0] - counts.max())}
+
+def _push_split(heap: list, node: dict, x: np.ndarray, y: np.ndarray, num_labels: int, max_depth: int, counter: int) -> None:
+    # Finds the split of the leaf with the fewest misclassifications and queues it if it improves the leaf
+    if node['depth'] >= max_depth or node['errors'] == 0:
+        return
+    rows = node['rows']
+    present = x[rows] == 1
+    labels = y[rows]
+    # counts[l, f] = number of instances of label l in which feature f is present
+    counts = np.stack([present[labels == l].sum(axis=0) for l in range(num_labels)])
+    totals = np.bincount(labels, minlength=num_labels)
+    errors = (counts.sum(axis=0) - counts.max(axis=0)) + ((totals[:, None] - counts).sum(axis=0) - (totals[:, None] - counts).max(axis=0))
+    feature = int(errors.argmin())
+    gain = node['errors'] - int(errors[feature])
+    if gain > 0:
+        node['split'] = feature
+        heapq.heappush(heap, (-gain, counter, node))
+
+def _flatten(node: dict, feature: list, left: list, right: list, label: list, depth: list) -> None:
+    # Pre-order, with the left (missing) child first, as in Tree
+    nodeid = len(feature)
+    feature.append(node['feature'])
+    left.append(-1)
+    right.append(-1)
+    label.append(node['label'] if node['feature'] < 0 else -1)
+    depth.append(node['depth'])
+    if node['feature'] >= 0:
+        left[nodeid] = len(feature)
+        _flatten(node['left'], feature, left, right, label, depth)
+        right[nodeid] = len(feature)
+        _flatten(node['right'], feature, left, right, label, depth)
@@ -0,0 +1,72 @@
+"""
+Evaluates saved trees with NumPy only.
+
+Importing this module loads neither the compiled solver nor pandas, so that processes
+which only score data, such as serverless functions, start quickly:
+
+    >>> from pymurtree.inference import load_model
+    >>> model = load_model('model.pmt')  # saved by OptimalDecisionTreeClassifier.save
+    >>> model.predict(x)
+"""
+import pickle
+
+import numpy as np
+
+from pymurtree.arrow import arrow_to_bitmatrix, is_arrow
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.serialization import read_model
+from pymurtree.tree import Tree
+
+
+class InferenceModel:
+    """
+    A fitted tree that predicts with the vectorized NumPy traversal of pymurtree.tree.Tree.
+
+    Parameters
+    ----------
+        tree (Tree): The fitted tree.
+        binarizer (Binarizer, optional): Transforms raw features before the prediction. Defaults to None.
+        params (dict, optional): The parameters of the fit. Defaults to None.
+    """
+    def __init__(self, tree: Tree, binarizer=None, params: dict = None) -> None:
+        if tree is None or tree.node_count == 0:
+            raise ValueError('The tree is empty')
+        self.tree_ = tree
+        self.binarizer = binarizer
+        self.params = params or {}
+
+    def predict(self, x) -> np.ndarray:
+        """
+        Predicts the label of each row of x.
+
+        Parameters
+        ----------
+            x (numpy.ndarray, BitMatrix, scipy.sparse matrix or Arrow table): A 2D array of features,
+                raw if the model has a binarizer, binary otherwise.
+
+        Returns
+        -------
+            numpy.ndarray: A 1D array with the predicted label of each row of x.
+        """
+        if self.binarizer is not None and not isinstance(x, BitMatrix):
+            x = self.binarizer.transform(x)
+        elif is_arrow(x):
+            x = arrow_to_bitmatrix(x)
+        return self.tree_.label[self.tree_.apply(x)]
+
+def load_model(path: str) -> InferenceModel:
+    """
+    Loads a model saved by OptimalDecisionTreeClassifier.save for prediction only.
+    Only load files from trusted sources, since the binarizer is unpickled.
+
+    Parameters
+    ----------
+        path (str): The path of the file.
+
+    Returns
+    -------
+        InferenceModel: The model.
+    """
+    saved = read_model(path)
+    extras = pickle.loads(saved['extras']) if saved['extras'] else {}
+    return InferenceModel(saved['tree'], extras.get('binarizer'), saved['params'])
@@ -0,0 +1,225 @@
+import dataclasses
+import os
+import threading
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.cancellation import CancellationToken, FitCancelledError
+from pymurtree.parameters import Parameters
+from pymurtree.solver import create_solver, solve_path
+from pymurtree.stats import SolveStats
+from pymurtree.tree import Tree
+
+
+@dataclasses.dataclass
+class _Subtrees:
+    # Best subtrees of one side of a root split, indexed by their number of feature nodes.
+    # costs[k] is None if no subtree with k nodes was found within the upper bound
+    trees: list
+    costs: list
+    is_optimal: bool
+
+class RootSplitSearch:
+    """
+    Searches the optimal tree by solving the subtrees of every root split in parallel.
+
+    For each feature, the instances are split on it at the root, and the best left
+    and right subtrees of depth max_depth - 1 are computed by separate solvers, for
+    every way of sharing the remaining nodes between both sides. The splits are spread
+    over a pool of threads, which run the solvers with the GIL released, and they
+    share the best cost found so far as upper bound, so that they prune each other.
+
+    Once every split is known, the best one is chosen by this rule: the lowest cost, 
+    then the lowest feature, then the fewest feature nodes on the left, and a single 
+    leaf wins its ties with every split. Splits that tie with the best cost found so far
+    are never pruned, so every tie is seen. The subtrees of the chosen split are then 
+    computed again without upper bound, and they are those that the solver returns for 
+    each side. The returned tree therefore has the optimal cost, and does not depend on
+    the number of threads nor on the order in which the splits finished. Among trees of
+    the same cost, it may differ from the tree of the serial search, whose choice between
+    ties depends on the order in which it explores the subproblems.
+
+    Each side of a split is given to its solver as the indices of its rows, which the
+    solver reads from the whole dataset, so the halves are never copied.
+
+    The solvers of the splits whose cost equals the best cost found so far are kept,
+    so that the subtrees they cached are reused when the chosen split is computed again,
+    and they are dropped as soon as a better split is found. The statistics of every 
+    search are summed in `stats`.
+
+    Parameters
+    ----------
+        x (numpy.ndarray or BitMatrix): A 2D array of binary features, where 1 means that the feature is present.
+            A BitMatrix is read from its packed bits.
+        y (numpy.ndarray): A 1D array of labels.
+        params (Parameters): Parameters of the search. The sparse coefficient must be zero, and the
+            feature ordering in-order (0), in which the root splits are tried.
+        n_jobs (int): Number of threads, negative values use all the cores.
+        cancel (CancellationToken, optional): Checked before each split is searched.
+        sample_weight (numpy.ndarray, optional): Integer weights of the rows, counted as that many instances.
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, params: Parameters, n_jobs: int, cancel: CancellationToken = None,
+                 sample_weight: np.ndarray = None) -> None:
+        if params.sparse_coefficient != 0:
+            raise ValueError('The parallel search requires sparse_coefficient to be zero')
+        if params.max_depth < 2:
+            raise ValueError('The parallel search requires max_depth to be at least 2')
+        if params.feature_ordering != 0:
+            raise ValueError('The parallel search requires the in-order feature ordering (feature_ordering=0)')
+        if n_jobs == 0:
+            raise ValueError('n_jobs should not be 0')
+        self.x = x
+        self.y = y
+        self.sample_weight = sample_weight
+        self.params = params
+        self.n_jobs = os.cpu_count() if n_jobs < 0 else n_jobs
+        self.cancel = cancel
+        self.__lock = threading.Lock()
+        self.__deadline = None
+        self.__best = None
+        # Feature of each split that ties with the best cost -> its cost and the solvers of its sides
+        self.__kept = {}
+        self.__stats = SolveStats()
+
+    @property
+    def stats(self) -> SolveStats:
+        """The SolveStats summed over the searches of the sides."""
+        with self.__lock:
+            stats = SolveStats()
+            stats.merge(self.__stats)
+            return stats
+
+    def run(self) -> tuple:
+        """
+        Runs the search.
+
+        Returns
+        -------
+            tuple: The best Tree, its misclassifications, and whether it is proven optimal
+            (every subproblem was solved within the time budget).
+        """
+        self.__deadline = timeit.default_timer() + self.params.time
+        leaf_label, leaf_cost = self.__leaf(self.y, self.sample_weight)
+        # A single leaf is always a candidate, and so is the upper bound given by the user
+        self.__best = leaf_cost
+        if self.params.upper_bound is not None:
+            self.__best = min(self.__best, self.params.upper_bound)
+
+        features = [f for f in range(self.x.shape[1]) if 0 < np.count_nonzero(self.__column(f)) < self.x.shape[0]]
+        with ThreadPoolExecutor(self.n_jobs) as pool:
+            splits = list(pool.map(self.__search_split, features))
+
+        is_optimal = all(split[2] for split in splits)
+        candidates = [(cost, feature, num_left) for feature, (cost, num_left, _) in zip(features, splits) if cost is not None]
+        if not candidates or min(candidates)[0] >= leaf_cost:
+            return Tree.leaf(leaf_label), leaf_cost, is_optimal
+
+        # Lowest cost, then lowest feature, then fewest nodes on the left
+        cost, feature, num_left = min(candidates)
+        left, right = self.__reconstruct(feature, num_left)
+        return Tree.from_split(feature, left, right), cost, is_optimal
+
+    def __column(self, feature: int) -> np.ndarray:
+        # Whether the feature is present in each row, without unpacking a BitMatrix
+        if isinstance(self.x, BitMatrix):
+            return (self.x.bits[:, feature >> 3] >> (feature & 7)) & 1 == 1
+        return self.x[:, feature] == 1
+
+    def __leaf(self, y: np.ndarray, sample_weight: np.ndarray) -> tuple:
+        counts = np.bincount(y, weights=sample_weight)
+        return int(counts.argmax()), int(counts.sum() - counts.max()) * self.params.duplicate_factor
+
+    def __child_budgets(self) -> list:
+        # Numbers of feature nodes that a child of the root can use
+        return list(range(min(2**(self.params.max_depth - 1) - 1, self.params.max_num_nodes - 1) + 1))
+
+    def __solve_side(self, feature: int, present: bool, upper_bound: int, solver=None) -> tuple:
+        # Best subtree of depth max_depth - 1 for every node budget, on the rows
+        # where the feature is present or absent, and the solver used if any,
+        # which is created unless it is given
+        rows = np.flatnonzero(self.__column(feature) == present)
+        y = self.y[rows]
+        weights = None if self.sample_weight is None else self.sample_weight[rows]
+        label, leaf_cost = self.__leaf(y, weights)
+        trees, costs = [Tree.leaf(label)], [leaf_cost]
+        budgets = self.__child_budgets()[1:]
+        if not budgets:
+            return _Subtrees(trees, costs, True), None
+        if leaf_cost == 0:
+            # A pure side is not split further
+            return _Subtrees(trees * (len(budgets) + 1), costs * (len(budgets) + 1), True), None
+
+        remaining = self.__deadline - timeit.default_timer()
+        if remaining <= 0:
+            return _Subtrees(trees, costs + [None] * len(budgets), False), solver
+        params = dataclasses.replace(self.params, time=max(1, int(remaining)), upper_bound=upper_bound, verbose=False)
+        depth = self.params.max_depth - 1
+        settings = [(min(depth, k), k, 0.0) for k in budgets]
+        stats = SolveStats()
+        if solver is None:
+            solver = create_solver(self.x, self.y, params, stats, self.sample_weight, rows)
+        results = solve_path(solver, settings, params, stats)
+        with self.__lock:
+            self.__stats.merge(stats)
+        for result in results:
+            feasible = result.tree.node_count > 0
+            trees.append(result.tree if feasible else None)
+            costs.append(result.misclassifications if feasible else None)
+        # A larger budget can always reuse the best tree of a smaller one
+        for k in range(1, len(costs)):
+            if costs[k] is None or (costs[k - 1] is not None and costs[k - 1] <= costs[k]):
+                trees[k], costs[k] = trees[k - 1], costs[k - 1]
+        return _Subtrees(trees, costs, all(result.is_optimal for result in results)), solver
+
+    def __best_combination(self, left: _Subtrees, right: _Subtrees) -> tuple:
+        # Best (cost, number of nodes on the left) over the ways of sharing the nodes of the children,
+        # the fewest nodes on the left among ties
+        best = None
+        budget = self.params.max_num_nodes - 1
+        for num_left, left_cost in enumerate(left.costs):
+            num_right = min(budget - num_left, len(right.costs) - 1)
+            if left_cost is None or num_right < 0 or right.costs[num_right] is None:
+                continue
+            if best is None or left_cost + right.costs[num_right] < best[0]:
+                best = (left_cost + right.costs[num_right], num_left)
+        return best
+
+    def __search_split(self, feature: int) -> tuple:
+        # Returns (cost, number of nodes on the left, is_optimal) of the best tree with the feature
+        # at the root, or a None cost if no such tree beats the best cost known so far
+        if self.cancel is not None and self.cancel.cancelled:
+            raise FitCancelledError('The fit was cancelled')
+        with self.__lock:
+            best = self.__best
+        left, left_solver = self.__solve_side(feature, False, best)
+        known_left = [cost for cost in left.costs if cost is not None]
+        if not known_left or min(known_left) > best:
+            return None, None, left.is_optimal
+        with self.__lock:
+            best = self.__best
+        right, right_solver = self.__solve_side(feature, True, best - min(known_left))
+        combination = self.__best_combination(left, right)
+        is_optimal = left.is_optimal and right.is_optimal
+        if combination is None or combination[0] > best:
+            return None, None, is_optimal
+        with self.__lock:
+            if combination[0] < self.__best:
+                self.__best = combination[0]
+                self.__kept = {kept: entry for kept, entry in self.__kept.items() if entry[0] <= self.__best}
+            if combination[0] == self.__best:
+                self.__kept[feature] = (combination[0], left_solver, right_solver)
+        return combination[0], combination[1], is_optimal
+
+    def __reconstruct(self, feature: int, num_left: int) -> tuple:
+        # Computes the subtrees of the chosen split again without upper bound, so that
+        # the tree does not depend on the upper bounds that were current during the search.
+        # The solvers of the split are reused if they were kept
+        _, left_solver, right_solver = self.__kept.pop(feature, (None, None, None))
+        self.__kept.clear()
+        left = self.__solve_side(feature, False, None, left_solver)[0].trees[num_left]
+        budget = self.params.max_num_nodes - 1 - num_left
+        right = self.__solve_side(feature, True, None, right_solver)[0].trees[min(budget, len(self.__child_budgets()) - 1)]
+        return left, right
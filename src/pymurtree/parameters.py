@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 
+
 @dataclass
 class Parameters:
 
@@ -67,5 +68,18 @@ class Parameters:
     # Used for stress-testing the algorithm, not a practical parameter.
     duplicate_factor: int
 
-    # Initial upper bound.
-    # TO-DO
+    # Initial upper bound on the misclassifications. The search only looks for
+    # trees that are at least as good, which prunes the search from the root on.
+    # None means that no upper bound is known. Only used without sparse objective.
+    upper_bound: int = None
+
+    # Number of threads used to search the root-level splits in parallel.
+    # Each split is solved by its own solvers, and they share the best cost
+    # found so far as upper bound. -1 uses all the cores, 1 runs the serial
+    # search of the solver. Only used without sparse objective.
+    n_jobs: int = 1
+
+    # Removes sets of identical rows that hold one row of every class, which add
+    # the same misclassifications to every tree, before the data are given to the
+    # solver. The optimal trees do not change. Only used without sparse objective.
+    cancel_conflicts: bool = False
@@ -0,0 +1,109 @@
+import itertools
+from dataclasses import dataclass
+
+from pymurtree.tree import Tree
+
+
+@dataclass
+class PathResult:
+    """
+    Tree computed for one setting of a regularization path (see OptimalDecisionTreeClassifier.fit_path).
+    """
+
+    # Setting for which the tree was computed
+    max_depth: int
+    max_num_nodes: int
+    sparse_coefficient: float
+
+    # The tree, in its array representation
+    tree: Tree
+
+    # Misclassifications of the tree on the training data
+    misclassifications: int
+
+    # Seconds spent by the solver on this setting
+    solve_time: float
+
+    # True if the solver proved the tree optimal, by completing its search within the time budget
+    is_optimal: bool
+
+def path_settings(max_depth: list, max_num_nodes: list = None, sparse_coefficient: list = None) -> list:
+    """
+    Returns the (max_depth, max_num_nodes, sparse_coefficient) settings of a regularization path, 
+    in the order that lets the solver reuse the most subtrees. 
+    
+    Settings are grouped by sparse coefficient, since it changes the objective of every 
+    subtree, and within a group they go from the smallest to the largest trees, so that 
+    the subtrees of the small trees are already known when the larger ones are searched.
+    A number of nodes larger than what the depth allows is capped, and the duplicates
+    that this creates are removed.
+
+    Parameters
+    ----------
+        max_depth (list): Values of max_depth.
+        max_num_nodes (list, optional): Values of max_num_nodes. Defaults to the largest 
+            number of nodes allowed by each depth.
+        sparse_coefficient (list, optional): Values of sparse_coefficient. Defaults to [0.0].
+
+    Returns
+    -------
+        list: The (max_depth, max_num_nodes, sparse_coefficient) tuples in solving order.
+    """
+    if sparse_coefficient is None:
+        sparse_coefficient = [0.0]
+    for depth in max_depth:
+        if depth < 0:
+            raise ValueError('max_depth should be non-negative')
+    for coefficient in sparse_coefficient:
+        if not 0.0 <= coefficient <= 1.0:
+            raise ValueError('sparse_coefficient should be between 0 and 1')
+
+    settings = set()
+    for depth, coefficient in itertools.product(max_depth, sparse_coefficient):
+        for num_nodes in (max_num_nodes if max_num_nodes is not None else [2**depth - 1]):
+            if num_nodes < 0:
+                raise ValueError('max_num_nodes should be non-negative')
+            settings.add((int(depth), int(min(num_nodes, 2**depth - 1)), float(coefficient)))
+    return sorted(settings, key=lambda setting: (setting[2], setting[0], setting[1]))
+
+def all_trees_settings(max_depth: int, max_num_nodes: int, sparse_coefficient: float = 0.0) -> list:
+    """
+    Returns the settings of all the allowed combinations of depth and number of nodes, 
+    as used by the all_trees parameter, in solving order. A tree of depth d has between 
+    d and 2^d - 1 feature nodes.
+
+    Parameters
+    ----------
+        max_depth (int): Largest depth.
+        max_num_nodes (int): Largest number of feature nodes.
+        sparse_coefficient (float, optional): Sparse coefficient of every setting. Defaults to 0.0.
+
+    Returns
+    -------
+        list: The (max_depth, max_num_nodes, sparse_coefficient) tuples in solving order.
+    """
+    return [(depth, num_nodes, float(sparse_coefficient))
+            for depth in range(1, max_depth + 1)
+            for num_nodes in range(depth, min(2**depth - 1, max_num_nodes) + 1)]
+
+def pareto_front(results: list) -> list:
+    """
+    Returns the trees that are Pareto-optimal with respect to size and misclassifications: 
+    no other tree has at most as many feature nodes and fewer misclassifications.
+
+    Parameters
+    ----------
+        results (list): PathResult objects.
+
+    Returns
+    -------
+        list: The Pareto-optimal PathResult objects, from the smallest to the largest tree. 
+        Among trees with the same size and misclassifications, the one found first is kept.
+    """
+    front = []
+    ordered = sorted((result for result in results if result.tree.node_count > 0),
+                     key=lambda result: (result.tree.num_feature_nodes, result.misclassifications))
+    for result in ordered:
+        if not front or result.misclassifications < front[-1].misclassifications:
+            front.append(result)
+    return front
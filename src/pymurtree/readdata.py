@@ -1,6 +1,8 @@
-import pandas
 import numpy
 
+from pymurtree.bitmatrix import BitMatrix
+
+
 def read_from_file(path: str) -> tuple:
         """
         Reads data from a space-separated text file with the following format:
@@ -14,6 +16,8 @@ def read_from_file(path: str) -> tuple:
             tuple: A tuple containing x (a pandas DataFrame with all columns except the first) 
             and y (a pandas Series representing the first column).
         """
+        import pandas
+
         data = pandas.read_csv(path, sep=' ', header=None)
         y = data.iloc[:, 0]
         x = data.iloc[:, 1:]
@@ -37,4 +41,181 @@ def load_data(path: str) -> tuple:
         data = numpy.loadtxt(path, dtype=int, delimiter=' ')
         x = data[:, 1:]
         y = data[:, 0]
-        return x, y
\ No newline at end of file
+        return x, y
+
+# Layout of the binary format written by save_binary: a header of 32 bytes (magic, version,
+# reserved, number of rows and number of features, little-endian), the features packed eight
+# per byte along each row as in BitMatrix, then the labels as int32 from the next multiple of 8
+_BINARY_MAGIC = b'PYMURTRE'
+_BINARY_VERSION = 1
+_BINARY_HEADER = numpy.dtype([('magic', 'S8'), ('version', '<u4'), ('reserved', '<u4'),
+                              ('n_rows', '<u8'), ('n_features', '<u8')])
+
+
+def iter_data(path: str, chunk_size: int = 65536):
+        """
+        Reads a space-separated text file in the format of load_data by chunks of rows,
+        so that only one chunk is held as int64 values at a time.
+
+        Args:
+            path (str): The path to the text file.
+            chunk_size (int, optional): Number of rows per chunk. Defaults to 65536.
+
+        Yields:
+            tuple: For each chunk, x as a 2D uint8 array of zeros and ones and y as a 1D int32 array.
+
+        Raises:
+            ValueError: If the rows have different lengths or the features are not binary.
+        """
+        n_columns = None
+        with open(path, 'rb') as file:
+            while True:
+                lines = [line for line in (file.readline() for _ in range(chunk_size)) if line.strip()]
+                if not lines:
+                    return
+                # The whole chunk is parsed by one call, newlines being whitespace like the separators
+                values = numpy.fromstring(b' '.join(lines).decode('ascii'), dtype=numpy.int64, sep=' ')
+                if n_columns is None:
+                    n_columns = len(lines[0].split())
+                if values.size != len(lines) * n_columns:
+                    raise ValueError(f'The rows of {path} have different numbers of columns')
+                data = values.reshape(len(lines), n_columns)
+                x = data[:, 1:]
+                if numpy.any((x != 0) & (x != 1)):
+                    raise ValueError(f'The features of {path} are expected to be 0 or 1')
+                yield x.astype(numpy.uint8), data[:, 0].astype(numpy.int32)
+
+
+def load_data_chunked(path: str, chunk_size: int = 65536, packed: bool = False) -> tuple:
+        """
+        Reads the same files as load_data, streaming them by chunks into compact arrays:
+        the features take one byte each, or one bit each if packed, instead of eight.
+
+        Args:
+            path (str): The path to the text file.
+            chunk_size (int, optional): Number of rows parsed at a time. Defaults to 65536.
+            packed (bool, optional): If True, x is returned as a BitMatrix. Defaults to False.
+
+        Returns:
+            tuple: A tuple containing:
+              x (numpy.ndarray or BitMatrix): uint8 features, or packed features if packed
+              y (numpy.ndarray): 1D int32 array of labels
+        """
+        features, labels = [], []
+        n_features = None
+        for x, y in iter_data(path, chunk_size):
+            n_features = x.shape[1]
+            features.append(numpy.packbits(x, axis=1, bitorder='little') if packed else x)
+            labels.append(y)
+        if not features:
+            raise ValueError(f'{path} holds no data')
+        x = numpy.concatenate(features)
+        y = numpy.concatenate(labels)
+        return (BitMatrix(x, n_features), y) if packed else (x, y)
+
+
+def save_binary(path: str, x, y) -> None:
+        """
+        Writes a dataset in the binary format read by load_binary: a header, the features
+        packed eight per byte and the labels as int32.
+
+        Args:
+            path (str): The path of the binary file.
+            x (numpy.ndarray or BitMatrix): Binary features, where 1 means present, as in fit.
+            y (numpy.ndarray): 1D array of integer labels.
+        """
+        if not isinstance(x, BitMatrix):
+            x = BitMatrix.from_dense(numpy.asarray(x) == 1)
+        y = numpy.asarray(y)
+        if y.shape != (len(x),):
+            raise ValueError('x and y have different number of rows')
+        with open(path, 'wb') as file:
+            _write_binary_header(file, *x.shape)
+            file.write(numpy.ascontiguousarray(x.bits).tobytes())
+            file.write(b'\0' * (_labels_offset(*x.shape) - file.tell()))
+            file.write(y.astype('<i4').tobytes())
+
+
+def convert_to_binary(path: str, binary_path: str, chunk_size: int = 65536) -> None:
+        """
+        Converts a text file in the format of load_data into the binary format of 
+        load_binary, streaming it by chunks so that the dataset is never held in memory.
+
+        Args:
+            path (str): The path to the text file.
+            binary_path (str): The path of the binary file.
+            chunk_size (int, optional): Number of rows parsed at a time. Defaults to 65536.
+        """
+        # A first pass counts the rows, which fix the position of the labels
+        n_rows = 0
+        n_features = None
+        with open(path, 'rb') as file:
+            for line in file:
+                if line.strip():
+                    if n_features is None:
+                        n_features = len(line.split()) - 1
+                    n_rows += 1
+        if n_rows == 0:
+            raise ValueError(f'{path} holds no data')
+        with open(binary_path, 'wb') as file:
+            _write_binary_header(file, n_rows, n_features)
+            file.truncate(_labels_offset(n_rows, n_features) + 4 * n_rows)
+        bits = numpy.memmap(binary_path, dtype=numpy.uint8, mode='r+', offset=_BINARY_HEADER.itemsize,
+                            shape=(n_rows, (n_features + 7) // 8))
+        labels = numpy.memmap(binary_path, dtype='<i4', mode='r+', offset=_labels_offset(n_rows, n_features), shape=(n_rows,))
+        begin = 0
+        for x, y in iter_data(path, chunk_size):
+            bits[begin:begin + len(y)] = numpy.packbits(x, axis=1, bitorder='little')
+            labels[begin:begin + len(y)] = y
+            begin += len(y)
+        bits.flush()
+        labels.flush()
+
+
+def load_binary(path: str, mmap: bool = True) -> tuple:
+        """
+        Reads a dataset written by save_binary or convert_to_binary. With mmap, the features 
+        and labels are memory-mapped, so nothing is parsed or copied: fit reads the packed 
+        bits directly from the page cache, and repeated trainings skip text parsing entirely.
+
+        Args:
+            path (str): The path of the binary file.
+            mmap (bool, optional): If True, the arrays are read-only memory maps of the file. 
+                Defaults to True.
+
+        Returns:
+            tuple: A tuple containing:
+              x (BitMatrix): the packed features
+              y (numpy.ndarray): 1D int32 array of labels
+
+        Raises:
+            ValueError: If the file is not in the binary format or has an unknown version.
+        """
+        header = numpy.fromfile(path, dtype=_BINARY_HEADER, count=1)
+        if header.size != 1 or header['magic'][0] != _BINARY_MAGIC:
+            raise ValueError(f'{path} is not a pymurtree binary dataset')
+        if header['version'][0] != _BINARY_VERSION:
+            raise ValueError('{} has version {}, expected {}'.format(path, header['version'][0], _BINARY_VERSION))
+        n_rows, n_features = int(header['n_rows'][0]), int(header['n_features'][0])
+        shape = (n_rows, (n_features + 7) // 8)
+        if mmap:
+            bits = numpy.memmap(path, dtype=numpy.uint8, mode='r', offset=_BINARY_HEADER.itemsize, shape=shape)
+            y = numpy.memmap(path, dtype='<i4', mode='r', offset=_labels_offset(n_rows, n_features), shape=(n_rows,))
+        else:
+            with open(path, 'rb') as file:
+                file.seek(_BINARY_HEADER.itemsize)
+                bits = numpy.fromfile(file, dtype=numpy.uint8, count=shape[0] * shape[1]).reshape(shape)
+                file.seek(_labels_offset(n_rows, n_features))
+                y = numpy.fromfile(file, dtype='<i4', count=n_rows)
+        return BitMatrix(bits, n_features), y
+
+
+def _write_binary_header(file, n_rows: int, n_features: int) -> None:
+        header = numpy.array([(_BINARY_MAGIC, _BINARY_VERSION, 0, n_rows, n_features)], dtype=_BINARY_HEADER)
+        file.write(header.tobytes())
+
+
+def _labels_offset(n_rows: int, n_features: int) -> int:
+        # The labels start at a multiple of 8 bytes, so that they are aligned when memory-mapped
+        end = _BINARY_HEADER.itemsize + n_rows * ((n_features + 7) // 8)
+        return (end + 7) // 8 * 8
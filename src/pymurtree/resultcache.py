@@ -0,0 +1,214 @@
+import dataclasses
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from pymurtree.cache import CacheStats
+from pymurtree.stats import logger
+from pymurtree.tree import Tree
+
+# Part of every key, to be changed when the stored results change meaning
+_KEY_VERSION = 'pymurtree-result-1'
+_SUFFIX = '.npz'
+_TEMPORARY_SUFFIX = '.tmp'
+# Age after which a temporary file is left by a writer that crashed, and removed
+_STALE_SECONDS = 3600
+
+@dataclasses.dataclass
+class CachedResult:
+    """
+    The outcome of a fit kept by a ResultCache.
+    """
+
+    # The tree of the model
+    tree: Tree
+
+    # Misclassifications of the tree on the training data
+    misclassifications: int
+
+    # Whether the search proved the tree optimal
+    is_optimal: bool
+
+    # Proven lower bound on the misclassifications, if the search found one
+    lower_bound: int = None
+
+class ResultCache:
+    """
+    Keeps the results of fits in a local directory, so that fitting the same data
+    with the same parameters again returns the stored tree instead of searching.
+
+    Each result is a file named after its key, a hash of the fingerprint of the
+    training data and of the parameters (see key). Files are written to a temporary
+    name and renamed into place, which is atomic, so several processes can share the
+    directory: a reader sees either a whole result or none. When the files take more
+    than max_bytes, the least recently used ones are removed, the use being recorded
+    in their modification time. Temporary files left for over an hour by writers that
+    crashed are removed at the same time.
+
+    The counters of stats are those of this object. Their memory field holds the
+    bytes taken by the directory after the last write.
+
+    Parameters
+    ----------
+        directory (str): Where the results are stored, created if needed.
+        max_bytes (int, optional): Bytes that the stored results may take. Defaults to 1 GiB.
+
+    Examples
+    --------
+        >>> model = OptimalDecisionTreeClassifier(max_depth=4, result_cache=ResultCache('~/.cache/pymurtree'))
+        >>> model.fit(x, y) # searches
+        >>> model.fit(x, y) # returns the stored tree
+    """
+    def __init__(self, directory: str, max_bytes: int = 2**30) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__stats = CacheStats()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_ResultCache__lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Returns the key of a result from its parts, such as the fingerprint of the data
+        (pymurtree.cache.dataset_fingerprint) and the parameters, through their repr.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(_KEY_VERSION.encode())
+        for part in parts:
+            if dataclasses.is_dataclass(part):
+                part = sorted(dataclasses.asdict(part).items())
+            digest.update(b'\0' + repr(part).encode())
+        return digest.hexdigest()
+
+    @property
+    def stats(self) -> CacheStats:
+        """A copy of the counters."""
+        with self.__lock:
+            return dataclasses.replace(self.__stats)
+
+    def get(self, key: str) -> CachedResult:
+        """
+        Returns the result stored for the key, or None.
+        """
+        path = self.__path(key)
+        try:
+            with np.load(path) as data:
+                lower_bound = int(data['lower_bound'])
+                result = CachedResult(Tree(data['feature'], data['left'], data['right'], data['label'], data['depth']),
+                                      int(data['misclassifications']), bool(data['is_optimal']),
+                                      None if lower_bound < 0 else lower_bound)
+            # Marks the result as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            result = None
+        except (OSError, ValueError, KeyError):
+            # Unreadable, e.g. written by another version, so it is dropped
+            self.__remove(path)
+            result = None
+        with self.__lock:
+            if result is None:
+                self.__stats.misses += 1
+            else:
+                self.__stats.hits += 1
+        logger.debug('Result cache %s for %s', 'miss' if result is None else 'hit', key)
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        """
+        Stores the result of the key, and removes the least recently used results
+        if the directory takes more than max_bytes.
+        """
+        tree = result.tree
+        temporary = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.directory, suffix=_TEMPORARY_SUFFIX, delete=False) as file:
+                temporary = file.name
+                np.savez(file, feature=tree.feature, left=tree.left, right=tree.right, label=tree.label, depth=tree.depth,
+                         misclassifications=result.misclassifications, is_optimal=result.is_optimal,
+                         lower_bound=-1 if result.lower_bound is None else result.lower_bound)
+            os.replace(temporary, self.__path(key))
+        except BaseException:
+            if temporary is not None:
+                self.__remove(temporary)
+            raise
+        self.__evict()
+
+    def clear(self) -> None:
+        """Removes every stored result."""
+        for entry in self.__entries():
+            self.__remove(entry.path)
+
+    def __len__(self) -> int:
+        return len(self.__entries())
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self.__path(key))
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def __entries(self) -> list:
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith(_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def __evict(self) -> None:
+        # Least recently used first. Another process may remove the same files meanwhile
+        self.__remove_stale_temporaries()
+        files = []
+        for entry in self.__entries():
+            try:
+                status = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((status.st_mtime, status.st_size, entry.path))
+        files.sort()
+        size = sum(file[1] for file in files)
+        evictions = 0
+        while files and size > self.max_bytes:
+            _, file_size, path = files.pop(0)
+            self.__remove(path)
+            size -= file_size
+            evictions += 1
+        with self.__lock:
+            self.__stats.evictions += evictions
+            self.__stats.memory = size
+            self.__stats.peak_memory = max(self.__stats.peak_memory, size)
+
+    def __remove_stale_temporaries(self) -> None:
+        # The temporary files of live writers are recent, since they are renamed once written
+        now = time.time()
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if not entry.name.endswith(_TEMPORARY_SUFFIX):
+                continue
+            try:
+                stale = now - entry.stat().st_mtime > _STALE_SECONDS
+            except FileNotFoundError:
+                continue
+            if stale:
+                self.__remove(entry.path)
+
+    @staticmethod
+    def __remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,146 @@
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+class FeatureScreener:
+    """
+    Removes binary features that the search does not need, before the search.
+
+    Constant features never split the data, and a feature that duplicates another,
+    or is its complement, gives the same splits (with the children swapped for a
+    complement). Removing them is lossless: the optimal trees on the kept features
+    have the same misclassifications. Identical and complementary columns are found
+    by packing every column into bits, complementing the columns whose first bit is
+    set, and grouping the equal packed columns.
+
+    With `top_k`, only the k features with the largest gain at the root (by gini
+    or information gain) are kept among those. This is lossy: the optimal tree is
+    then optimal among the trees that only use the kept features.
+
+    The kept columns are given by `support_`, and `transform` selects them. The
+    classifier maps the features of its trees back to the original columns.
+
+    Parameters
+    ----------
+        top_k (int, optional): Number of features kept by the lossy mode. Defaults to None, lossless.
+        criterion (str, optional): 'gini' or 'entropy', the gain used by top_k. Defaults to 'gini'.
+        chunk_size (int, optional): Number of rows processed at a time, to bound the memory. Defaults to 65536.
+
+    Examples
+    --------
+        >>> model = OptimalDecisionTreeClassifier(max_depth=4, screener=FeatureScreener(top_k=200))
+        >>> model.fit(x, y)
+        >>> model.export_text() # the features are the columns of x
+    """
+    def __init__(self, top_k: int = None, criterion: str = 'gini', chunk_size: int = 65536) -> None:
+        if criterion not in ('gini', 'entropy'):
+            raise ValueError("criterion should be 'gini' or 'entropy'")
+        if top_k is not None and top_k < 1:
+            raise ValueError('top_k should be at least 1')
+        self.top_k = top_k
+        self.criterion = criterion
+        self.chunk_size = chunk_size
+        self.support_ = None
+        self.n_features_in_ = None
+
+    def fit(self, x, y: np.ndarray, sample_weight: np.ndarray = None) -> 'FeatureScreener':
+        """
+        Chooses the features to keep.
+
+        Parameters
+        ----------
+            x (numpy.ndarray or BitMatrix): A 2D array of binary features, where 1 means that the feature is present.
+            y (numpy.ndarray): A 1D array of labels.
+            sample_weight (numpy.ndarray, optional): Integer weights of the rows, used by top_k.
+
+        Returns
+        -------
+            FeatureScreener: self, with support_ set.
+        """
+        y = np.asarray(y)
+        self.n_features_in_ = x.shape[1]
+        support = self.__distinct_columns(x)
+        if self.top_k is not None and len(support) > self.top_k:
+            gains = self.__gains(x, y, sample_weight)[support]
+            best = np.argsort(-gains, kind='stable')[:self.top_k]
+            support = np.sort(support[best])
+        if len(support) == 0:
+            # The solver needs at least one feature, even a constant one
+            support = np.zeros(1, dtype=np.intp)
+        self.support_ = support
+        return self
+
+    def transform(self, x):
+        """
+        Selects the kept columns of x, a 2D array or a BitMatrix.
+        """
+        if self.support_ is None:
+            raise ValueError('The screener has not been fitted')
+        if x.shape[1] != self.n_features_in_:
+            raise ValueError(f'x has {x.shape[1]} features but the screener was fitted on {self.n_features_in_}')
+        if isinstance(x, BitMatrix):
+            bits = np.empty((len(x), (len(self.support_) + 7) // 8), dtype=np.uint8)
+            for begin in range(0, len(x), self.chunk_size):
+                dense = x[begin:begin + self.chunk_size].to_dense()
+                bits[begin:begin + self.chunk_size] = np.packbits(dense[:, self.support_], axis=1, bitorder='little')
+            return BitMatrix(bits, len(self.support_))
+        return np.asarray(x)[:, self.support_]
+
+    def fit_transform(self, x, y: np.ndarray, sample_weight: np.ndarray = None):
+        """Fits the screener on x and selects the kept columns of x."""
+        return self.fit(x, y, sample_weight).transform(x)
+
+    def __dense_chunks(self, x):
+        # Chunks of rows of x as arrays of zeros and ones, of a multiple of 8 rows
+        step = max(8, self.chunk_size // 8 * 8)
+        for begin in range(0, x.shape[0], step):
+            chunk = x[begin:begin + step]
+            yield begin, chunk.to_dense() if isinstance(chunk, BitMatrix) else (np.asarray(chunk) == 1).astype(np.uint8)
+
+    def __distinct_columns(self, x) -> np.ndarray:
+        # Index of the first column of each group of equal or complementary columns, without the constant ones
+        n_rows, n_features = x.shape
+        columns = np.empty((n_features, (n_rows + 7) // 8), dtype=np.uint8)
+        for begin, chunk in self.__dense_chunks(x):
+            # Chunks hold whole bytes of the packed columns
+            columns[:, begin // 8:(begin + len(chunk) + 7) // 8] = np.packbits(chunk.T, axis=1)
+            if begin == 0:
+                first = chunk[0].astype(bool) if len(chunk) else np.zeros(n_features, dtype=bool)
+        if n_rows == 0 or n_features == 0:
+            return np.arange(0, dtype=np.intp)
+        # Complements the columns whose first row is set, without touching the padding bits
+        mask = np.full(columns.shape[1], 0xFF, dtype=np.uint8)
+        if n_rows % 8:
+            mask[-1] = (0xFF << (8 - n_rows % 8)) & 0xFF
+        columns[first] ^= mask
+        keys = np.ascontiguousarray(columns).view(np.dtype((np.void, columns.shape[1]))).ravel()
+        _, first_index = np.unique(keys, return_index=True)
+        constant = ~columns[first_index].any(axis=1)
+        return np.sort(first_index[~constant])
+
+    def __gains(self, x, y: np.ndarray, sample_weight: np.ndarray) -> np.ndarray:
+        # Gain of splitting the root on each feature
+        _, labels = np.unique(y, return_inverse=True)
+        labels = labels.ravel()
+        weights = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        onehot = np.zeros((len(y), int(labels.max()) + 1))
+        onehot[np.arange(len(y)), labels] = weights
+        present = np.zeros((x.shape[1], onehot.shape[1]))
+        for begin, chunk in self.__dense_chunks(x):
+            present += chunk.T.astype(np.float64) @ onehot[begin:begin + len(chunk)]
+        total = onehot.sum(axis=0)
+        absent = total[None, :] - present
+        return self.__impurity(total[None, :])[0] - self.__impurity(present) - self.__impurity(absent)
+
+    def __impurity(self, counts: np.ndarray) -> np.ndarray:
+        # Impurity of each row of class counts, times the number of instances
+        n = counts.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = np.where(n[:, None] > 0, counts / n[:, None], 0)
+            if self.criterion == 'gini':
+                impurity = 1 - np.sum(p * p, axis=1)
+            else:
+                impurity = -np.sum(np.where(p > 0, p * np.log2(np.where(p > 0, p, 1)), 0), axis=1)
+        return n * impurity
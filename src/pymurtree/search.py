@@ -0,0 +1,279 @@
+import itertools
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.bounds import misclassification_lower_bound
+
+
+class SharedDataset:
+    """
+    Binarized dataset placed once in shared memory, so that worker processes
+    can attach to it without copying or pickling the data.
+
+    The features are stored as a uint8 matrix, which the solver reads in place,
+    and the labels as int32. With `packed`, the features are stored bit-packed 
+    instead, eight times smaller, and x is a BitMatrix over the shared bits, which
+    the solver also reads in place. Use `spec` to attach from another process and
+    `close` in the process that created the dataset to release the memory.
+
+    Parameters
+    ----------
+        x (numpy.ndarray or BitMatrix): A 2D array of binary features, where 1 means that the feature is present.
+        y (numpy.ndarray): A 1D array of labels.
+        packed (bool, optional): Store the features as a BitMatrix. Defaults to False.
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, packed: bool = False) -> None:
+        if packed:
+            x = x if isinstance(x, BitMatrix) else BitMatrix.from_dense(np.asarray(x) == 1)
+            bits = x.bits
+            self.__n_features = x.n_features
+        else:
+            x = x.to_dense() if isinstance(x, BitMatrix) else np.asarray(x)
+            bits = x == 1
+            self.__n_features = None
+        y = np.asarray(y)
+        if bits.ndim != 2 or bits.shape[0] != y.shape[0]:
+            raise ValueError('x and y have different number of rows')
+        self.__x_memory = shared_memory.SharedMemory(create=True, size=max(1, bits.size))
+        self.__y_memory = shared_memory.SharedMemory(create=True, size=max(1, y.size * 4))
+        self.x = np.ndarray(bits.shape, dtype=np.uint8, buffer=self.__x_memory.buf)
+        self.y = np.ndarray(y.shape, dtype=np.int32, buffer=self.__y_memory.buf)
+        self.x[:] = bits
+        self.y[:] = y
+        if packed:
+            self.x = BitMatrix(self.x, self.__n_features)
+
+    @property
+    def spec(self) -> dict:
+        """Picklable description used by attach."""
+        x_shape = self.x.bits.shape if isinstance(self.x, BitMatrix) else self.x.shape
+        return {'x_name': self.__x_memory.name, 'x_shape': x_shape, 'n_features': self.__n_features,
+                'y_name': self.__y_memory.name, 'y_shape': self.y.shape}
+
+    @staticmethod
+    def attach(spec: dict) -> tuple:
+        """
+        Attaches to a shared dataset from its spec.
+
+        Returns
+        -------
+            tuple: The features x (a BitMatrix if the dataset is packed) and the labels y backed by 
+            the shared memory, and the SharedMemory handles that must be kept open while they are used.
+        """
+        x_memory = shared_memory.SharedMemory(name=spec['x_name'])
+        y_memory = shared_memory.SharedMemory(name=spec['y_name'])
+        x = np.ndarray(spec['x_shape'], dtype=np.uint8, buffer=x_memory.buf)
+        y = np.ndarray(spec['y_shape'], dtype=np.int32, buffer=y_memory.buf)
+        if spec.get('n_features') is not None:
+            x = BitMatrix(x, spec['n_features'])
+        return x, y, (x_memory, y_memory)
+
+    def close(self) -> None:
+        """Releases the shared memory. The arrays must not be used afterwards."""
+        self.x = None
+        self.y = None
+        for memory in (self.__x_memory, self.__y_memory):
+            memory.close()
+            memory.unlink()
+
+# Dataset of the current worker process, set by _attach_worker
+_worker = {}
+
+def _attach_worker(spec: dict, folds: np.ndarray) -> None:
+    x, y, handles = SharedDataset.attach(spec)
+    _worker.update(x=x, y=y, handles=handles, folds=folds)
+
+def _train_fold(fold: int) -> tuple:
+    # The training fold is given as weights over the shared dataset, 1 for its rows and 0 for the
+    # others, which the solver skips when it reads the data, so the rows are never gathered
+    weights = (_worker['folds'] != fold).astype(np.int64)
+    return weights, misclassification_lower_bound(_worker['x'], _worker['y'], sample_weight=weights)
+
+def _evaluate(candidate: int, params: dict, fold: int, time: int) -> dict:
+    # Fits a candidate on one training fold and scores it on the validation fold
+    from pymurtree.OptimalDecisionTreeClassifier import OptimalDecisionTreeClassifier
+
+    weights, lower_bound = _train_fold(fold)
+    model = OptimalDecisionTreeClassifier(time=time, **params)
+    start = timeit.default_timer()
+    model.fit(_worker['x'], _worker['y'], sample_weight=weights)
+    fit_time = timeit.default_timer() - start
+
+    validation = _worker['folds'] == fold
+    accuracy = float(np.mean(model.predict(_worker['x'][validation]) == _worker['y'][validation]))
+    return {'candidate': candidate, 'fold': fold, 'accuracy': accuracy, 'fit_time': fit_time,
+            'misclassifications': model.score(), 'is_optimal': model.is_optimal(),
+            'reached_lower_bound': model.score() == lower_bound}
+
+class OptimalTreeSearchCV:
+    """
+    Cross-validated search over the parameters of OptimalDecisionTreeClassifier,
+    running the candidates in a pool of worker processes.
+
+    The binarized dataset is put in shared memory once, and every worker attaches
+    to it without copying it. A training fold is fitted on the whole shared dataset,
+    with a zero sample weight on the rows of the validation fold, which the solver
+    skips, so the fold is not copied either. Candidates are evaluated from the smallest to the
+    largest trees, and a candidate is discarded without being fitted if a candidate
+    with the same other parameters and at most its depth and number of nodes
+    already reached the lower bound on the training misclassifications in every
+    fold, since a larger tree cannot fit the training data any better.
+
+    Parameters
+    ----------
+        param_grid (dict or list): Lists of values for the parameters of OptimalDecisionTreeClassifier,
+            or a list of such dicts. Every combination is a candidate. The time budget is set by
+            `time`, not by the grid.
+        cv (int, optional): Number of folds. Defaults to 5.
+        time (int, optional): Time budget in seconds of each fit. Defaults to 600.
+        n_jobs (int, optional): Number of worker processes, -1 uses all the cores.
+            Defaults to None, which fits the candidates in the calling process.
+        discard_dominated (bool, optional): Skip the candidates dominated by smaller ones. Defaults to True.
+        refit (bool, optional): Refit the best candidate on the whole dataset. Defaults to True.
+        random_seed (int, optional): Seed used to shuffle the rows into folds. Defaults to 3.
+
+    Examples
+    --------
+        >>> search = OptimalTreeSearchCV({'max_depth': [2, 3, 4], 'feature_ordering': [0, 2]}, n_jobs=-1, time=60)
+        >>> search.fit(x_train, y_train)
+        >>> search.best_params_
+    """
+    def __init__(self,
+                 param_grid,
+                 cv: int = 5,
+                 time: int = 600,
+                 n_jobs: int = None,
+                 discard_dominated: bool = True,
+                 refit: bool = True,
+                 random_seed: int = 3) -> None:
+        if cv < 2:
+            raise ValueError('cv should be at least 2')
+        if n_jobs == 0:
+            raise ValueError('n_jobs should not be 0')
+        self.param_grid = param_grid
+        self.cv = cv
+        self.time = time
+        self.n_jobs = n_jobs
+        self.discard_dominated = discard_dominated
+        self.refit = refit
+        self.random_seed = random_seed
+        self.results_ = None
+        self.best_params_ = None
+        self.best_score_ = None
+        self.best_estimator_ = None
+
+    def candidates(self) -> list:
+        """
+        Returns the parameter dicts of all the candidates, from the smallest to the largest trees.
+        """
+        grids = self.param_grid if isinstance(self.param_grid, list) else [self.param_grid]
+        candidates = []
+        for grid in grids:
+            if 'time' in grid:
+                raise ValueError("param_grid cannot contain 'time', the time budget of each fit is set by time")
+            keys = sorted(grid)
+            for values in itertools.product(*(grid[key] for key in keys)):
+                candidates.append(dict(zip(keys, values)))
+        return sorted(candidates, key=_size)
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> 'OptimalTreeSearchCV':
+        """
+        Evaluates every candidate by cross-validation and keeps the most accurate one.
+
+        Parameters
+        ----------
+            x (numpy.ndarray): A 2D array of binary features.
+            y (numpy.ndarray): A 1D array of labels.
+
+        Returns
+        -------
+            OptimalTreeSearchCV: self, with results_, best_params_, best_score_ and best_estimator_ set.
+        """
+        from pymurtree.OptimalDecisionTreeClassifier import (
+            OptimalDecisionTreeClassifier,
+        )
+
+        candidates = self.candidates()
+        folds = np.random.RandomState(self.random_seed).permutation(np.arange(len(y)) % self.cv)
+        results = [{'params': params, 'accuracy': [], 'fit_time': [], 'misclassifications': [],
+                    'is_optimal': [], 'reached_lower_bound': [], 'discarded': False} for params in candidates]
+
+        dataset = SharedDataset(x, y)
+        try:
+            if self.n_jobs is None:
+                _attach_worker(dataset.spec, folds)
+                self.__run(candidates, results, lambda *task: _Done(_evaluate(*task)))
+            else:
+                n_jobs = os.cpu_count() if self.n_jobs < 0 else self.n_jobs
+                with ProcessPoolExecutor(n_jobs, initializer=_attach_worker, initargs=(dataset.spec, folds)) as pool:
+                    self.__run(candidates, results, lambda *task: pool.submit(_evaluate, *task))
+        finally:
+            _worker.clear()
+            dataset.close()
+
+        for result in results:
+            result['mean_accuracy'] = float(np.mean(result['accuracy'])) if result['accuracy'] else None
+        self.results_ = results
+        # The first candidate is the smallest tree, which wins the ties
+        best = max((result for result in results if not result['discarded']), key=lambda result: result['mean_accuracy'])
+        self.best_params_ = best['params']
+        self.best_score_ = best['mean_accuracy']
+        if self.refit:
+            self.best_estimator_ = OptimalDecisionTreeClassifier(time=self.time, **self.best_params_)
+            self.best_estimator_.fit(x, y)
+        return self
+
+    def __run(self, candidates: list, results: list, submit) -> None:
+        # Evaluates the candidates in waves of equal tree size, so that the candidates
+        # dominated by the previous waves can be discarded before being fitted
+        for _, wave in itertools.groupby(range(len(candidates)), key=lambda i: _size(candidates[i])):
+            wave = [i for i in wave if not (self.discard_dominated and self.__dominated(i, candidates, results))]
+            futures = [submit(i, candidates[i], fold, self.time) for i in wave for fold in range(self.cv)]
+            for future in futures:
+                evaluation = future.result()
+                result = results[evaluation['candidate']]
+                for key in ('accuracy', 'fit_time', 'misclassifications', 'is_optimal', 'reached_lower_bound'):
+                    result[key].append(evaluation[key])
+
+    @staticmethod
+    def __dominated(candidate: int, candidates: list, results: list) -> bool:
+        params = candidates[candidate]
+        depth, num_nodes = _size(params)
+        for other, result in zip(candidates, results):
+            if result['discarded'] or len(result['reached_lower_bound']) == 0 or not all(result['reached_lower_bound']):
+                continue
+            same_rest = {k: v for k, v in other.items() if k not in ('max_depth', 'max_num_nodes')} == \
+                        {k: v for k, v in params.items() if k not in ('max_depth', 'max_num_nodes')}
+            other_depth, other_num_nodes = _size(other)
+            if same_rest and other_depth <= depth and other_num_nodes <= num_nodes:
+                results[candidate]['discarded'] = True
+                return True
+        return False
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predicts with the best candidate refitted on the whole dataset.
+        """
+        if self.best_estimator_ is None:
+            raise ValueError('The search has not been fitted with refit=True')
+        return self.best_estimator_.predict(x)
+
+def _size(params: dict) -> tuple:
+    # (max_depth, max_num_nodes) of a candidate, with the defaults of OptimalDecisionTreeClassifier
+    depth = params.get('max_depth', 3)
+    num_nodes = params.get('max_num_nodes')
+    num_nodes = 2**depth - 1 if num_nodes is None else min(num_nodes, 2**depth - 1)
+    return depth, num_nodes
+
+class _Done:
+    # Result of a task run in the calling process, with the interface of a future
+    def __init__(self, value: dict) -> None:
+        self.__value = value
+
+    def result(self) -> dict:
+        return self.__value
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+
+from pymurtree.tree import Tree
+
+# Layout of a saved model: a header of 56 bytes (magic, version, flags, number of nodes,
+# misclassifications, lower bound and the sizes of the two trailing sections, little-endian),
+# the feature, left, right, label and depth arrays of the tree as int32, the parameters as
+# UTF-8 JSON, and optional pickled extras such as the binarizer
+MODEL_MAGIC = b'PMTMODEL'
+MODEL_VERSION = 1
+_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('flags', '<u4'), ('n_nodes', '<u8'),
+                    ('misclassifications', '<i8'), ('lower_bound', '<i8'),
+                    ('params_size', '<u8'), ('extras_size', '<u8')])
+_ARRAYS = ('feature', 'left', 'right', 'label', 'depth')
+_OPTIMAL = 1
+_HAS_LOWER_BOUND = 2
+
+def write_model(path: str, tree: Tree, misclassifications: int, is_optimal: bool,
+                lower_bound: int = None, params: dict = None, extras: bytes = b'') -> None:
+    """
+    Writes a tree and the outcome of its fit in the binary model format.
+
+    Parameters
+    ----------
+        path (str): The path of the file.
+        tree (Tree): The fitted tree.
+        misclassifications (int): Misclassifications of the tree on the training data.
+        is_optimal (bool): Whether the tree was proven optimal.
+        lower_bound (int, optional): Proven lower bound on the misclassifications. Defaults to None.
+        params (dict, optional): Parameters of the model, stored as JSON. Defaults to None.
+        extras (bytes, optional): Opaque bytes stored after the parameters. Defaults to none.
+    """
+    if tree is None or tree.node_count == 0:
+        raise ValueError('The tree is empty')
+    params = json.dumps(params or {}, sort_keys=True).encode('utf-8')
+    flags = (_OPTIMAL if is_optimal else 0) | (_HAS_LOWER_BOUND if lower_bound is not None else 0)
+    header = np.array([(MODEL_MAGIC, MODEL_VERSION, flags, tree.node_count, misclassifications,
+                        -1 if lower_bound is None else lower_bound, len(params), len(extras))], dtype=_HEADER)
+    with open(path, 'wb') as file:
+        file.write(header.tobytes())
+        file.writelines(getattr(tree, name).astype('<i4').tobytes() for name in _ARRAYS)
+        file.write(params)
+        file.write(extras)
+
+def read_model(path: str) -> dict:
+    """
+    Reads a file written by write_model.
+
+    Returns
+    -------
+        dict: The tree, misclassifications, is_optimal, lower_bound, params and extras.
+
+    Raises
+    ------
+        ValueError: If the file is not a model or has an unknown version.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < _HEADER.itemsize:
+        raise ValueError(f'{path} is not a pymurtree model')
+    header = np.frombuffer(data, dtype=_HEADER, count=1)[0]
+    if header['magic'] != MODEL_MAGIC:
+        raise ValueError(f'{path} is not a pymurtree model')
+    if header['version'] != MODEL_VERSION:
+        raise ValueError('{} has version {}, expected {}'.format(path, header['version'], MODEL_VERSION))
+    n_nodes = int(header['n_nodes'])
+    offset = _HEADER.itemsize
+    arrays = np.frombuffer(data, dtype='<i4', count=len(_ARRAYS) * n_nodes, offset=offset).reshape(len(_ARRAYS), n_nodes)
+    offset += arrays.nbytes
+    params_end = offset + int(header['params_size'])
+    flags = int(header['flags'])
+    return {'tree': Tree(*arrays),
+            'misclassifications': int(header['misclassifications']),
+            'is_optimal': bool(flags & _OPTIMAL),
+            'lower_bound': int(header['lower_bound']) if flags & _HAS_LOWER_BOUND else None,
+            'params': json.loads(data[offset:params_end].decode('utf-8')),
+            'extras': data[params_end:params_end + int(header['extras_size'])]}
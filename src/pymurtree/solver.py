@@ -0,0 +1,126 @@
+import timeit
+
+import numpy as np
+
+from pymurtree import lib
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.parameters import Parameters
+from pymurtree.path import PathResult
+from pymurtree.stats import SolveStats, log_output
+from pymurtree.tree import Tree
+
+# Largest upper bound accepted by the solver, meaning that no upper bound is known
+NO_UPPER_BOUND = 2**31 - 1
+
+def solver_upper_bound(upper_bound: int) -> int:
+    """
+    Converts the misclassifications of a known tree into the upper bound of the solver,
+    which only searches trees strictly better than its upper bound.
+    """
+    return NO_UPPER_BOUND if upper_bound is None else min(upper_bound + 1, NO_UPPER_BOUND)
+
+def create_solver(x: np.ndarray, y: np.ndarray, params: Parameters, stats: SolveStats = None,
+                  sample_weight: np.ndarray = None, rows: np.ndarray = None):
+    """
+    Creates a lib.Solver holding the training data x and y, which are read in place.
+    The time taken is added to the ingestion time of stats, if given. Row i becomes
+    sample_weight[i] * params.duplicate_factor instances of the solver. A BitMatrix is read
+    from its packed bits. If rows is given, a 1D array of row indices, the solver only
+    holds those rows, read from x, y and sample_weight without copying them first.
+    """
+    start = timeit.default_timer()
+    packed_features = -1
+    if isinstance(x, BitMatrix):
+        x, packed_features = x.bits, x.n_features
+    solver = lib.Solver(x, y,
+                      params.time,
+                      params.max_depth,
+                      params.max_num_nodes,
+                      params.sparse_coefficient,
+                      params.verbose,
+                      params.all_trees,
+                      params.incremental_frequency,
+                      params.similarity_lower_bound,
+                      params.node_selection,
+                      params.feature_ordering,
+                      params.random_seed,
+                      params.cache_type,
+                      params.duplicate_factor,
+                      sample_weight,
+                      packed_features,
+                      rows)
+    if stats is not None:
+        stats.ingestion_time += timeit.default_timer() - start
+    return solver
+
+def solve(solver, params: Parameters, stats: SolveStats = None):
+    """
+    Runs the search of the solver with the given parameters and returns the lib.SolverResult.
+    The GIL is released during the search.
+
+    The statistics of the solver are added to stats, if given. What the solver prints,
+    only if params.verbose, is captured and logged through the logger 'pymurtree' at info level.
+    """
+    result, seconds, output, counters = solver.solve(params.time,
+                                                     params.max_depth,
+                                                     params.max_num_nodes,
+                                                     params.sparse_coefficient,
+                                                     params.verbose,
+                                                     params.all_trees,
+                                                     params.incremental_frequency,
+                                                     params.similarity_lower_bound,
+                                                     params.node_selection,
+                                                     params.feature_ordering,
+                                                     params.random_seed,
+                                                     params.cache_type,
+                                                     params.duplicate_factor,
+                                                     solver_upper_bound(params.upper_bound))
+    log_output(output, params.verbose)
+    if stats is not None:
+        stats.add_search(seconds, counters)
+    return result
+
+def result_tree(result, stats: SolveStats = None) -> Tree:
+    """
+    Returns the Tree of a lib.SolverResult, adding the time taken to the reconstruction time of stats.
+    """
+    start = timeit.default_timer()
+    tree = Tree.from_solver_result(result)
+    if stats is not None:
+        stats.reconstruction_time += timeit.default_timer() - start
+    return tree
+
+def solve_path(solver, settings: list, params: Parameters, stats: SolveStats = None, shared_time: bool = False) -> list:
+    """
+    Solves the (max_depth, max_num_nodes, sparse_coefficient) settings in order with one native call,
+    taking the other parameters, including the upper bound, from `params`. The statistics are
+    handled as in solve. Each setting has params.time seconds, or with shared_time, all the
+    settings share params.time and those left once it is spent are not solved.
+
+    Returns
+    -------
+        list: A PathResult for each setting solved, in order.
+    """
+    solutions = solver.solve_path(settings,
+                                  params.time,
+                                  params.verbose,
+                                  params.incremental_frequency,
+                                  params.similarity_lower_bound,
+                                  params.node_selection,
+                                  params.feature_ordering,
+                                  params.random_seed,
+                                  params.cache_type,
+                                  params.duplicate_factor,
+                                  solver_upper_bound(params.upper_bound),
+                                  shared_time)
+    results = []
+    for (depth, num_nodes, coefficient), (result, solve_time, output, counters) in zip(settings, solutions):
+        log_output(output, params.verbose)
+        if stats is not None:
+            stats.add_search(solve_time, counters)
+        results.append(PathResult(depth, num_nodes, coefficient,
+                                  result_tree(result, stats),
+                                  result.misclassification_score(),
+                                  solve_time,
+                                  result.is_proven_optimal()))
+    return results
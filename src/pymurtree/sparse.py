@@ -0,0 +1,82 @@
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+def is_sparse(x) -> bool:
+    """
+    Returns True for the sparse matrices and arrays of scipy.sparse,
+    which is found without importing scipy.
+    """
+    return type(x).__module__.startswith('scipy.sparse') and hasattr(x, 'tocsr')
+
+def sparse_to_bitmatrix(x, chunk_size: int = 65536) -> BitMatrix:
+    """
+    Packs a sparse matrix of binary features into a BitMatrix.
+
+    The bits are set directly from the indices of the stored values, by chunks of
+    rows for CSR matrices and column by column for CSC matrices, so no dense matrix
+    is built. As when the solver reads dense features, a feature is present only
+    where its value is 1. Other formats are converted to CSR first.
+
+    Parameters
+    ----------
+        x (scipy.sparse matrix or array): A 2D matrix of binary features.
+        chunk_size (int, optional): Number of rows of a CSR matrix packed at a time. Defaults to 65536.
+
+    Returns
+    -------
+        BitMatrix: The features, packed eight per byte.
+    """
+    x = _canonical(x)
+    n_rows, n_features = x.shape
+    bits = np.zeros((n_rows, (n_features + 7) // 8), dtype=np.uint8)
+    if x.format == 'csr':
+        for begin in range(0, n_rows, chunk_size):
+            end = min(begin + chunk_size, n_rows)
+            start, stop = x.indptr[begin], x.indptr[end]
+            rows = np.repeat(np.arange(begin, end), np.diff(x.indptr[begin:end + 1]))
+            present = x.data[start:stop] == 1
+            features = x.indices[start:stop][present]
+            # Several features of a row may share a byte
+            np.bitwise_or.at(bits, (rows[present], features >> 3), np.left_shift(1, features & 7).astype(np.uint8))
+    else:
+        for feature in range(n_features):
+            start, stop = x.indptr[feature], x.indptr[feature + 1]
+            rows = x.indices[start:stop][x.data[start:stop] == 1]
+            bits[rows, feature >> 3] |= np.uint8(1 << (feature & 7))
+    return BitMatrix(bits, n_features)
+
+def sparse_lookup(x):
+    """
+    Returns a function present(rows, features) that tells whether each feature is 1 in its
+    row of the sparse matrix x, as for the solver, by binary search among the stored values. Traversing a
+    tree with it only looks up the features tested along the path of each row.
+    """
+    x = _canonical(x)
+    n_rows, n_features = x.shape
+    # The position of every stored value in the order of the format, which is sorted
+    minor = n_features if x.format == 'csr' else n_rows
+    keys = np.repeat(np.arange(len(x.indptr) - 1, dtype=np.int64), np.diff(x.indptr)) * minor + x.indices
+    keys = keys[x.data == 1]
+
+    def present(rows: np.ndarray, features: np.ndarray) -> np.ndarray:
+        if x.format == 'csr':
+            query = rows.astype(np.int64) * n_features + features
+        else:
+            query = features.astype(np.int64) * n_rows + rows
+        if keys.size == 0:
+            return np.zeros(query.shape, dtype=bool)
+        position = np.minimum(np.searchsorted(keys, query), keys.size - 1)
+        return keys[position] == query
+
+    return present
+
+def _canonical(x):
+    # CSR or CSC with sorted indices and without duplicates, copied only if needed
+    if x.format not in ('csr', 'csc'):
+        x = x.tocsr()
+    if not x.has_canonical_format:
+        x = x.copy()
+        x.sum_duplicates()
+    return x
@@ -0,0 +1,163 @@
+import dataclasses
+import logging
+import sys
+
+try:
+    import resource
+except ImportError: # not available on Windows
+    resource = None
+
+logger = logging.getLogger('pymurtree')
+logger.addHandler(logging.NullHandler())
+
+# Statistics of the solver, under their names in MurTree, that make up the named counters
+_TERMINAL_CALLS = ('num_terminal_nodes_with_node_budget_one',
+                   'num_terminal_nodes_with_node_budget_two',
+                   'num_terminal_nodes_with_node_budget_three')
+_CACHE_HITS = ('num_cache_hit_optimality', 'num_cache_hit_nonzero_bound')
+
+def log_output(output: str, verbose: bool) -> None:
+    """
+    Sends the lines printed by the solver to the logger 'pymurtree',
+    at info level if verbose and at debug level otherwise.
+    """
+    level = logging.INFO if verbose else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    for line in output.splitlines():
+        if line.strip():
+            logger.log(level, line)
+
+def peak_memory_usage() -> int:
+    """
+    Returns the peak resident memory of the current process in bytes since it started,
+    or None if it cannot be determined on this platform.
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in bytes on macOS and in kibibytes on Linux and the BSDs
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+def _memory_status() -> dict:
+    # The current (VmRSS) and peak (VmHWM) resident memory of the process in bytes,
+    # read from /proc, so only on Linux, where they are given in kibibytes
+    try:
+        with open('/proc/self/status') as status:
+            lines = status.readlines()
+    except OSError:
+        return {}
+    fields = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        if name in ('VmRSS', 'VmHWM'):
+            fields[name] = int(value.split()[0]) * 1024
+    return fields
+
+def _reset_peak_memory() -> bool:
+    # Resets VmHWM to the current resident memory, which Linux allows since 4.0
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        return False
+    return True
+
+class MemoryMeter:
+    """
+    Measures how far the resident memory of the process rises above its level when the
+    meter is created.
+
+    On Linux, the peak of the process is reset when the meter is created, so the rise is
+    measured from the current memory. Elsewhere, the peak cannot be reset, so only the rise
+    above the earlier peak of the process is seen, which is 0 if the process had already
+    used more memory. Meters running at the same time in the same process share the peak.
+    """
+    def __init__(self) -> None:
+        self.__linux = _reset_peak_memory() and 'VmRSS' in _memory_status()
+        self.__start = _memory_status()['VmRSS'] if self.__linux else peak_memory_usage()
+
+    def rise(self) -> int:
+        """
+        Returns the highest rise of the resident memory so far in bytes, or None
+        if it cannot be determined on this platform.
+        """
+        peak = _memory_status().get('VmHWM') if self.__linux else peak_memory_usage()
+        if peak is None or self.__start is None:
+            return None
+        return max(0, peak - self.__start)
+
+@dataclasses.dataclass
+class SolveStats:
+    """
+    Statistics of a fit: wall time per phase, search counters and peak memory.
+
+    The counters are the statistics that the solver keeps during each search, read
+    through the binding whether or not the fit is verbose, summed over every search 
+    of the fit, and kept in `counters` under their names in MurTree. The named 
+    counters are None if no search was run. MurTree does not count the nodes explored,
+    the subproblems pruned by the similarity lower bound or the cache misses, so they
+    are not available.
+    """
+
+    # Seconds spent reading the training data into the solvers
+    ingestion_time: float = 0.0
+
+    # Seconds spent before the search: validating and converting the input, warm starts
+    preprocessing_time: float = 0.0
+
+    # Seconds spent in the native searches
+    search_time: float = 0.0
+
+    # Seconds spent turning the results of the solver into trees
+    reconstruction_time: float = 0.0
+
+    # Number of native searches
+    num_searches: int = 0
+
+    # Highest rise of the resident memory of the process during the fit in bytes, see MemoryMeter
+    peak_memory: int = None
+
+    # Fits answered by the result cache, and fits that it did not hold, see pymurtree.resultcache
+    result_cache_hits: int = 0
+    result_cache_misses: int = 0
+
+    # Every statistic of the solver, summed over the searches
+    counters: dict = dataclasses.field(default_factory=dict)
+
+    def add_search(self, seconds: float, counters: dict) -> None:
+        """Records a native search from its wall time and the statistics of the solver."""
+        self.search_time += seconds
+        self.num_searches += 1
+        for name, value in counters.items():
+            value = int(value) if name.startswith('num_') else value
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: 'SolveStats') -> None:
+        """Adds the times and counters of other, keeping the largest peak memory."""
+        self.ingestion_time += other.ingestion_time
+        self.preprocessing_time += other.preprocessing_time
+        self.search_time += other.search_time
+        self.reconstruction_time += other.reconstruction_time
+        self.num_searches += other.num_searches
+        self.result_cache_hits += other.result_cache_hits
+        self.result_cache_misses += other.result_cache_misses
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def __total(self, names: tuple):
+        if not any(name in self.counters for name in names):
+            return None
+        return sum(self.counters.get(name, 0) for name in names)
+
+    @property
+    def cache_hits(self) -> int:
+        """Subproblems whose optimal subtree or lower bound was found in the cache of the solver."""
+        return self.__total(_CACHE_HITS)
+
+    @property
+    def terminal_calls(self) -> int:
+        """Calls to the specialized solver of depth-two trees."""
+        return self.__total(_TERMINAL_CALLS)
@@ -0,0 +1,251 @@
+import os
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.sparse import is_sparse, sparse_lookup, sparse_to_bitmatrix
+
+
+class Tree:
+    """
+    Array-based representation of a fitted decision tree, along the lines of
+    scikit-learn's ``tree_`` attribute. 
+    
+    Nodes are stored in pre-order, so node 0 is the root. For each node id `i`:
+
+        feature[i]: feature tested by the node, or -1 if it is a label node.
+        left[i]: id of the child followed when the feature is missing (0), or -1.
+        right[i]: id of the child followed when the feature is present (1), or -1.
+        label[i]: class assigned by the node, or -1 if it is a feature node.
+        depth[i]: number of feature nodes between the root and the node.
+    """
+    def __init__(self,
+                 feature: np.ndarray,
+                 left: np.ndarray,
+                 right: np.ndarray,
+                 label: np.ndarray,
+                 depth: np.ndarray) -> None:
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.label = np.asarray(label, dtype=np.int32)
+        self.depth = np.asarray(depth, dtype=np.int32)
+
+    @classmethod
+    def from_solver_result(cls, solver_result) -> 'Tree':
+        """
+        Creates the array representation of the tree held by a lib.SolverResult.
+        """
+        return cls(*solver_result._tree_arrays())
+
+    @classmethod
+    def leaf(cls, label: int) -> 'Tree':
+        """
+        Creates a tree made of a single label node.
+        """
+        return cls([-1], [-1], [-1], [label], [0])
+
+    @classmethod
+    def from_split(cls, feature: int, left: 'Tree', right: 'Tree') -> 'Tree':
+        """
+        Creates a tree whose root tests `feature`, with `left` as the subtree followed
+        when the feature is missing and `right` when it is present.
+        """
+        def shift(children: np.ndarray, offset: int) -> np.ndarray:
+            return np.where(children >= 0, children + offset, -1)
+
+        num_left = left.node_count
+        return cls(np.concatenate(([feature], left.feature, right.feature)),
+                   np.concatenate(([1], shift(left.left, 1), shift(right.left, 1 + num_left))),
+                   np.concatenate(([1 + num_left], shift(left.right, 1), shift(right.right, 1 + num_left))),
+                   np.concatenate(([-1], left.label, right.label)),
+                   np.concatenate(([0], left.depth + 1, right.depth + 1)))
+
+    def with_features(self, features: np.ndarray) -> 'Tree':
+        """
+        Returns a copy of the tree that tests features[f] where this one tests f,
+        e.g. to map the columns kept by a FeatureScreener back to the original ones.
+        """
+        features = np.asarray(features)
+        return Tree(np.where(self.feature >= 0, features[np.maximum(self.feature, 0)], -1),
+                    self.left.copy(), self.right.copy(), self.label.copy(), self.depth.copy())
+
+    @property
+    def node_count(self) -> int:
+        """Total number of nodes, both feature and label nodes."""
+        return self.feature.shape[0]
+
+    @property
+    def max_depth(self) -> int:
+        """Largest number of feature nodes from the root to any leaf."""
+        return int(self.depth.max()) if self.node_count > 0 else 0
+
+    @property
+    def num_feature_nodes(self) -> int:
+        """Number of feature (decision) nodes."""
+        return int(np.count_nonzero(self.feature >= 0))
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        """
+        Returns the id of the leaf reached by each instance.
+
+        The traversal is vectorized over the whole batch and proceeds one level
+        at a time, so it takes at most max_depth steps over the rows that 
+        have not reached a leaf yet. For a sparse matrix, only the features tested 
+        along the path of each row are looked up, see pymurtree.sparse.sparse_lookup.
+        The bits of a BitMatrix are read in place.
+
+        Parameters
+        ----------
+            x (numpy.ndarray, BitMatrix or scipy.sparse matrix): A 2D array of binary features, where 
+                1 means that the feature is present, as for the solver.
+
+        Returns
+        -------
+            numpy.ndarray: A 1D array with the leaf id of each row of `x`.
+        """
+        if self.node_count == 0:
+            raise ValueError('The tree is empty')
+        x, is_present = feature_lookup(x)
+        if x.shape[1] <= self.feature.max():
+            raise ValueError(f'x has {x.shape[1]} features, but the tree tests feature #{self.feature.max()}')
+
+        node = np.zeros(x.shape[0], dtype=np.int32)
+        active = np.arange(x.shape[0])
+        while active.size > 0:
+            feature = self.feature[node[active]]
+            internal = feature >= 0
+            active = active[internal]
+            feature = feature[internal]
+            current = node[active]
+            present = is_present(active, feature)
+            node[active] = np.where(present, self.right[current], self.left[current])
+        return node
+
+    def count_misclassifications(self, x: np.ndarray, y: np.ndarray, chunk_size: int = 65536, sample_weight: np.ndarray = None) -> int:
+        """
+        Counts the instances of the training data misclassified by the tree.
+
+        As the solver does when it reads the training data, a feature is present
+        only if its value is 1. The rows are processed in chunks to bound the memory.
+
+        Parameters
+        ----------
+            x (numpy.ndarray): A 2D array of binary features.
+            y (numpy.ndarray): A 1D array of labels.
+            chunk_size (int, optional): Number of rows classified at a time.
+            sample_weight (numpy.ndarray, optional): Integer weights of the rows, counted as that many instances.
+
+        Returns
+        -------
+            int: The number (or total weight) of rows whose predicted label differs from `y`.
+        """
+        if is_sparse(x):
+            x = sparse_to_bitmatrix(x, chunk_size)
+        elif not isinstance(x, BitMatrix):
+            x = np.asarray(x)
+        y = np.asarray(y)
+        misclassifications = 0
+        for begin in range(0, x.shape[0], chunk_size):
+            end = begin + chunk_size
+            rows = x[begin:end] if isinstance(x, BitMatrix) else x[begin:end] == 1
+            wrong = self.predict(rows) != y[begin:end]
+            if sample_weight is None:
+                misclassifications += int(np.count_nonzero(wrong))
+            else:
+                misclassifications += int(np.sum(sample_weight[begin:end][wrong]))
+        return misclassifications
+
+    def predict(self, x, n_jobs: int = None, out: np.ndarray = None) -> np.ndarray:
+        """
+        Predicts the class of each row of `x`.
+
+        By default the prediction is a vectorized NumPy traversal, which also reads
+        scipy.sparse matrices. If `x` is a BitMatrix, or if `n_jobs` or `out` are given, 
+        the rows are classified natively instead (see predict_native), and a sparse
+        matrix is packed into a BitMatrix first.
+
+        Parameters
+        ----------
+            x (numpy.ndarray, BitMatrix or scipy.sparse matrix): A 2D array of binary features.
+            n_jobs (int, optional): Number of threads used by the native prediction.
+            out (numpy.ndarray, optional): Array where the native prediction writes the labels.
+
+        Returns
+        -------
+            numpy.ndarray: A 1D array with the predicted label of each row of `x`.
+        """
+        if isinstance(x, BitMatrix) or n_jobs is not None or out is not None:
+            if is_sparse(x):
+                x = sparse_to_bitmatrix(x)
+            return self.predict_native(x, n_jobs=n_jobs, out=out)
+        return self.label[self.apply(x)]
+
+    def predict_native(self, x, n_jobs: int = None, out: np.ndarray = None) -> np.ndarray:
+        """
+        Predicts the class of each row of `x` with the compiled library. 
+        
+        The rows are split across `n_jobs` threads and the GIL is released while 
+        they are classified, so other Python threads keep running.
+
+        Parameters
+        ----------
+            x (numpy.ndarray or BitMatrix): A 2D array of binary features. Boolean and uint8 
+                C-ordered arrays, as well as bit-packed BitMatrix objects, are read without copies.
+            n_jobs (int, optional): Number of threads. Defaults to one, -1 uses all the cores.
+            out (numpy.ndarray, optional): A C-ordered 1D int32 array with one entry per row 
+                where the labels are written. A new array is allocated if not given.
+
+        Returns
+        -------
+            numpy.ndarray: `out`, holding the predicted label of each row of `x`.
+        """
+        from pymurtree import lib
+
+        if self.node_count == 0:
+            raise ValueError('The tree is empty')
+        packed = isinstance(x, BitMatrix)
+        if packed:
+            n_features = x.n_features
+            x = x.bits
+        else:
+            x = np.asarray(x)
+            if x.ndim != 2:
+                raise ValueError('x is expected to be a 2D array')
+            n_features = x.shape[1]
+            if x.dtype == np.bool_:
+                x = x.view(np.uint8)
+            elif x.dtype != np.uint8:
+                x = (x == 1).view(np.uint8)
+        if n_features <= self.feature.max():
+            raise ValueError(f'x has {n_features} features, but the tree tests feature #{self.feature.max()}')
+        x = np.ascontiguousarray(x)
+
+        if out is None:
+            out = np.empty(x.shape[0], dtype=np.int32)
+        elif out.dtype != np.int32 or out.shape != (x.shape[0],) or not out.flags.c_contiguous or not out.flags.writeable:
+            raise ValueError('out is expected to be a writeable C-ordered 1D int32 array with one entry per row of x')
+
+        if n_jobs is None:
+            n_jobs = 1
+        elif n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+
+        lib._predict_batch(self.feature, self.left, self.right, self.label, x, packed, out, n_jobs)
+        return out
+
+def feature_lookup(x) -> tuple:
+    """
+    Returns x, as an array unless it is a BitMatrix or a sparse matrix, and a function
+    present(rows, features) that tells whether each feature is 1 in its row,
+    which traversals call for the features tested along the paths of the rows.
+    """
+    if is_sparse(x):
+        return x, sparse_lookup(x)
+    if isinstance(x, BitMatrix):
+        bits = x.bits
+        return x, lambda rows, features: (bits[rows, features >> 3] >> (features & 7)) & 1 != 0
+    x = np.asarray(x)
+    if x.ndim != 2:
+        raise ValueError('x is expected to be a 2D array')
+    return x, lambda rows, features: x[rows, features] == 1
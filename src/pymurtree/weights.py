@@ -0,0 +1,97 @@
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+
+# The solver counts its instances with 32-bit integers
+MAX_INSTANCES = 2**31 - 1
+
+def check_sample_weight(sample_weight, n_rows: int) -> np.ndarray:
+    """
+    Validates sample weights and returns them as an int64 array.
+
+    The solver counts instances, so the weights must be non-negative integers:
+    a row of weight w counts as w identical rows, and rows of weight 0 are ignored.
+    The solver holds a copy of a row for each unit of its weight, so its memory and
+    search time grow with the total weight, which it can hold up to 2**31 - 1.
+
+    Raises
+    ------
+        ValueError: If the weights do not match the rows, are not non-negative integers, are all zero,
+        or add up to more instances than the solver can hold.
+    """
+    weights = np.asarray(sample_weight)
+    if weights.shape != (n_rows,):
+        raise ValueError('sample_weight should be a 1D array with one weight per row')
+    if weights.dtype.kind == 'f':
+        if not np.all(np.isfinite(weights)) or np.any(weights != np.round(weights)):
+            raise ValueError('sample_weight should hold integers, since the solver counts instances')
+    elif weights.dtype.kind not in 'biu':
+        raise ValueError('sample_weight should hold integers, since the solver counts instances')
+    weights = weights.astype(np.int64)
+    if np.any(weights < 0):
+        raise ValueError('sample_weight should be non-negative')
+    if not np.any(weights):
+        raise ValueError('sample_weight should have at least one positive weight')
+    if weights.sum() > MAX_INSTANCES:
+        raise ValueError('sample_weight adds up to more instances than the solver can hold')
+    return weights
+
+def cancel_conflicts(x: np.ndarray, y: np.ndarray, sample_weight: np.ndarray = None) -> tuple:
+    """
+    Cancels out the conflicting labels of the identical rows of a binary dataset.
+
+    The rows with the same features end up in the same leaf of any tree, so they are
+    grouped, and each group keeps one row per label, weighted by the number (or total
+    weight) of rows with that label. As long as every one of the k classes appears in
+    a group, one row of each class can be removed: whatever label a leaf predicts,
+    k - 1 of them are misclassified, so the misclassifications of every tree only drop
+    by a constant, returned as offset.
+
+    The solver has no instance weights: it copies a row once per unit of its weight.
+    Only the cancelled rows are therefore removed from the instances it holds, and
+    identical rows with a single label still count as that many instances.
+
+    The misclassifications of a tree on the original data are its weighted
+    misclassifications on the reduced data plus the offset, hence both have
+    the same optimal trees. This does not hold for the sparse objective, whose
+    penalty depends on the number of instances.
+
+    Parameters
+    ----------
+        x (numpy.ndarray or BitMatrix): A 2D array of binary features, where 1 means that the feature is present.
+        y (numpy.ndarray): A 1D array of non-negative integer labels.
+        sample_weight (numpy.ndarray, optional): Integer weights of the rows, see check_sample_weight.
+
+    Returns
+    -------
+        tuple: The rows x and labels y of the reduced dataset, their int64 weights,
+        and the offset of the misclassifications.
+    """
+    if not isinstance(x, BitMatrix):
+        x = np.asarray(x)
+    y = np.asarray(y)
+    weights = np.ones(len(y), dtype=np.int64) if sample_weight is None else sample_weight
+    # Every row as a single opaque value, so that identical rows can be found by np.unique
+    packed = np.ascontiguousarray(x.bits if isinstance(x, BitMatrix) else np.packbits(x == 1, axis=1))
+    if packed.shape[1] == 0:
+        keys = np.zeros(len(y), dtype=np.uint8)
+    else:
+        keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+    _, first, group = np.unique(keys, return_index=True, return_inverse=True)
+    group = group.ravel()
+
+    classes = np.unique(y[weights > 0])
+    counts = np.zeros((len(first), int(y.max()) + 1), dtype=np.int64)
+    np.add.at(counts, (group, y), weights)
+    # Sets of one row of every class, which cancel out
+    cancelled = counts[:, classes].min(axis=1)
+    counts[:, classes] -= cancelled[:, None]
+    offset = int(cancelled.sum()) * (len(classes) - 1)
+    if not counts.any():
+        # Keeps one set of rows, since the solver needs at least one instance
+        kept = np.argmax(cancelled)
+        counts[kept, classes] += 1
+        offset -= len(classes) - 1
+
+    rows, labels = np.nonzero(counts)
+    return x[first[rows]], labels.astype(y.dtype), counts[rows, labels], offset
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from pymurtree.arrow import arrow_to_bitmatrix, is_arrow, read_parquet
+
+pyarrow = pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def bool_table():
+    random = np.random.RandomState(0)
+    x = random.randint(0, 2, size=(100, 11)).astype(bool)
+    columns = [pyarrow.array(x[:, j]) for j in range(x.shape[1])]
+    # A column with nulls, which are absent features
+    columns[3] = pyarrow.array([None if i % 7 == 0 else bool(value) for i, value in enumerate(x[:, 3])])
+    x[::7, 3] = False
+    return pyarrow.table(columns, names=[f'f{j}' for j in range(x.shape[1])]), x
+
+def test_is_arrow(bool_table):
+    table, x = bool_table
+    assert is_arrow(table)
+    assert not is_arrow(x)
+
+def test_arrow_to_bitmatrix(bool_table):
+    table, x = bool_table
+    np.testing.assert_array_equal(arrow_to_bitmatrix(table, chunk_size=16).to_dense(), x)
+    # A sliced batch has bitmaps that do not start at a byte boundary
+    batch = table.to_batches()[0].slice(13, 50)
+    np.testing.assert_array_equal(arrow_to_bitmatrix(batch).to_dense(), x[13:63])
+
+def test_integer_columns():
+    table = pyarrow.table({'a': [0, 1, None, 1], 'b': [1, 0, 0, 2]})
+    np.testing.assert_array_equal(arrow_to_bitmatrix(table).to_dense(), [[0, 1], [1, 0], [0, 0], [1, 0]])
+
+def test_read_parquet(bool_table, tmp_path):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    table, x = bool_table
+    y = np.arange(100) % 3
+    path = str(tmp_path / 'data.parquet')
+    parquet.write_table(table.append_column('label', pyarrow.array(y)), path)
+    bits, labels = read_parquet(path, label_column='label', batch_size=32)
+    np.testing.assert_array_equal(bits.to_dense(), x)
+    np.testing.assert_array_equal(labels, y)
+    bits, labels = read_parquet(path, columns=['f1', 'f0'])
+    np.testing.assert_array_equal(bits.to_dense(), x[:, [1, 0]])
+    assert labels is None
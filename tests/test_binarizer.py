@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from pymurtree.binarizer import Binarizer
+from pymurtree.bitmatrix import BitMatrix
+
+
+@pytest.fixture
+def raw_data():
+    random = np.random.RandomState(0)
+    age = random.uniform(0, 100, 500)
+    color = random.choice(['red', 'green', 'blue'], 500)
+    x = np.empty((500, 2), dtype=object)
+    x[:, 0] = age
+    x[:, 1] = color
+    y = ((age > 40) & (color != 'red')).astype(np.int32)
+    return x, y
+
+def test_quantile_thresholds():
+    values = np.arange(100, dtype=float)[:, None]
+    binarizer = Binarizer(max_features_per_column=3)
+    bits = binarizer.fit_transform(values)
+    assert isinstance(bits, BitMatrix)
+    assert bits.shape == (100, 3)
+    np.testing.assert_array_equal(binarizer.thresholds_[0], np.quantile(values, [0.25, 0.5, 0.75]))
+    np.testing.assert_array_equal(bits.to_dense(), values > binarizer.thresholds_[0][None, :])
+
+def test_class_boundary_thresholds():
+    values = np.array([1, 2, 3, 4, 5, 6], dtype=float)[:, None]
+    binarizer = Binarizer(strategy='class_boundary').fit(values, [0, 0, 0, 1, 1, 1])
+    np.testing.assert_array_equal(binarizer.thresholds_[0], [3.5])
+    with pytest.raises(ValueError):
+        Binarizer(strategy='class_boundary').fit(values)
+
+def test_capped_class_boundary_thresholds():
+    random = np.random.RandomState(0)
+    x = random.uniform(0, 10, size=(300, 2))
+    y = (x[:, 0] > 5).astype(np.int32) + (x[:, 1] > 7).astype(np.int32)
+    binarizer = Binarizer(strategy='class_boundary', max_features_per_column=4)
+    dense = binarizer.fit_transform(x, y).to_dense()
+    assert [len(thresholds) for thresholds in binarizer.thresholds_] == [4, 4]
+    # The boundaries that separate the classes best are kept, wherever they fall in the rows
+    assert any((dense[:, j] == (x[:, 0] > 5)).all() for j in range(4))
+    assert any((dense[:, 4 + j] == (x[:, 1] > 7)).all() for j in range(4))
+
+def test_categorical_columns(raw_data):
+    x, y = raw_data
+    binarizer = Binarizer(strategy='class_boundary', max_features_per_column=4, categorical=[1])
+    dense = binarizer.fit_transform(x, y).to_dense()
+    assert binarizer.n_features_out_ == dense.shape[1] <= 4 + 3
+    assert sorted(binarizer.categories_[1]) == ['blue', 'green', 'red']
+    red = binarizer.feature_names_.index("x1 == 'red'")
+    np.testing.assert_array_equal(dense[:, red], x[:, 1] == 'red')
+
+def test_missing_values():
+    values = np.array([[1.0], [np.nan], [3.0], [2.0]])
+    dense = Binarizer().fit_transform(values).to_dense()
+    assert not dense[1].any()
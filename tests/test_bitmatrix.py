@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from pymurtree.bitmatrix import BitMatrix
+
+
+def test_select_features():
+    x = np.random.RandomState(0).randint(0, 2, size=(50, 21)).astype(np.uint8)
+    bits = BitMatrix.from_dense(x)
+    for features in ([3, 0, 20, 9], list(range(21)), [7], []):
+        selected = bits.select_features(features, chunk_size=7)
+        assert selected.shape == (50, len(features))
+        np.testing.assert_array_equal(selected.to_dense(), x[:, features])
+    with pytest.raises(IndexError):
+        bits.select_features([21])
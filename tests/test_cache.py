@@ -0,0 +1,18 @@
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.cache import dataset_fingerprint
+
+
+def test_dataset_fingerprint():
+    x = np.random.RandomState(0).randint(0, 2, size=(100, 7))
+    y = np.arange(100)
+    fingerprint = dataset_fingerprint(x, y, None)
+    assert fingerprint == dataset_fingerprint(np.asfortranarray(x), y.copy(), None)
+    assert fingerprint == dataset_fingerprint(x, y, None, chunk_size=7)
+    changed = x.copy()
+    changed[5, 3] ^= 1
+    assert fingerprint != dataset_fingerprint(changed, y, None)
+    assert fingerprint != dataset_fingerprint(x, y, np.ones(100))
+    assert fingerprint != dataset_fingerprint(x.astype(bool), y, None)
+    assert dataset_fingerprint(BitMatrix.from_dense(x), y) != dataset_fingerprint(x, y)
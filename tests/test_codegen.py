@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from pymurtree.codegen import c_source, compile_c, compile_numpy, numpy_source
+from pymurtree.tree import Tree
+
+
+@pytest.fixture
+def tree():
+    # feature #7 is missing -> class 1, present -> feature #3 (missing -> class 2, present -> class 3)
+    return Tree(feature=[7, -1, 3, -1, -1], left=[1, -1, 3, -1, -1], right=[2, -1, 4, -1, -1],
+                label=[-1, 1, -1, 2, 3], depth=[0, 1, 1, 2, 2])
+
+@pytest.fixture
+def x():
+    return np.random.RandomState(0).randint(0, 2, size=(200, 9))
+
+def test_numpy_source(tree, x):
+    assert 'import numpy as np' in numpy_source(tree)
+    predict = compile_numpy(tree)
+    np.testing.assert_array_equal(predict(x), tree.predict(x))
+    assert predict(x).dtype == np.int32
+    leaf = compile_numpy(Tree.leaf(4))
+    np.testing.assert_array_equal(leaf(x), np.full(200, 4))
+
+def test_c_source(tree):
+    source = c_source(tree, function_name='classify')
+    assert 'int classify(const unsigned char* row)' in source
+    assert 'void classify_batch(' in source
+    assert '#include' not in source
+
+@pytest.mark.skipif(shutil.which('cc') is None, reason='requires a C compiler')
+def test_compile_c(tree, x, tmp_path):
+    compiled = compile_c(tree, directory=str(tmp_path))
+    expected = tree.predict(x)
+    for features in (x, x.astype(bool), x.astype(np.uint8), np.asfortranarray(x)):
+        np.testing.assert_array_equal(compiled.predict(features), expected)
+    assert compiled.predict_row(x[0]) == expected[0]
+    with pytest.raises(ValueError):
+        compiled.predict(x[:, :5])
+
+@pytest.mark.skipif(shutil.which('cc') is None, reason='requires a C compiler')
+def test_compile_c_removes_temporary_directory(tree, x, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    compiled = compile_c(tree)
+    np.testing.assert_array_equal(compiled.predict(x), tree.predict(x))
+    with pytest.raises(RuntimeError):
+        compile_c(tree, compiler='false')
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,42 @@
+'''
+The Python export must produce exactly the same output as the ExportTree class
+of the compiled library, so it is checked against the data of the C++ tests.
+'''
+import pytest
+
+from pymurtree.exporttree import export_c, export_dot, export_numpy, export_text
+from pymurtree.tree import Tree
+
+CPPTESTS_DATA = "./tests/cpptests/data/"
+
+@pytest.fixture
+def tree_5nodes_4edges():
+    # feature #7 is missing -> class 1, present -> feature #3 (missing -> class 2, present -> class 3)
+    return Tree(feature=[7, -1, 3, -1, -1], left=[1, -1, 3, -1, -1], right=[2, -1, 4, -1, -1],
+                label=[-1, 1, -1, 2, 3], depth=[0, 1, 1, 2, 2])
+
+@pytest.fixture
+def tree_single_label_node():
+    return Tree(feature=[-1], left=[-1], right=[-1], label=[4], depth=[0])
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+def test_export_text(tmp_path, tree_5nodes_4edges, tree_single_label_node):
+    export_text(tree_5nodes_4edges, str(tmp_path / "tree.txt"))
+    assert read(tmp_path / "tree.txt") == read(CPPTESTS_DATA + "fivenodesfouredgestree.txt")
+    export_text(tree_single_label_node, str(tmp_path / "leaf.txt"))
+    assert read(tmp_path / "leaf.txt") == read(CPPTESTS_DATA + "singlelabelnodetree.txt")
+
+def test_export_dot(tmp_path, tree_5nodes_4edges, tree_single_label_node):
+    export_dot(tree_5nodes_4edges, str(tmp_path / "tree.dot"))
+    assert read(tmp_path / "tree.dot") == read(CPPTESTS_DATA + "fivenodesfouredgestree.dot")
+    export_dot(tree_single_label_node, str(tmp_path / "leaf.dot"))
+    assert read(tmp_path / "leaf.dot") == read(CPPTESTS_DATA + "singlelabelnodetree.dot")
+
+def test_export_source_write_error(tmp_path, tree_5nodes_4edges):
+    missing = str(tmp_path / "missing" / "tree.py")
+    for export in (export_numpy, export_c):
+        with pytest.raises(OSError):
+            export(tree_5nodes_4edges, missing)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import pymurtree
+from src.pymurtree import read_from_file
+
+TRAIN_DATA = "./tests/fixtures/test_dataset.txt"
+
+@pytest.fixture
+def train_data():
+    x, y = read_from_file(TRAIN_DATA)
+    return x.to_numpy(), y.to_numpy()
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_forest(train_data, n_jobs):
+    x, y = train_data
+    forest = pymurtree.OptimalDecisionForestClassifier(n_estimators=5, max_depth=2, max_features=0.5, time=60, n_jobs=n_jobs)
+    forest.fit(x, y)
+    assert len(forest.estimators_) == 5 and len(forest.results_) == 5
+    for tree, result in zip(forest.estimators_, forest.results_):
+        assert tree.max_depth <= 2
+        assert set(tree.feature[tree.feature >= 0]) <= set(result['features'])
+        assert 0 <= result['accuracy'] <= 1
+    labels = forest.tree_labels(x)
+    assert labels.shape == (5, x.shape[0])
+    for tree, tree_labels in zip(forest.estimators_, labels):
+        np.testing.assert_array_equal(tree_labels, tree.predict(x))
+    proba = forest.predict_proba(x)
+    np.testing.assert_allclose(proba.sum(axis=1), 1)
+    np.testing.assert_array_equal(forest.predict(x), forest.classes_[np.argmax(proba, axis=1)])
+    np.testing.assert_array_equal(forest.predict(pymurtree.BitMatrix.from_dense(x)), forest.predict(x))
+
+def test_forest_does_not_depend_on_workers(train_data):
+    x, y = train_data
+    serial = pymurtree.OptimalDecisionForestClassifier(n_estimators=4, max_depth=2, voting='weighted', time=60).fit(x, y)
+    parallel = pymurtree.OptimalDecisionForestClassifier(n_estimators=4, max_depth=2, voting='weighted', time=60, n_jobs=2).fit(x, y)
+    np.testing.assert_array_equal(serial.estimator_weights_, parallel.estimator_weights_)
+    np.testing.assert_array_equal(serial.predict(x), parallel.predict(x))
+
+def test_forest_without_bootstrap(train_data):
+    x, y = train_data
+    # Every tree is the optimal tree of the whole dataset
+    forest = pymurtree.OptimalDecisionForestClassifier(n_estimators=2, max_depth=3, bootstrap=False, time=60).fit(x, y)
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3, time=60)
+    model.fit(x, y)
+    for result in forest.results_:
+        assert not result['out_of_bag']
+        assert result['misclassifications'] == model.score()
+    np.testing.assert_array_equal(forest.predict(x), model.predict(x))
+
+def test_forest_without_tree_found(train_data, monkeypatch):
+    # A fit that runs out of time before finding a tree leaves the model without one
+    x, y = train_data
+    monkeypatch.setattr(pymurtree.OptimalDecisionTreeClassifier, 'fit', lambda self, *args, **kwargs: None)
+    forest = pymurtree.OptimalDecisionForestClassifier(n_estimators=2, max_depth=2, bootstrap=False, time=60).fit(x, y)
+    majority = np.bincount(y).argmax()
+    for tree, result in zip(forest.estimators_, forest.results_):
+        assert tree.node_count == 1 and tree.label[0] == majority
+        assert result['misclassifications'] == np.sum(y != majority)
+        assert not result['is_optimal']
+    np.testing.assert_array_equal(forest.predict(x), np.full(len(y), majority))
+
+def test_forest_invalid_parameters():
+    with pytest.raises(ValueError):
+        pymurtree.OptimalDecisionForestClassifier(n_estimators=0)
+    with pytest.raises(ValueError):
+        pymurtree.OptimalDecisionForestClassifier(voting='average')
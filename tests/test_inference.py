@@ -0,0 +1,51 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.inference import load_model
+from pymurtree.serialization import write_model
+from pymurtree.tree import Tree
+
+# Seconds that importing pymurtree.inference may take in a fresh interpreter, NumPy included
+IMPORT_TIME_BUDGET = 1.0
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import pymurtree.inference
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+def test_load_model(tmp_path):
+    tree = Tree(feature=[7, -1, 3, -1, -1], left=[1, -1, 3, -1, -1], right=[2, -1, 4, -1, -1],
+                label=[-1, 1, -1, 2, 3], depth=[0, 1, 1, 2, 2])
+    path = str(tmp_path / 'model.pmt')
+    write_model(path, tree, 12, True, params={'max_depth': 2})
+    model = load_model(path)
+    assert model.params == {'max_depth': 2}
+    x = np.random.default_rng(0).integers(0, 2, size=(100, 8))
+    expected = tree.predict(x)
+    np.testing.assert_array_equal(model.predict(x), expected)
+    np.testing.assert_array_equal(model.predict(BitMatrix.from_dense(x)), expected)
+
+def test_package_exports():
+    import pymurtree
+    # Names of the package before it was imported lazily
+    for name in ('OptimalDecisionTreeClassifier', 'standardize_to_dtype_int32', 'read_from_file', 'load_data'):
+        assert name in pymurtree.__all__ and name in dir(pymurtree)
+    assert pymurtree.Tree is Tree
+
+def test_import_time_budget():
+    # The best of a few runs in new interpreters, to leave out the noise of the machine
+    runs = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output))
+    modules = runs[0]['modules']
+    for heavy in ('pymurtree.lib', 'pandas', 'scipy', 'pyarrow', 'pymurtree.OptimalDecisionTreeClassifier'):
+        assert heavy not in modules
+    assert min(run['elapsed'] for run in runs) < IMPORT_TIME_BUDGET
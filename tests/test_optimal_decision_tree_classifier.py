@@ -3,10 +3,13 @@ For predict we use only 10 samples of iris_categorical_bin.txt which can be foun
 and downloaded here: https://github.com/MurTree/murtree-data/blob/main/NL/iris_categorical_bin.txt
 '''
 
-import pytest
+import pickle
+
 import numpy as np
-from src.pymurtree import read_from_file
+import pytest
+
 import pymurtree
+from src.pymurtree import read_from_file
 
 TRAIN_DATA = "./tests/fixtures/test_dataset.txt"
 EXPECTED_PREDICT_OUTPUT = "./tests/fixtures/expected_predict_output.txt"
@@ -85,3 +88,296 @@ def test_predict_invalid_input(decision_tree):
     # ...
     with pytest.raises(Exception):
         decision_tree._predict(invalid_input)
+
+def test_fit_without_copies(x_train_data, y_train_data, expected_predict_output):
+    # uint8, boolean and F-ordered arrays are read in place and must give the same tree
+    for x in (x_train_data.astype(np.uint8), x_train_data.astype(bool), np.asfortranarray(x_train_data)):
+        model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, duplicate_factor=1, max_num_nodes=15)
+        model.fit(x, y_train_data)
+        assert (model.predict(x_train_data) == expected_predict_output).all()
+        assert model.peak_memory() >= 0
+
+def test_tree_arrays(decision_tree, x_train_data):
+    tree = decision_tree.tree_
+    assert tree.node_count == len(tree.feature) == len(tree.left) == len(tree.right) == len(tree.label) == len(tree.depth)
+    assert tree.max_depth == decision_tree.depth()
+    assert tree.num_feature_nodes == decision_tree.num_nodes()
+    leaves = tree.feature < 0
+    assert (tree.left[leaves] == -1).all() and (tree.right[leaves] == -1).all()
+    assert (tree.label[leaves] >= 0).all() and (tree.label[~leaves] == -1).all()
+    assert (tree.predict(x_train_data) == decision_tree.predict(x_train_data)).all()
+
+def test_predict_native(decision_tree, x_train_data, expected_predict_output):
+    assert (decision_tree.predict(x_train_data, n_jobs=4) == expected_predict_output).all()
+    packed = pymurtree.BitMatrix.from_dense(x_train_data)
+    assert (packed.to_dense() == x_train_data).all()
+    out = np.empty(x_train_data.shape[0], dtype=np.int32)
+    predict_output = decision_tree.predict(packed, n_jobs=-1, out=out)
+    assert predict_output is out
+    assert (out == expected_predict_output).all()
+    with pytest.raises(ValueError):
+        decision_tree.predict(x_train_data, out=np.empty(1, dtype=np.int32))
+
+def test_fit_progress_and_cancellation(x_train_data, y_train_data):
+    reports = []
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, max_num_nodes=15)
+    model.fit(x_train_data, y_train_data, progress_callback=reports.append, progress_interval=0.01)
+    assert len(reports) > 0
+    assert reports[-1].best_misclassifications == model.score()
+    assert all(isinstance(report, pymurtree.SolveProgress) for report in reports)
+    assert all(report.lower_bound is not None and report.lower_bound <= model.score() for report in reports)
+
+    def fail(progress):
+        raise RuntimeError('stop')
+    with pytest.raises(RuntimeError):
+        model.fit(x_train_data, y_train_data, progress_callback=fail, progress_interval=0.001)
+    model.fit(x_train_data, y_train_data)
+    assert model.score() == reports[-1].best_misclassifications
+
+    token = pymurtree.CancellationToken()
+    token.cancel()
+    with pytest.raises(pymurtree.FitCancelledError):
+        model.fit(x_train_data, y_train_data, cancel=token)
+    with pytest.raises(ValueError):
+        model.fit(x_train_data, y_train_data, progress_callback=print, n_jobs=2)
+    with pytest.raises(ValueError):
+        model.fit(x_train_data, y_train_data, progress_callback=print, progress_interval=0)
+
+def test_fit_async(x_train_data, y_train_data, expected_predict_output):
+    import asyncio
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, max_num_nodes=15)
+    asyncio.run(model.fit_async(x_train_data, y_train_data))
+    assert (model.predict(x_train_data) == expected_predict_output).all()
+
+def test_bounds(decision_tree, x_train_data, y_train_data):
+    assert decision_tree.is_optimal()
+    assert decision_tree.upper_bound() == decision_tree.score()
+    assert decision_tree.lower_bound() == decision_tree.score()
+    assert pymurtree.bounds.misclassification_lower_bound(x_train_data, y_train_data) <= decision_tree.score()
+
+def test_fit_target_gap(x_train_data, y_train_data):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, max_num_nodes=15)
+    model.fit(x_train_data, y_train_data, target_gap=2)
+    assert model.upper_bound() - model.lower_bound() <= 2
+    model.fit(x_train_data, y_train_data, target_relative_gap=0.1)
+    assert model.upper_bound() - model.lower_bound() <= 0.1 * model.upper_bound()
+    assert pickle.loads(pickle.dumps(model)).lower_bound() == model.lower_bound()
+
+def test_warm_start(decision_tree, x_train_data, y_train_data):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, max_num_nodes=15)
+    model.fit(x_train_data, y_train_data, warm_start='greedy')
+    assert model.score() == decision_tree.score()
+    model.fit(x_train_data, y_train_data, warm_start=decision_tree)
+    assert model.score() == decision_tree.score()
+    model.fit(x_train_data, y_train_data, upper_bound=decision_tree.score())
+    assert model.score() == decision_tree.score()
+    with pytest.raises(ValueError):
+        model.fit(x_train_data, y_train_data, upper_bound=decision_tree.score() - 1)
+    with pytest.raises(ValueError):
+        pymurtree.OptimalDecisionTreeClassifier().score()
+
+    greedy = pymurtree.greedy.greedy_tree(x_train_data, y_train_data, max_depth=3, max_num_nodes=5)
+    assert greedy.max_depth <= 3 and greedy.num_feature_nodes <= 5
+    with pytest.raises(ValueError):
+        pymurtree.OptimalDecisionTreeClassifier(max_depth=2).fit(x_train_data, y_train_data, warm_start=decision_tree)
+
+def test_fit_parallel(decision_tree, x_train_data, y_train_data):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, max_num_nodes=15, n_jobs=2)
+    model.fit(x_train_data, y_train_data)
+    assert model.score() == decision_tree.score()
+    assert model.is_optimal()
+    assert model.depth() <= 4 and model.num_nodes() <= 15
+    # The tie-break rule of the parallel search does not depend on the number of threads
+    other = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, max_num_nodes=15)
+    other.fit(pymurtree.BitMatrix.from_dense(x_train_data), y_train_data, n_jobs=4)
+    np.testing.assert_array_equal(other.tree_.feature, model.tree_.feature)
+    np.testing.assert_array_equal(other.tree_.label, model.tree_.label)
+    with pytest.raises(ValueError):
+        other.fit(x_train_data, y_train_data, feature_ordering=2)
+    with pytest.raises(ValueError):
+        other.fit(x_train_data, y_train_data, n_jobs=0)
+
+def test_solver_reuse(x_train_data, y_train_data):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    model.fit(x_train_data, y_train_data)
+    assert model.stats().ingestion_time > 0
+    # The solver of the first fit is kept for the same data, and not for other data
+    model.fit(x_train_data, y_train_data, max_depth=2)
+    assert model.stats().ingestion_time == 0
+    model.fit(x_train_data[1:], y_train_data[1:], max_depth=2)
+    assert model.stats().ingestion_time > 0
+
+def test_stats(decision_tree, x_train_data, y_train_data, caplog):
+    stats = decision_tree.stats()
+    assert stats.num_searches == 1
+    assert stats.search_time > 0
+    assert stats.ingestion_time > 0
+    assert stats.peak_memory is None or stats.peak_memory >= 0
+    assert stats.terminal_calls > 0
+    assert stats.cache_hits is not None
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3, verbose=True)
+    with caplog.at_level('INFO', logger='pymurtree'):
+        model.fit(x_train_data, y_train_data)
+    assert any(record.name == 'pymurtree' for record in caplog.records)
+
+def test_sample_weight(x_train_data, y_train_data):
+    weights = np.arange(len(y_train_data)) % 3
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    model.fit(x_train_data, y_train_data, sample_weight=weights)
+    repeated = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    repeated.fit(np.repeat(x_train_data, weights, axis=0), np.repeat(y_train_data, weights))
+    assert model.score() == repeated.score()
+    assert model.score() == model.tree_.count_misclassifications(x_train_data, y_train_data, sample_weight=weights)
+    with pytest.raises(ValueError):
+        model.fit(x_train_data, y_train_data, sample_weight=weights + 0.5)
+
+def test_cancel_conflicts(decision_tree, x_train_data, y_train_data):
+    x = np.concatenate([x_train_data] * 3)
+    y = np.concatenate([y_train_data, y_train_data, np.roll(y_train_data, 1)])
+    expected = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    expected.fit(x, y)
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3, cancel_conflicts=True)
+    model.fit(x, y)
+    assert model.score() == expected.score()
+    assert model.score() == model.tree_.count_misclassifications(x, y)
+    model.fit(x, y, n_jobs=2)
+    assert model.score() == expected.score()
+    with pytest.raises(ValueError):
+        model.fit(x, y, sparse_coefficient=0.1)
+
+def test_binarizer(x_train_data, y_train_data):
+    random = np.random.RandomState(0)
+    x = random.uniform(0, 10, size=(300, 3))
+    y = (x[:, 0] > 5).astype(np.int32) + (x[:, 1] > 7).astype(np.int32)
+    binarizer = pymurtree.Binarizer(strategy='class_boundary')
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=2, binarizer=binarizer)
+    model.fit(x, y)
+    # The binarizer keeps x0 > 5 and x1 > 7 among its thresholds, which a tree of depth 2 combines without errors
+    dense = binarizer.transform(x).to_dense()
+    assert any((dense[:, j] == (x[:, 0] > 5)).all() for j in range(dense.shape[1]))
+    assert any((dense[:, j] == (x[:, 1] > 7)).all() for j in range(dense.shape[1]))
+    assert model.score() == 0
+    np.testing.assert_array_equal(model.predict(x), y)
+    bits = pymurtree.BitMatrix.from_dense(x_train_data == 1)
+    packed = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    packed.fit(bits, y_train_data)
+    dense = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    dense.fit(x_train_data, y_train_data)
+    assert packed.score() == dense.score()
+
+def test_screener(decision_tree, x_train_data, y_train_data):
+    # Duplicated, complemented and constant columns give the same optimal tree
+    x = np.column_stack([np.zeros(len(y_train_data), dtype=x_train_data.dtype), 1 - x_train_data, x_train_data])
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, screener=pymurtree.FeatureScreener())
+    model.fit(x, y_train_data)
+    assert model.score() == decision_tree.score()
+    assert model.tree_.count_misclassifications(x, y_train_data) == model.score()
+    np.testing.assert_array_equal(model.predict(x), model.tree_.predict(x))
+    lossy = pymurtree.OptimalDecisionTreeClassifier(max_depth=2, screener=pymurtree.FeatureScreener(top_k=5))
+    lossy.fit(x, y_train_data)
+    assert lossy.tree_.count_misclassifications(x, y_train_data) == lossy.score()
+
+def test_fit_binary_dataset(decision_tree, x_train_data, y_train_data, tmp_path):
+    path = str(tmp_path / 'train.bin')
+    pymurtree.save_binary(path, x_train_data, y_train_data)
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4)
+    model.fit(path, None)
+    assert model.score() == decision_tree.score()
+
+def test_sparse_input(decision_tree, x_train_data, y_train_data):
+    sparse = pytest.importorskip('scipy.sparse')
+    for matrix in (sparse.csr_matrix(x_train_data), sparse.csc_matrix(x_train_data)):
+        model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4)
+        model.fit(matrix, y_train_data)
+        assert model.score() == decision_tree.score()
+        np.testing.assert_array_equal(model.predict(matrix), model.predict(x_train_data))
+
+def test_fit_new_data(x_train_data, y_train_data):
+    # The solver kept from the first fit must not be reused for other data
+    half = len(y_train_data) // 2
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    model.fit(x_train_data[:half], y_train_data[:half])
+    model.fit(x_train_data[half:], y_train_data[half:])
+    fresh = pymurtree.OptimalDecisionTreeClassifier(max_depth=3)
+    fresh.fit(x_train_data[half:], y_train_data[half:])
+    assert model.score() == fresh.score()
+
+def test_partial_fit(decision_tree, x_train_data, y_train_data):
+    half = len(y_train_data) // 2
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4)
+    model.partial_fit(x_train_data[:half], y_train_data[:half])
+    model.partial_fit(x_train_data[half:], y_train_data[half:])
+    assert model.is_optimal()
+    assert model.score() == decision_tree.score()
+    assert model.tree_.count_misclassifications(x_train_data, y_train_data) == model.score()
+    model.refit(x_train_data[:half], y_train_data[:half])
+    assert model.tree_.count_misclassifications(x_train_data[:half], y_train_data[:half]) == model.score()
+
+def test_result_cache(decision_tree, x_train_data, y_train_data, tmp_path):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, result_cache=str(tmp_path))
+    model.fit(x_train_data, y_train_data)
+    assert (model.stats().result_cache_hits, model.stats().result_cache_misses) == (0, 1)
+    other = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, result_cache=pymurtree.ResultCache(str(tmp_path)))
+    other.fit(x_train_data, y_train_data)
+    assert (other.stats().result_cache_hits, other.stats().num_searches) == (1, 0)
+    assert other.score() == decision_tree.score()
+    assert other.is_optimal()
+    np.testing.assert_array_equal(other.predict(x_train_data), model.predict(x_train_data))
+    # n_jobs does not change the result, so it is not part of the key
+    other.fit(x_train_data, y_train_data, n_jobs=2)
+    assert other.stats().result_cache_hits == 1
+    other.fit(x_train_data, y_train_data, max_depth=3)
+    assert other.stats().result_cache_misses == 1
+
+class FullResultCache(pymurtree.ResultCache):
+    def put(self, key, result):
+        raise OSError('No space left on device')
+
+def test_result_cache_write_error(decision_tree, x_train_data, y_train_data, tmp_path, caplog):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=4, result_cache=FullResultCache(str(tmp_path)))
+    with caplog.at_level('WARNING', logger='pymurtree'):
+        model.fit(x_train_data, y_train_data)
+    assert model.score() == decision_tree.score()
+    assert any('result cache' in record.getMessage() for record in caplog.records)
+
+def test_save_and_pickle(decision_tree, x_train_data, y_train_data, tmp_path):
+    path = str(tmp_path / 'model.pmt')
+    decision_tree.save(path)
+    for model in (pymurtree.OptimalDecisionTreeClassifier.load(path), pickle.loads(pickle.dumps(decision_tree))):
+        assert model.score() == decision_tree.score()
+        assert model.is_optimal() == decision_tree.is_optimal()
+        assert model.depth() == decision_tree.depth()
+        np.testing.assert_array_equal(model.predict(x_train_data), decision_tree.predict(x_train_data))
+    inference_model = pymurtree.load_model(path)
+    np.testing.assert_array_equal(inference_model.predict(x_train_data), decision_tree.predict(x_train_data))
+    # The unpickled model can be fitted again
+    model.fit(x_train_data, y_train_data)
+    assert model.score() == decision_tree.score()
+
+def test_fit_path(decision_tree, x_train_data, y_train_data):
+    model = pymurtree.OptimalDecisionTreeClassifier()
+    results = model.fit_path(x_train_data, y_train_data, max_depth=[4, 2, 3], max_num_nodes=[15, 3])
+    settings = [(result.max_depth, result.max_num_nodes) for result in results]
+    assert settings == [(2, 3), (3, 3), (3, 7), (4, 3), (4, 15)]
+    for result in results:
+        assert result.is_optimal
+        assert result.tree.max_depth <= result.max_depth
+        assert result.tree.num_feature_nodes <= result.max_num_nodes
+        assert result.tree.count_misclassifications(x_train_data, y_train_data) == result.misclassifications
+    assert results[-1].misclassifications == decision_tree.score()
+
+def test_all_trees(decision_tree, x_train_data, y_train_data):
+    model = pymurtree.OptimalDecisionTreeClassifier(max_depth=3, max_num_nodes=5, all_trees=True)
+    model.fit(x_train_data, y_train_data)
+    trees = model.trees()
+    assert sorted(trees) == [(1, 1), (2, 2), (2, 3), (3, 3), (3, 4), (3, 5)]
+    assert model.score() == trees[(3, 5)].misclassifications
+    front = model.pareto_front()
+    assert front[0].tree.num_feature_nodes == 1
+    for smaller, larger in zip(front, front[1:]):
+        assert smaller.tree.num_feature_nodes < larger.tree.num_feature_nodes
+        assert smaller.misclassifications > larger.misclassifications
+    with pytest.raises(ValueError):
+        model.fit(x_train_data, y_train_data, target_gap=1)
+    with pytest.raises(ValueError):
+        model.fit(x_train_data, y_train_data, progress_callback=print)
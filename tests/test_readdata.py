@@ -6,12 +6,20 @@ AC: The file is written in DL format see the readme for details
 AC: The file is read and converted to a numpy array  (x, y) where x is the feature vectors and y is the labels
 AC: Features are binary values and labels are integers
 '''
-import pytest
-import pandas as pd
+
 import numpy as np
-from pymurtree.readdata import read_from_file
-import pymurtree.lib as lib
-import pprint
+import pandas as pd
+import pytest
+
+from pymurtree import lib
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.readdata import (
+    convert_to_binary,
+    load_binary,
+    load_data_chunked,
+    read_from_file,
+    save_binary,
+)
 
 TRAIN_DATA = "./tests/fixtures/test_dataset.txt"
 
@@ -56,4 +64,62 @@ def test_compare_feature_vectors(dl_from_file):
 
     feature_vectors = lib._nparray_to_feature_vectors(dl_from_file, 1)
     assert len(feature_vectors[0]) == len(feature_vectors_from_file[0])
-    assert len(feature_vectors) == len(feature_vectors_from_file)
\ No newline at end of file
+    assert len(feature_vectors) == len(feature_vectors_from_file)
+
+def test_numpy_to_feature_vectors(dl_from_file, dl_x_y):
+    ''' Test that reading x and y in place gives the same feature vectors as the concatenated array'''
+    x, y = dl_x_y
+    x = x.to_numpy()
+    y = y.to_numpy()
+    feature_vectors = lib._nparray_to_feature_vectors(dl_from_file, 1)
+    for features in (x.astype(np.uint8), x.astype(bool), np.asfortranarray(x)):
+        feature_vectors_in_place = lib._numpy_to_feature_vectors(features, y, 1)
+        assert len(feature_vectors_in_place) == len(feature_vectors)
+        for label in range(len(feature_vectors)):
+            assert len(feature_vectors_in_place[label]) == len(feature_vectors[label])
+
+def test_numpy_to_feature_vectors_invalid_input(dl_x_y):
+    x, y = dl_x_y
+    x = x.to_numpy()
+    y = y.to_numpy()
+    with pytest.raises(ValueError):
+        lib._numpy_to_feature_vectors(x, y[:-1], 1)
+    with pytest.raises(ValueError):
+        lib._numpy_to_feature_vectors(x.astype(float), y, 1)
+
+def test_load_data_chunked():
+    data = np.loadtxt(TRAIN_DATA, dtype=int)
+    x, y = load_data_chunked(TRAIN_DATA, chunk_size=7)
+    assert x.dtype == np.uint8 and y.dtype == np.int32
+    np.testing.assert_array_equal(x, data[:, 1:])
+    np.testing.assert_array_equal(y, data[:, 0])
+    bits, y = load_data_chunked(TRAIN_DATA, chunk_size=7, packed=True)
+    assert isinstance(bits, BitMatrix)
+    np.testing.assert_array_equal(bits.to_dense(), data[:, 1:])
+
+def test_load_data_chunked_invalid(tmp_path):
+    path = tmp_path / 'invalid.txt'
+    path.write_text('0 1 0\n1 2 1\n')
+    with pytest.raises(ValueError):
+        load_data_chunked(str(path))
+    path.write_text('0 1 0\n1 1\n')
+    with pytest.raises(ValueError):
+        load_data_chunked(str(path))
+
+def test_binary_format(tmp_path):
+    data = np.loadtxt(TRAIN_DATA, dtype=int)
+    saved = str(tmp_path / 'saved.bin')
+    converted = str(tmp_path / 'converted.bin')
+    save_binary(saved, data[:, 1:], data[:, 0])
+    convert_to_binary(TRAIN_DATA, converted, chunk_size=5)
+    with open(saved, 'rb') as saved_file, open(converted, 'rb') as converted_file:
+        assert saved_file.read() == converted_file.read()
+    for mmap in (True, False):
+        x, y = load_binary(saved, mmap=mmap)
+        np.testing.assert_array_equal(x.to_dense(), data[:, 1:])
+        np.testing.assert_array_equal(y, data[:, 0])
+    with pytest.raises(ValueError):
+        load_binary(TRAIN_DATA)
+    # Only 1 is present, as when the array is given to fit directly
+    save_binary(saved, np.array([[2, 1], [0, 1]]), np.array([0, 1]))
+    np.testing.assert_array_equal(load_binary(saved)[0].to_dense(), [[False, True], [False, True]])
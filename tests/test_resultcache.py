@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from pymurtree.parameters import Parameters
+from pymurtree.resultcache import CachedResult, ResultCache
+from pymurtree.tree import Tree
+
+
+def result(label: int) -> CachedResult:
+    return CachedResult(Tree.from_split(2, Tree.leaf(0), Tree.leaf(label)), 5, True, None)
+
+def test_result_cache_hits_and_misses(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get('a') is None
+    cache.put('a', result(1))
+    stored = ResultCache(str(tmp_path)).get('a')
+    np.testing.assert_array_equal(stored.tree.label, result(1).tree.label)
+    assert (stored.misclassifications, stored.is_optimal, stored.lower_bound) == (5, True, None)
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+
+def test_result_cache_key():
+    params = Parameters(600, 3, 7, 0.0, False, False, True, True, 0, 0, 3, 0, 1)
+    key = ResultCache.key('data', params)
+    assert key == ResultCache.key('data', Parameters(600, 3, 7, 0.0, False, False, True, True, 0, 0, 3, 0, 1))
+    assert key != ResultCache.key('other data', params)
+    assert key != ResultCache.key('data', Parameters(600, 4, 7, 0.0, False, False, True, True, 0, 0, 3, 0, 1))
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put('a', result(1))
+    cache.max_bytes = 2 * os.path.getsize(str(tmp_path / 'a.npz'))
+    cache.put('b', result(1))
+    os.utime(str(tmp_path / 'a.npz'), (0, 0))
+    os.utime(str(tmp_path / 'b.npz'), (1, 1))
+    assert cache.get('a') is not None # now the most recently used
+    cache.put('c', result(1))
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+def test_unreadable_result(tmp_path):
+    (tmp_path / 'a.npz').write_bytes(b'not a result')
+    cache = ResultCache(str(tmp_path))
+    assert cache.get('a') is None
+    assert 'a' not in cache
+
+def write_results(directory: str) -> None:
+    cache = ResultCache(directory)
+    for label in range(20):
+        cache.put('shared', result(label))
+
+def test_concurrent_writers(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    writers = [context.Process(target=write_results, args=(str(tmp_path),)) for _ in range(3)]
+    for writer in writers:
+        writer.start()
+    cache = ResultCache(str(tmp_path))
+    while any(writer.is_alive() for writer in writers):
+        stored = cache.get('shared')
+        assert stored is None or stored.misclassifications == 5
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    assert cache.get('shared') is not None
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+def test_stale_temporary_files(tmp_path):
+    # Left by writers that crashed, and removed by the next write once they are old
+    stale, recent = tmp_path / 'stale.tmp', tmp_path / 'recent.tmp'
+    stale.write_bytes(b'partial')
+    recent.write_bytes(b'partial')
+    os.utime(str(stale), (time.time() - 2 * 3600,) * 2)
+    ResultCache(str(tmp_path)).put('a', result(1))
+    assert not stale.exists() and recent.exists()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from pymurtree.bitmatrix import BitMatrix
+from pymurtree.screening import FeatureScreener
+
+
+@pytest.fixture
+def redundant_data():
+    random = np.random.RandomState(0)
+    base = random.randint(0, 2, size=(37, 3))
+    # constant, base 0, duplicate of 0, base 1, complement of 1, constant, base 2, complement of 0
+    x = np.column_stack([np.zeros(37), base[:, 0], base[:, 0], base[:, 1], 1 - base[:, 1],
+                         np.ones(37), base[:, 2], 1 - base[:, 0]]).astype(np.int32)
+    y = base[:, 0] ^ base[:, 2]
+    return x, y
+
+def test_lossless_screening(redundant_data):
+    x, y = redundant_data
+    screener = FeatureScreener().fit(x, y)
+    np.testing.assert_array_equal(screener.support_, [1, 3, 6])
+    np.testing.assert_array_equal(screener.transform(x), x[:, [1, 3, 6]])
+
+def test_screening_bitmatrix(redundant_data):
+    x, y = redundant_data
+    bits = BitMatrix.from_dense(x == 1)
+    screener = FeatureScreener(chunk_size=10).fit(bits, y)
+    np.testing.assert_array_equal(screener.support_, [1, 3, 6])
+    screened = screener.transform(bits)
+    assert isinstance(screened, BitMatrix)
+    np.testing.assert_array_equal(screened.to_dense(), x[:, [1, 3, 6]] == 1)
+
+@pytest.mark.parametrize('criterion', ['gini', 'entropy'])
+def test_top_k(redundant_data, criterion):
+    x, y = redundant_data
+    x = np.column_stack([x, y])
+    screener = FeatureScreener(top_k=1, criterion=criterion).fit(x, y)
+    np.testing.assert_array_equal(screener.support_, [8])
+
+def test_constant_data():
+    screener = FeatureScreener().fit(np.ones((5, 3), dtype=np.int32), np.zeros(5, dtype=np.int32))
+    np.testing.assert_array_equal(screener.support_, [0])
+
+def test_invalid_screener(redundant_data):
+    with pytest.raises(ValueError):
+        FeatureScreener(criterion='variance')
+    with pytest.raises(ValueError):
+        FeatureScreener(top_k=0)
+    x, y = redundant_data
+    with pytest.raises(ValueError):
+        FeatureScreener().transform(x)
+    with pytest.raises(ValueError):
+        FeatureScreener().fit(x, y).transform(x[:, :3])
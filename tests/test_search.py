@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import pymurtree
+from src.pymurtree import read_from_file
+
+TRAIN_DATA = "./tests/fixtures/test_dataset.txt"
+
+@pytest.fixture
+def train_data():
+    x, y = read_from_file(TRAIN_DATA)
+    return x.to_numpy(), y.to_numpy()
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_search(train_data, n_jobs):
+    x, y = train_data
+    search = pymurtree.OptimalTreeSearchCV({'max_depth': [1, 2, 3], 'feature_ordering': [0, 2]}, cv=3, time=60, n_jobs=n_jobs)
+    search.fit(x, y)
+    assert len(search.results_) == 6
+    assert search.best_params_ in search.candidates()
+    assert 0 <= search.best_score_ <= 1
+    for result in search.results_:
+        assert result['discarded'] or len(result['accuracy']) == 3
+    assert search.predict(x).shape == y.shape
+
+def test_search_discards_dominated_candidates():
+    x = np.random.RandomState(0).randint(0, 2, (100, 5))
+    y = x[:, 0]
+    search = pymurtree.OptimalTreeSearchCV({'max_depth': [1, 2, 3]}, cv=3, time=60).fit(x, y)
+    assert [result['discarded'] for result in search.results_] == [False, True, True]
+    assert search.best_params_ == {'max_depth': 1}
+    assert search.best_score_ == 1.0
+
+def test_search_rejects_time_in_grid():
+    with pytest.raises(ValueError):
+        pymurtree.OptimalTreeSearchCV({'max_depth': [1, 2], 'time': [10]}).candidates()
+
+def test_shared_dataset(train_data):
+    x, y = train_data
+    dataset = pymurtree.search.SharedDataset(x, y)
+    try:
+        x_shared, y_shared, handles = pymurtree.search.SharedDataset.attach(dataset.spec)
+        assert (x_shared == x).all() and (y_shared == y).all()
+        del x_shared, y_shared
+        for handle in handles:
+            handle.close()
+    finally:
+        dataset.close()
+
+def test_shared_dataset_packed(train_data):
+    x, y = train_data
+    dataset = pymurtree.search.SharedDataset(x, y, packed=True)
+    try:
+        assert dataset.x.bits.shape == (x.shape[0], (x.shape[1] + 7) // 8)
+        x_shared, y_shared, handles = pymurtree.search.SharedDataset.attach(dataset.spec)
+        assert isinstance(x_shared, pymurtree.BitMatrix)
+        assert (x_shared.to_dense() == (x == 1)).all() and (y_shared == y).all()
+        del x_shared, y_shared
+        for handle in handles:
+            handle.close()
+    finally:
+        dataset.close()
+
+def test_search_rejects_zero_jobs():
+    with pytest.raises(ValueError):
+        pymurtree.OptimalTreeSearchCV({'max_depth': [1, 2]}, n_jobs=0)
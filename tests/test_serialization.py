@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from pymurtree.serialization import read_model, write_model
+from pymurtree.tree import Tree
+
+
+@pytest.fixture
+def tree():
+    return Tree(feature=[7, -1, 3, -1, -1], left=[1, -1, 3, -1, -1], right=[2, -1, 4, -1, -1],
+                label=[-1, 1, -1, 2, 3], depth=[0, 1, 1, 2, 2])
+
+def test_write_and_read_model(tree, tmp_path):
+    path = str(tmp_path / 'model.pmt')
+    write_model(path, tree, 12, True, 12, {'max_depth': 2}, b'extras')
+    saved = read_model(path)
+    for name in ('feature', 'left', 'right', 'label', 'depth'):
+        np.testing.assert_array_equal(getattr(saved['tree'], name), getattr(tree, name))
+    assert (saved['misclassifications'], saved['is_optimal'], saved['lower_bound']) == (12, True, 12)
+    assert saved['params'] == {'max_depth': 2}
+    assert saved['extras'] == b'extras'
+    write_model(path, Tree.leaf(4), 3, False)
+    saved = read_model(path)
+    assert (saved['is_optimal'], saved['lower_bound'], saved['params'], saved['extras']) == (False, None, {}, b'')
+    np.testing.assert_array_equal(saved['tree'].predict(np.zeros((2, 1))), [4, 4])
+
+def test_read_invalid_model(tree, tmp_path):
+    path = tmp_path / 'model.pmt'
+    path.write_bytes(b'not a model')
+    with pytest.raises(ValueError):
+        read_model(str(path))
+    write_model(str(path), tree, 12, True)
+    data = bytearray(path.read_bytes())
+    data[8] = 99 # version
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        read_model(str(path))
+    with pytest.raises(ValueError):
+        write_model(str(path), None, 0, False)
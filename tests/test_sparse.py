@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from pymurtree.sparse import is_sparse, sparse_lookup, sparse_to_bitmatrix
+from pymurtree.tree import Tree
+
+sparse = pytest.importorskip('scipy.sparse')
+
+@pytest.fixture
+def dense():
+    random = np.random.RandomState(0)
+    return (random.uniform(size=(50, 19)) < 0.1).astype(np.int32)
+
+@pytest.mark.parametrize('format', ['csr', 'csc', 'coo'])
+def test_sparse_to_bitmatrix(dense, format):
+    x = sparse.csr_matrix(dense).asformat(format)
+    assert is_sparse(x)
+    np.testing.assert_array_equal(sparse_to_bitmatrix(x, chunk_size=7).to_dense(), dense)
+
+def test_sparse_values():
+    # Explicit zeros and values other than 1 are not present for the solver, duplicates are summed
+    x = sparse.csr_matrix((np.array([0, 2, 1, 1]), np.array([0, 1, 2, 2]), np.array([0, 2, 4])), shape=(2, 3))
+    np.testing.assert_array_equal(sparse_to_bitmatrix(x).to_dense(), [[0, 0, 0], [0, 0, 0]])
+    # and predict reads them as fit does
+    tree = Tree.from_split(1, Tree.leaf(0), Tree.leaf(1))
+    np.testing.assert_array_equal(tree.predict(x), [0, 0])
+    assert tree.count_misclassifications(x, np.array([0, 0])) == 0
+    x = sparse.csr_matrix((np.array([1, 1]), np.array([2, 0]), np.array([0, 1, 2])), shape=(2, 3))
+    np.testing.assert_array_equal(sparse_to_bitmatrix(x).to_dense(), [[0, 0, 1], [1, 0, 0]])
+
+@pytest.mark.parametrize('format', ['csr', 'csc'])
+def test_sparse_predict(dense, format):
+    x = sparse.csr_matrix(dense).asformat(format)
+    rows = np.repeat(np.arange(50), 19)
+    features = np.tile(np.arange(19), 50)
+    np.testing.assert_array_equal(sparse_lookup(x)(rows, features), dense.ravel() == 1)
+    tree = Tree.from_split(3, Tree.from_split(7, Tree.leaf(0), Tree.leaf(1)), Tree.leaf(2))
+    np.testing.assert_array_equal(tree.predict(x), tree.predict(dense))
+    assert tree.count_misclassifications(x, np.zeros(50)) == tree.count_misclassifications(dense, np.zeros(50))
@@ -0,0 +1,35 @@
+import numpy as np
+
+from pymurtree.stats import MemoryMeter, SolveStats, peak_memory_usage
+
+COUNTERS = {'num_terminal_nodes_with_node_budget_one': 10.0,
+            'num_terminal_nodes_with_node_budget_two': 10.0,
+            'num_terminal_nodes_with_node_budget_three': 20.0,
+            'num_cache_hit_optimality': 9.0,
+            'num_cache_hit_nonzero_bound': 3.0,
+            'time_in_terminal_node': 0.25}
+
+def test_stats_add_and_merge():
+    stats = SolveStats()
+    assert stats.cache_hits is None and stats.terminal_calls is None
+    stats.add_search(1.5, COUNTERS)
+    other = SolveStats(ingestion_time=0.5, peak_memory=1024)
+    other.add_search(0.5, COUNTERS)
+    stats.merge(other)
+    assert stats.num_searches == 2
+    assert stats.search_time == 2.0
+    assert stats.ingestion_time == 0.5
+    assert stats.peak_memory == 1024
+    assert (stats.cache_hits, stats.terminal_calls) == (24, 80)
+    assert stats.counters['time_in_terminal_node'] == 0.5
+    assert isinstance(stats.counters['num_cache_hit_optimality'], int)
+
+def test_memory_meter():
+    meter = MemoryMeter()
+    if meter.rise() is None:
+        assert peak_memory_usage() is None
+        return
+    before = meter.rise()
+    data = np.ones(64 * 2**20, dtype=np.uint8)
+    assert meter.rise() >= before
+    assert peak_memory_usage() >= data.nbytes
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from pymurtree.weights import cancel_conflicts, check_sample_weight
+
+
+def weighted_errors(x, y, weights, feature, left_label, right_label):
+    predictions = np.where(x[:, feature] == 1, right_label, left_label)
+    return int(np.sum(weights * (predictions != y)))
+
+def test_cancel_conflicts_keeps_the_costs():
+    random = np.random.RandomState(0)
+    x = random.randint(0, 2, size=(500, 3)).astype(np.uint8)
+    y = random.randint(0, 3, size=500).astype(np.int32)
+    weights = random.randint(0, 3, size=500)
+    x_reduced, y_reduced, counts, offset = cancel_conflicts(x, y, weights)
+    assert len(y_reduced) <= 8 * 3
+    # Each cancelled set of three rows adds two to the offset
+    assert counts.sum() + offset // 2 * 3 == weights.sum()
+    for feature in range(3):
+        for left_label in range(3):
+            for right_label in range(3):
+                assert weighted_errors(x, y, weights, feature, left_label, right_label) == \
+                       weighted_errors(x_reduced, y_reduced, counts, feature, left_label, right_label) + offset
+
+def test_cancel_conflicts_conflicts():
+    x = np.array([[1, 0], [1, 0], [1, 0], [0, 1]])
+    y = np.array([0, 1, 1, 0])
+    x_reduced, y_reduced, counts, offset = cancel_conflicts(x, y)
+    assert offset == 1
+    assert sorted(zip(map(tuple, x_reduced), y_reduced, counts)) == [((0, 1), 0, 1), ((1, 0), 1, 1)]
+
+def test_check_sample_weight():
+    assert check_sample_weight([1.0, 2.0, 0.0], 3).tolist() == [1, 2, 0]
+    assert check_sample_weight([300, 0, 0], 3).tolist() == [300, 0, 0]
+    for weights in ([1.5, 1, 1], [-1, 1, 1], [0, 0, 0], [1, 1], ['a', 'b', 'c'], [2**31, 0, 0]):
+        with pytest.raises(ValueError):
+            check_sample_weight(weights, 3)